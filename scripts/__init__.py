@@ -0,0 +1,6 @@
+"""ARCADIA 補助スクリプト群。
+
+Claude Code のスキル／エージェントが繰り返し行う決定論的な処理（資料取込など）を
+Python で高速化する。各モジュールはリポジトリルートから ``python -m scripts.<name>``
+で実行する。詳細は ``scripts/README.md`` を参照。
+"""
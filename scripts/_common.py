@@ -0,0 +1,187 @@
+# ============================================================================
+# _common.py — スクリプト共通ユーティリティ
+# ============================================================================
+"""スクリプト間で共有する小さなヘルパー群（パス解決・ハッシュ・原子的書き込み・Markdown 解析）。"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+#: キャッシュ・マニフェストの格納先（``tmp/`` は Git 管理外）
+CACHE_DIR = Path("tmp") / "cache"
+
+_HASH_CHUNK = 1 << 20
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def repo_root(start: str | os.PathLike[str] | None = None) -> Path:
+    """``guides/`` と ``templates/`` を持つ最も近い祖先ディレクトリを返す。
+
+    見つからない場合は ``start``（省略時はカレントディレクトリ）をそのまま返す。
+    """
+    base = Path(start or os.getcwd()).resolve()
+    for candidate in (base, *base.parents):
+        if (candidate / "guides").is_dir() and (candidate / "templates").is_dir():
+            return candidate
+    return base
+
+
+def cache_path(root: Path, name: str, *, create: bool = True) -> Path:
+    """``tmp/cache/<name>`` のパスを返す。
+
+    ``create`` が真ならディレクトリを作成済みにする（``--dry-run`` など何も書き込まない場合は偽にする）。
+    """
+    path = root / CACHE_DIR / name
+    if create:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def sha256_file(path: str | os.PathLike[str]) -> str:
+    """ファイル内容の SHA-256 を 1 MiB 単位のストリーミングで計算する。"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sha256_text(*parts: str) -> str:
+    """文字列群を連結した SHA-256 を返す（区切りに NUL を挟む）。"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_open(path: str | os.PathLike[str]) -> Iterator[BinaryIO]:
+    """同一ディレクトリの一時ファイルを開き、ブロックを正常に抜けたら ``path`` と原子的に置き換える。
+
+    大きな出力を少しずつ書き出す場合に使う。例外時は一時ファイルを削除し、``path`` は元のまま残る。
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".part")
+    try:
+        os.chmod(tmp, 0o666 & ~_UMASK)  # mkstemp の 0600 ではなく通常のファイルと同じ権限にする
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: str | os.PathLike[str], data: bytes) -> None:
+    """同一ディレクトリの一時ファイル経由で ``path`` を原子的に置き換える。"""
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+def atomic_write_text(path: str | os.PathLike[str], text: str) -> None:
+    """UTF-8 テキストを原子的に書き込む。"""
+    atomic_write_bytes(path, text.encode("utf-8"))
+
+
+def load_json(path: str | os.PathLike[str], default: Any = None) -> Any:
+    """JSON を読み込む。存在しない・壊れている場合は ``default`` を返す。"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def save_json(path: str | os.PathLike[str], data: Any) -> None:
+    """JSON を原子的に書き込む。"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True) + "\n")
+
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+def split_sections(text: str, max_level: int = 3) -> list[tuple[str, int, str]]:
+    """Markdown を見出し（``max_level`` 以下）単位に分割する。
+
+    ``(見出し, 開始行番号 (1 始まり), 本文)`` のリストを返す。最初の見出しより前の
+    テキストは見出し ``""`` のセクションになる。コードブロック内の ``#`` は見出し扱いしない。
+    """
+    sections: list[tuple[str, int, str]] = []
+    title, start = "", 1
+    buf: list[str] = []
+    fenced = False
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if line.lstrip().startswith(("```", "~~~")):
+            fenced = not fenced
+        m = None if fenced else _HEADING.match(line)
+        if m and len(m.group(1)) <= max_level:
+            if buf and any(s.strip() for s in buf) or title:
+                sections.append((title, start, "\n".join(buf)))
+            title, start, buf = m.group(2), lineno, []
+        else:
+            buf.append(line)
+    if buf and any(s.strip() for s in buf) or title:
+        sections.append((title, start, "\n".join(buf)))
+    return sections
+
+
+def iter_markdown_grids(text: str) -> Iterator[list[list[str]]]:
+    """Markdown 中の表を「ヘッダー行を先頭にしたセルのリストのリスト」として順に返す。
+
+    データ行はヘッダーの列数まで空文字で埋める。見出しが空欄・重複する表（Excel 変換結果など）を
+    列位置で扱いたい場合に使う。
+    """
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines) - 1:
+        head, sep = lines[i].strip(), lines[i + 1].strip()
+        if head.startswith("|") and re.fullmatch(r"\|?(\s*:?-{2,}:?\s*\|)+\s*:?-*:?\s*\|?", sep):
+            grid = [_table_cells(head)]
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                cells = _table_cells(lines[i].strip())
+                cells.extend([""] * (len(grid[0]) - len(cells)))
+                grid.append(cells)
+                i += 1
+            yield grid
+        else:
+            i += 1
+
+
+def iter_markdown_tables(text: str) -> Iterator[list[dict[str, str]]]:
+    """Markdown 中の表をヘッダー名をキーとした行 dict のリストとして順に返す。"""
+    for keys, *rows in iter_markdown_grids(text):
+        yield [dict(zip(keys, cells)) for cells in rows]
+
+
+def _table_cells(line: str) -> list[str]:
+    body = line.strip()
+    if body.startswith("|"):
+        body = body[1:]
+    if body.endswith("|") and not body.endswith("\\|"):
+        body = body[:-1]
+    return [c.strip().replace("\\|", "|") for c in re.split(r"(?<!\\)\|", body)]
+
+
+_NUMBER = re.compile(r"[-+]?\d+(?:\.\d+)?")
+_TO_ASCII = str.maketrans({chr(c): chr(c - 0xFEE0) for c in range(0xFF01, 0xFF5F)} | {"　": " ", "−": "-"})
+
+
+def parse_number(text: str) -> float | None:
+    """セル文字列から最初の数値を取り出す（全角数字・桁区切りカンマに対応）。
+
+    数値がなければ ``None`` を返す。単位の換算は行わない。
+    """
+    m = _NUMBER.search(text.translate(_TO_ASCII).replace(",", ""))
+    return float(m.group(0)) if m else None
@@ -0,0 +1,486 @@
+# ============================================================================
+# audit_index.py — RFP 要件カバレッジの永続インデックス
+# ============================================================================
+"""RFP 要件 → 根拠（スライド・回答シート・中間成果物）の対応を SQLite に永続化し、
+変更のあったファイルだけを再監査する。
+
+``rfp-auditor`` による Phase 7 の全体チェックの前段として、要件ごとの根拠候補と
+カバレッジ率を機械的に算出する。MATCH / MISMATCH の最終判定は従来どおり
+``rfp-auditor`` が行い、本スクリプトは判定対象の絞り込みを担う。
+
+- 本文は日本語向けの文字 bigram に分かち書きして FTS5 に格納する
+- 判定の根拠にするのは提案成果物（スライド・回答シート）だけ。中間成果物（``output/plan/``）は
+  全要件 ID を列挙したトレーサビリティ表を含むため、全文検索用にのみ索引する
+- ファイルはサイズ・mtime・SHA-256 で変更検知し、変更分のチャンクだけを全要件に照合する
+- チェックリストの要件は本文ハッシュで変更検知し、変更された要件だけを全チャンクに照合する
+- 本文中で要件 ID（``R-001`` 等）を明示参照している成果物のチャンクは根拠として確定扱いにする
+
+使い方::
+
+    python -m scripts.audit_index                         # 差分更新してカバレッジを表示
+    python -m scripts.audit_index --output tmp/coverage.md
+    python -m scripts.audit_index search "監査ログ 保管"   # 根拠の全文検索
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from ._common import (
+    atomic_write_text,
+    cache_path,
+    iter_markdown_tables,
+    repo_root,
+    sha256_file,
+    sha256_text,
+    split_sections,
+)
+
+DB_NAME = "audit-index.sqlite"
+SCHEMA_VERSION = 2
+
+CHECKLIST = Path(".claude/skills/rfp-auditor/references/rfp-requirements-checklist.md")
+
+#: カバレッジ判定の根拠にする提案成果物（リポジトリルートからの glob）
+DELIVERABLE_GLOBS = (
+    "output/slides/*/slides.md",
+    "output/*.xlsx",
+)
+#: 全文検索用にのみ索引する中間成果物（要件 ID の一覧表を含むため判定には使わない）
+REFERENCE_GLOBS = ("output/plan/**/*.md",)
+CORPUS_GLOBS = DELIVERABLE_GLOBS + REFERENCE_GLOBS
+
+#: 要件 bigram の何割がチャンクに含まれれば MATCH とみなすか
+DEFAULT_THRESHOLD = 0.6
+#: これ未満の被覆率は根拠として記録しない
+MIN_COVERAGE = 0.3
+
+_ID_PATTERN = re.compile(r"(?<![A-Za-z0-9-])[A-Z]{1,5}(?:-[A-Z]{1,5})?-\d{1,4}(?:-\d{1,3})?(?![0-9])")
+_TOKEN = re.compile(r"[0-9A-Za-z]+|[぀-ヿ㐀-鿿豈-﫿ｦ-ﾟ]+")
+_HIRAGANA_ONLY = re.compile(r"[぀-ゟ]+")
+_FULLWIDTH = str.maketrans({chr(c): chr(c - 0xFEE0) for c in range(0xFF01, 0xFF5F)} | {"　": " "})
+
+
+# ----------------------------------------------------------------------------
+# 分かち書き
+# ----------------------------------------------------------------------------
+
+
+def ngrams(text: str) -> list[str]:
+    """テキストを検索用トークン列に変換する。
+
+    英数字は小文字化した単語、日本語の連続部分は文字 bigram にする。ひらがなだけの
+    bigram（「する」「こと」等）は被覆率を水増しするため除外する。
+    """
+    tokens: list[str] = []
+    for m in _TOKEN.finditer(text.translate(_FULLWIDTH)):
+        word = m.group(0)
+        if word.isascii():
+            tokens.append(word.lower())
+            continue
+        if len(word) == 1:
+            tokens.append(word)
+            continue
+        for i in range(len(word) - 1):
+            gram = word[i : i + 2]
+            if not _HIRAGANA_ONLY.fullmatch(gram):
+                tokens.append(gram)
+    return tokens
+
+
+def is_deliverable(rel: str) -> bool:
+    """リポジトリルートからの相対パスが提案成果物（判定の根拠になるファイル）かを返す。"""
+    path = Path(rel)
+    return any(path.match(pattern) for pattern in DELIVERABLE_GLOBS)
+
+
+# ----------------------------------------------------------------------------
+# 入力の読み込み
+# ----------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Requirement:
+    """チェックリストの 1 要件。"""
+
+    id: str
+    category: str
+    text: str
+    priority: str
+
+    @property
+    def digest(self) -> str:
+        return sha256_text(self.id, self.text)
+
+
+def parse_checklist(text: str) -> list[Requirement]:
+    """``rfp-requirements-checklist.md`` の表から要件を抽出する。"""
+    reqs: dict[str, Requirement] = {}
+    for rows in iter_markdown_tables(text):
+        for row in rows:
+            rid = row.get("ID", "").strip("` ")
+            body = row.get("要件", "")
+            if rid and body and " " not in rid:
+                reqs.setdefault(rid, Requirement(rid, row.get("カテゴリ", ""), body, row.get("優先度", "")))
+    return list(reqs.values())
+
+
+def iter_chunks(path: Path) -> Iterator[tuple[str, str]]:
+    """ファイルを ``(locator, text)`` のチャンク列に分割する。"""
+    if path.suffix.lower() == ".xlsx":
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                for i, row in enumerate(ws.iter_rows(values_only=True), 1):
+                    text = " | ".join(str(v) for v in row if v is not None)
+                    if text.strip():
+                        yield f"{ws.title}!{i}", text
+        finally:
+            wb.close()
+        return
+    text = path.read_text(encoding="utf-8", errors="replace")
+    for title, line, body in split_sections(text):
+        content = f"{title}\n{body}".strip()
+        if content:
+            yield f"L{line} {title}".rstrip(), content
+
+
+# ----------------------------------------------------------------------------
+# インデックス
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class Coverage:
+    """1 要件の監査結果。"""
+
+    id: str
+    category: str
+    priority: str
+    text: str
+    status: str  # "MATCH" | "WEAK" | "MISSING"
+    coverage: float
+    evidence: list[str]
+
+
+class AuditIndex:
+    """要件・根拠チャンク・対応関係を保持する SQLite インデックス。"""
+
+    def __init__(self, root: Path, db_path: Path | None = None) -> None:
+        self.root = root
+        self.db = sqlite3.connect(db_path or cache_path(root, DB_NAME))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> AuditIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _ensure_schema(self) -> None:
+        (version,) = self.db.execute("PRAGMA user_version").fetchone()
+        if version == SCHEMA_VERSION:
+            return
+        self.db.executescript(
+            """
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS chunks_fts;
+            DROP TABLE IF EXISTS chunks;
+            DROP TABLE IF EXISTS citations;
+            DROP TABLE IF EXISTS requirements;
+            DROP TABLE IF EXISTS hits;
+            CREATE TABLE files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT);
+            CREATE TABLE chunks (
+                id INTEGER PRIMARY KEY, path TEXT, locator TEXT, grams TEXT, deliverable INTEGER
+            );
+            CREATE INDEX chunks_path ON chunks (path);
+            CREATE VIRTUAL TABLE chunks_fts USING fts5(
+                grams, content = 'chunks', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 0'
+            );
+            CREATE TABLE citations (req_id TEXT, path TEXT, locator TEXT);
+            CREATE INDEX citations_req ON citations (req_id);
+            CREATE INDEX citations_path ON citations (path);
+            CREATE TABLE requirements (
+                id TEXT PRIMARY KEY, category TEXT, text TEXT, priority TEXT, digest TEXT, seq INTEGER
+            );
+            CREATE TABLE hits (req_id TEXT, path TEXT, locator TEXT, coverage REAL);
+            CREATE INDEX hits_req ON hits (req_id);
+            CREATE INDEX hits_path ON hits (path);
+            """
+        )
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.commit()
+
+    # -- 同期 -----------------------------------------------------------------
+
+    def scan_corpus(self) -> list[Path]:
+        found: set[Path] = set()
+        for pattern in CORPUS_GLOBS:
+            found.update(p for p in self.root.glob(pattern) if p.is_file() and not p.name.startswith(("~$", ".")))
+        return sorted(found)
+
+    def sync_files(self, paths: Iterable[Path] | None = None) -> list[str]:
+        """コーパスの変更を検知して再索引し、変更されたファイルの相対パスを返す。"""
+        current = {p.relative_to(self.root).as_posix(): p for p in (paths or self.scan_corpus())}
+        known = {row[0]: row[1:] for row in self.db.execute("SELECT path, size, mtime_ns, sha256 FROM files")}
+        changed: list[str] = []
+        for rel in known.keys() - current.keys():
+            self._drop_file(rel)
+            changed.append(rel)
+        for rel, path in current.items():
+            st = path.stat()
+            prev = known.get(rel)
+            if prev and prev[0] == st.st_size and prev[1] == st.st_mtime_ns:
+                continue
+            digest = sha256_file(path)
+            if prev and prev[2] == digest:
+                self.db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?", (st.st_size, st.st_mtime_ns, rel))
+                continue
+            self._drop_file(rel)
+            self._index_file(rel, path)
+            self.db.execute(
+                "INSERT INTO files VALUES (?, ?, ?, ?)", (rel, st.st_size, st.st_mtime_ns, digest)
+            )
+            changed.append(rel)
+        self.db.commit()
+        return sorted(changed)
+
+    def _drop_file(self, rel: str) -> None:
+        # 外部コンテンツの FTS5 は削除時に元の本文を渡す必要がある
+        self.db.execute(
+            "INSERT INTO chunks_fts (chunks_fts, rowid, grams) SELECT 'delete', id, grams FROM chunks WHERE path = ?",
+            (rel,),
+        )
+        for table in ("chunks", "citations", "hits", "files"):
+            self.db.execute(f"DELETE FROM {table} WHERE path = ?", (rel,))
+
+    def _index_file(self, rel: str, path: Path) -> None:
+        deliverable = is_deliverable(rel)
+        rows = []
+        cites: list[tuple[str, str, str]] = []
+        for locator, text in iter_chunks(path):
+            rows.append((rel, locator, " ".join(ngrams(text)), deliverable))
+            if deliverable:
+                cites.extend((rid, rel, locator) for rid in set(_ID_PATTERN.findall(text)))
+        (start,) = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM chunks").fetchone()
+        self.db.executemany(
+            "INSERT INTO chunks VALUES (?, ?, ?, ?, ?)", [(start + i, *row) for i, row in enumerate(rows)]
+        )
+        self.db.execute(
+            "INSERT INTO chunks_fts (rowid, grams) SELECT id, grams FROM chunks WHERE id >= ?", (start,)
+        )
+        self.db.executemany("INSERT INTO citations VALUES (?, ?, ?)", cites)
+
+    def sync_requirements(self, reqs: list[Requirement]) -> list[str]:
+        """チェックリストを反映し、追加・変更された要件 ID を返す。"""
+        known = dict(self.db.execute("SELECT id, digest FROM requirements"))
+        current = {r.id for r in reqs}
+        for rid in known.keys() - current:
+            self.db.execute("DELETE FROM requirements WHERE id = ?", (rid,))
+            self.db.execute("DELETE FROM hits WHERE req_id = ?", (rid,))
+        changed = []
+        for seq, r in enumerate(reqs):
+            if known.get(r.id) != r.digest:
+                self.db.execute("DELETE FROM hits WHERE req_id = ?", (r.id,))
+                changed.append(r.id)
+            self.db.execute(
+                "INSERT OR REPLACE INTO requirements VALUES (?, ?, ?, ?, ?, ?)",
+                (r.id, r.category, r.text, r.priority, r.digest, seq),
+            )
+        self.db.commit()
+        return changed
+
+    # -- 照合 -----------------------------------------------------------------
+
+    def match(self, req_ids: Iterable[str] | None = None, paths: Iterable[str] | None = None) -> int:
+        """要件と成果物のチャンクを照合して ``hits`` を更新し、照合した要件数を返す。
+
+        ``req_ids`` を省略すると全要件、``paths`` を省略すると全ファイルが対象になる。要件の bigram から
+        転置表を作り、対象チャンクを 1 回走査して被覆率を数える。候補を上位 N 件に絞らないため、
+        差分照合の結果は全件照合と一致する。
+        """
+        path_list = list(paths) if paths is not None else None
+        if path_list == []:
+            return 0
+        if req_ids is None:
+            targets = self.db.execute("SELECT id, text FROM requirements").fetchall()
+        else:
+            targets = [
+                row
+                for rid in req_ids
+                for row in self.db.execute("SELECT id, text FROM requirements WHERE id = ?", (rid,))
+            ]
+        sizes: dict[str, int] = {}
+        postings: dict[str, list[str]] = {}
+        for rid, text in targets:
+            grams = set(ngrams(text))
+            if grams:
+                sizes[rid] = len(grams)
+                for gram in grams:
+                    postings.setdefault(gram, []).append(rid)
+        if not sizes:
+            return len(targets)
+
+        if path_list is None:
+            rows: Iterable[tuple[str, str, str]] = self.db.execute(
+                "SELECT path, locator, grams FROM chunks WHERE deliverable"
+            )
+        else:
+            rows = (
+                row
+                for path in path_list
+                for row in self.db.execute(
+                    "SELECT path, locator, grams FROM chunks WHERE path = ? AND deliverable", (path,)
+                )
+            )
+        inserts = []
+        for path, locator, chunk_grams in rows:
+            counts: Counter[str] = Counter()
+            for gram in postings.keys() & set(chunk_grams.split()):
+                counts.update(postings[gram])
+            for rid, n in counts.items():
+                cov = n / sizes[rid]
+                if cov >= MIN_COVERAGE:
+                    inserts.append((rid, path, locator, round(cov, 4)))
+        self.db.executemany("INSERT INTO hits VALUES (?, ?, ?, ?)", inserts)
+        self.db.commit()
+        return len(targets)
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[str, str, float]]:
+        """根拠チャンクを全文検索し、``(path, locator, bm25)`` を返す。"""
+        grams = ngrams(query)
+        if not grams:
+            return []
+        # 検索語はすべて含むチャンクを優先（AND）
+        q = " AND ".join(f'"{g}"' for g in dict.fromkeys(grams))
+        return self.db.execute(
+            "SELECT c.path, c.locator, f.rank FROM chunks_fts AS f JOIN chunks AS c ON c.id = f.rowid "
+            "WHERE chunks_fts MATCH ? ORDER BY f.rank LIMIT ?",
+            (q, limit),
+        ).fetchall()
+
+    def coverage(self, threshold: float = DEFAULT_THRESHOLD) -> list[Coverage]:
+        """要件ごとの判定（MATCH / WEAK / MISSING）を返す。"""
+        results = []
+        reqs = self.db.execute("SELECT id, category, priority, text FROM requirements ORDER BY seq").fetchall()
+        for rid, category, priority, text in reqs:
+            cited = self.db.execute(
+                "SELECT path, locator FROM citations WHERE req_id = ? ORDER BY path, locator", (rid,)
+            ).fetchall()
+            hits = self.db.execute(
+                "SELECT path, locator, MAX(coverage) FROM hits WHERE req_id = ? "
+                "GROUP BY path, locator ORDER BY MAX(coverage) DESC LIMIT 3",
+                (rid,),
+            ).fetchall()
+            if cited:
+                status, cov = "MATCH", 1.0
+                evidence = [f"{p}#{loc} (ID参照)" for p, loc in cited[:3]]
+            elif hits:
+                cov = hits[0][2]
+                status = "MATCH" if cov >= threshold else "WEAK"
+                evidence = [f"{p}#{loc} ({c:.0%})" for p, loc, c in hits]
+            else:
+                status, cov, evidence = "MISSING", 0.0, []
+            results.append(Coverage(rid, category, priority, text, status, cov, evidence))
+        return results
+
+
+def update(root: Path, index: AuditIndex) -> dict[str, Any]:
+    """チェックリストとコーパスを差分同期し、必要な照合だけを行う。"""
+    checklist = root / CHECKLIST
+    reqs = parse_checklist(checklist.read_text(encoding="utf-8")) if checklist.exists() else []
+    changed_reqs = index.sync_requirements(reqs)
+    changed_files = index.sync_files()
+    live_files = [p for p in changed_files if (root / p).exists()]
+    unchanged_reqs = [r.id for r in reqs if r.id not in set(changed_reqs)]
+    # 変更された要件 × 全ファイル、未変更の要件 × 変更ファイル のみ照合する
+    if changed_reqs:
+        index.match(changed_reqs)
+    if unchanged_reqs:
+        index.match(unchanged_reqs, live_files)
+    return {"requirements": len(reqs), "changed_requirements": changed_reqs, "changed_files": changed_files}
+
+
+def format_report(results: list[Coverage], threshold: float) -> str:
+    """カバレッジを Markdown で整形する。"""
+    total = len(results)
+    counts = {s: sum(r.status == s for r in results) for s in ("MATCH", "WEAK", "MISSING")}
+    rate = counts["MATCH"] / total if total else 0.0
+    lines = [
+        "# RFP 要件カバレッジ（索引ベース）",
+        "",
+        f"- カバレッジ率: **{rate:.1%}**（MATCH {counts['MATCH']} / 全 {total} 要件、閾値 {threshold:.0%}）",
+        f"- WEAK: {counts['WEAK']}（rfp-auditor で MATCH / MISMATCH を判定）",
+        f"- MISSING: {counts['MISSING']}",
+        "",
+        "| ID | カテゴリ | 優先度 | 判定 | 被覆率 | 根拠候補 |",
+        "|----|----------|--------|------|-------:|----------|",
+    ]
+    for r in results:
+        evidence = "<br>".join(f"`{e}`" for e in r.evidence) or "-"
+        lines.append(f"| {r.id} | {r.category} | {r.priority} | {r.status} | {r.coverage:.0%} | {evidence} |")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.audit_index", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="MATCH とみなす被覆率")
+    parser.add_argument("--output", type=Path, default=None, help="Markdown レポートの書き出し先")
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力する")
+    parser.add_argument("--rebuild", action="store_true", help="インデックスを作り直す")
+    sub = parser.add_subparsers(dest="command")
+    p_search = sub.add_parser("search", help="根拠チャンクを全文検索する")
+    p_search.add_argument("query")
+    p_search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    if args.rebuild:
+        cache_path(root, DB_NAME).unlink(missing_ok=True)
+    with AuditIndex(root) as index:
+        if args.command == "search":
+            index.sync_files()
+            for path, locator, rank in index.search(args.query, args.limit):
+                print(f"{rank:8.2f}  {path}#{locator}")
+            return 0
+
+        started = time.perf_counter()
+        stats = update(root, index)
+        results = index.coverage(args.threshold)
+        elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps({"stats": stats, "elapsed_ms": elapsed, "results": [asdict(r) for r in results]}, ensure_ascii=False, indent=2))
+        return 0
+    report = format_report(results, args.threshold)
+    if args.output:
+        atomic_write_text(args.output, report + "\n")
+    else:
+        print(report)
+    print(
+        f"\n{stats['requirements']} requirements, {len(stats['changed_requirements'])} changed; "
+        f"{len(stats['changed_files'])} files re-indexed; {elapsed:,.1f} ms",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,473 @@
+# ============================================================================
+# bench.py — 決定論的なパイプライン段のベンチマーク
+# ============================================================================
+"""合成した大規模 RFP で取込・展開・監査・見積の各段を計測し、基準との差を数値で示す。
+
+- 合成 RFP（資料・要件チェックリスト・スライド設計書・中間成果物・WBS・回答シート）は
+  ``--seed`` と ``--scale`` から決定論的に生成する。毎回作り直すため、前回の変更を引き継がない
+- 各段を cold（キャッシュなし）/ warm（変更なし）/ incremental（1 ファイル変更）の条件で
+  ``--repeat`` 回実行し、経過時間・CPU 時間・read/write 回数と量の中央値を記録する
+  （計測は ``phase_metrics.measure``。キャッシュを持たない段は cold のみ）
+- ``--save`` で結果を JSON に保存し、``--compare`` で基準と比べて閾値を超えて遅くなった段、
+  I/O 回数が増えた段を REGRESSION として報告する（終了コード 1）
+- 依存パッケージのない段（見積の numpy）は skipped として記録する
+
+使い方::
+
+    python -m scripts.bench                                        # 既定規模で計測して表を表示
+    python -m scripts.bench --scale 4 --save tmp/bench/baseline.json
+    python -m scripts.bench --compare tmp/bench/baseline.json      # 基準より遅くなった段があれば終了コード 1
+    python -m scripts.bench --stage audit --stage facts --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from ._common import atomic_write_text, load_json, repo_root, save_json
+from .phase_metrics import Measurement, format_size, measure
+
+RESULT_VERSION = 1
+WORK_DIR = Path("tmp") / "bench" / "work"
+#: 作業ディレクトリを削除してよいことを示す目印
+MARKER = ".bench-fixture"
+
+#: 回帰とみなす悪化率と、ノイズとして無視する差
+DEFAULT_THRESHOLD = 0.2
+MIN_DELTA_MS = 5.0
+MIN_DELTA_IO = 10
+
+MODES = ("cold", "warm", "incremental")
+#: 合成 XLSX の文書プロパティに記録する日時
+FIXTURE_TIME = dt.datetime(2024, 4, 1)
+
+
+# ----------------------------------------------------------------------------
+# 合成 RFP
+# ----------------------------------------------------------------------------
+
+_SUBJECTS = ("本システム", "データ基盤", "分析環境", "連携基盤", "運用管理機能", "認証基盤", "監視機能", "帳票機能")
+_OBJECTS = ("顧客データ", "取引履歴", "監査ログ", "マスタデータ", "外部連携ファイル", "集計結果", "利用者情報", "バックアップ")
+_METHODS = ("日次バッチ", "ニアリアルタイム", "API", "ファイル連携", "画面操作", "ワークフロー", "定期ジョブ", "イベント駆動")
+_VERBS = ("取り込めること", "保管できること", "暗号化できること", "検索できること", "可視化できること", "監視できること", "出力できること", "削除できること")
+_CATEGORIES = ("機能", "非機能", "セキュリティ", "運用", "移行", "体制")
+_STAGES = ("要件定義", "基本設計", "詳細設計", "開発", "結合テスト", "総合テスト", "移行", "運用準備")
+_ROLES = (("PjM", "シニア", 180), ("アーキテクト", "シニア", 160), ("シニアエンジニア", "ミドル", 130), ("エンジニア", "ジュニア", 100), ("テストエンジニア", "ジュニア", 90))
+_INPUT_NAMES = ("RFP本文", "仕様書", "質問回答書", "議事録", "見積条件", "要件定義書")
+
+
+@dataclass
+class Scale:
+    """``--scale`` 1 あたりの合成量。"""
+
+    documents: int = 40  # input/ の資料数
+    paragraphs: int = 60  # 資料 1 件あたりの段落数
+    requirements: int = 300
+    volumes: int = 5
+    slides: int = 10  # 1 ボリュームあたり
+    plan_docs: int = 10
+    wbs_items: int = 500
+    sheet_rows: int = 300  # 回答シート（openpyxl がある場合のみ）
+
+    def times(self, factor: float) -> Scale:
+        return Scale(**{k: max(1, round(v * factor)) if k != "volumes" else v for k, v in asdict(self).items()})
+
+
+def _sentence(rng: random.Random) -> str:
+    return f"{rng.choice(_SUBJECTS)}は{rng.choice(_OBJECTS)}を{rng.choice(_METHODS)}で{rng.choice(_VERBS)}。"
+
+
+def build_fixture(project: Path, setup: Path, source_templates: Path, scale: Scale, seed: int) -> dict[str, int]:
+    """合成 RFP のプロジェクトと、テンプレート展開用のセットアップ直後のツリーを作る。"""
+    rng = random.Random(seed)
+    for base in (project, setup):
+        (base / "guides").mkdir(parents=True)
+    shutil.copytree(source_templates, setup / "templates")
+    (project / "templates").mkdir()
+
+    def write(rel: str, text: str) -> None:
+        path = project / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    # input/: 取込対象の資料（XLSX は openpyxl がある場合のみ、末尾で作る）
+    for i in range(scale.documents):
+        name = _INPUT_NAMES[i % len(_INPUT_NAMES)]
+        body = [f"# {name} 第{i + 1}部", ""]
+        for p in range(scale.paragraphs):
+            body += [f"## {p + 1}. {rng.choice(_SUBJECTS)}", "", " ".join(_sentence(rng) for _ in range(6)), ""]
+        write(f"input/{name}_{i:04d}.md", "\n".join(body))
+
+    # 要件チェックリスト
+    reqs = [(f"R-{i:04d}", rng.choice(_CATEGORIES), _sentence(rng), rng.choice("高中低")) for i in range(1, scale.requirements + 1)]
+    lines = ["# RFP要件チェックリスト", "", "| ID | カテゴリ | 要件 | 優先度 |", "|----|---------|------|--------|"]
+    lines += [f"| {rid} | {cat} | {text} | {prio} |" for rid, cat, text, prio in reqs]
+    write(".claude/skills/rfp-auditor/references/rfp-requirements-checklist.md", "\n".join(lines) + "\n")
+
+    # 単価表と WBS、それと整合する見積方針書
+    card = ["# 人月単価マスタ", "", "| ロール | グレード | 単価（万円/人月） | 備考 |", "|---|---|---:|---|"]
+    card += [f"| {role} | {grade} | {rate} | |" for role, grade, rate in _ROLES]
+    write("org-data/rate-card.md", "\n".join(card) + "\n")
+    wbs = ["# WBS", "", "| 工程 | 作業項目 | ロール | グレード | 工数（人月） | 最小 | 最大 |", "|---|---|---|---|---:|---:|---:|"]
+    effort = {s: 0.0 for s in _STAGES}
+    cost = {s: 0.0 for s in _STAGES}
+    for i in range(scale.wbs_items):
+        stage = _STAGES[i % len(_STAGES)]
+        role, grade, rate = rng.choice(_ROLES)
+        mode = rng.choice((0.5, 1.0, 1.5, 2.0, 3.0))
+        effort[stage] += mode
+        cost[stage] += mode * rate
+        wbs.append(f"| {stage} | {rng.choice(_OBJECTS)}の{rng.choice(_VERBS)[:-3]}対応 {i + 1} | {role} | {grade} | {mode} | {mode * 0.8:.2f} | {mode * 1.6:.2f} |")
+    write("output/plan/wbs.md", "\n".join(wbs) + "\n")
+    total_effort, total_cost = sum(effort.values()), sum(cost.values())
+    policy = ["# 見積方針書", "", "## 6. 見積結果", "", "> 単位: 万円", "", "| 区分 | 人月 | 労務費 | 小計 |", "|---|---:|---:|---:|"]
+    policy += [f"| {s} | {effort[s]:.1f} | {cost[s]:,.0f} | {cost[s]:,.0f} |" for s in _STAGES]
+    policy += [f"| **イニシャル合計** | {total_effort:.1f} | {total_cost:,.0f} | {total_cost:,.0f} |", ""]
+    policy += [f"初期費用は{total_cost:,.0f}万円、総工数は{total_effort:.1f}人月とする。", ""]
+    write("output/plan/estimation-policy.md", "\n".join(policy))
+
+    # 中間成果物とスライド設計書（要件の一部を ID 参照、残りは本文の言い換えで根拠を持たせる）
+    for d in range(scale.plan_docs):
+        body = [f"# 設計方針 {d + 1}", ""]
+        for p in range(scale.paragraphs // 2):
+            rid, _, text, _ = rng.choice(reqs)
+            body += [f"## {d + 1}.{p + 1} {rng.choice(_SUBJECTS)}", "", f"{text} {_sentence(rng)}（{rid}）" if p % 3 == 0 else f"{text} {_sentence(rng)}", ""]
+        write(f"output/plan/design-{d + 1:03d}.md", "\n".join(body))
+    for v in range(1, scale.volumes + 1):
+        body = [f"# Vol.{v}", ""]
+        for n in range(1, scale.slides + 1):
+            stage = rng.choice(_STAGES)
+            body += [f"## {n}. {rng.choice(_SUBJECTS)}の方針", "", f"- {_sentence(rng)}", f"- {rng.choice(reqs)[2]}", f"- {stage} {cost[stage]:,.0f}万円", ""]
+        body += ["## まとめ", "", f"- 初期費用: {total_cost:,.0f}万円", ""]
+        write(f"output/slides/vol{v}/slides.md", "\n".join(body))
+
+    if importlib.util.find_spec("openpyxl") is not None:
+        from openpyxl import Workbook
+
+        def save(wb: Workbook, path: Path) -> None:
+            # 文書プロパティの作成・更新日時を固定し、同じシードなら同じ内容・サイズにする
+            wb.properties.created = wb.properties.modified = FIXTURE_TIME
+            wb.save(path)
+
+        for i in range(max(1, scale.documents // 10)):
+            wb = Workbook()
+            ws = wb.active
+            ws.title = "機能要件一覧"
+            ws.append(["No", "区分", "要件", "優先度"])
+            for r in range(scale.paragraphs * 10):
+                ws.append([r + 1, rng.choice(_CATEGORIES), _sentence(rng), rng.choice("高中低")])
+            (project / "input").mkdir(exist_ok=True)
+            save(wb, project / "input" / f"機能要件定義書_{i:04d}.xlsx")
+
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "要件回答"
+        ws.append(["ID", "要件", "回答", "金額（万円）"])
+        for rid, _, text, _ in reqs[: scale.sheet_rows]:
+            ws.append([rid, text, "対応可", rng.choice(list(cost.values())) // 1])
+        save(wb, project / "output" / "回答シート.xlsx")
+
+    files = [p for base in (project, setup) for p in base.rglob("*") if p.is_file()]
+    return {"files": len(files), "bytes": sum(p.stat().st_size for p in files)}
+
+
+# ----------------------------------------------------------------------------
+# 段の定義
+# ----------------------------------------------------------------------------
+
+
+def _append(path: Path, line: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(f"\n{line}\n")
+
+
+def _setup_vars() -> list[str]:
+    from .render_templates import SETUP_VARIABLES
+
+    args = []
+    for name in sorted(SETUP_VARIABLES):
+        args += ["--set", f"{name}=bench-{name.lower()}"]
+    return args
+
+
+@dataclass
+class Stage:
+    """ベンチマーク対象の段。``argv(cold)`` でスクリプトの ``main`` に渡す引数を返す。"""
+
+    name: str
+    phase: str
+    module: str
+    argv: Callable[[Path, bool], list[str]]
+    mutate: Callable[[Path, int], None] | None = None  # incremental で毎回 1 ファイル変える
+    requires: tuple[str, ...] = ()
+    on_setup_tree: bool = False  # テンプレート展開はセットアップ直後のツリーで行う
+
+
+STAGES: tuple[Stage, ...] = (
+    Stage(
+        "ingest",
+        "1",
+        "ingest",
+        lambda root, cold: ["--root", str(root), *(["--force"] if cold else [])],
+        lambda root, n: _append(root / "input" / "RFP本文_0000.md", f"追記 {n}: {n}件目の補足。"),
+    ),
+    Stage(
+        "render",
+        "0",
+        "render_templates",
+        lambda root, cold: ["--root", str(root), *_setup_vars(), *(["--force"] if cold else [])],
+        lambda root, n: _append(root / "templates" / "docs" / "estimation-policy.md.tmpl", f"<!-- bench {n} -->"),
+        on_setup_tree=True,
+    ),
+    Stage(
+        "slides",
+        "5",
+        "slide_render",
+        lambda root, cold: ["--root", str(root), "--backend", "stub", *(["--force"] if cold else [])],
+        lambda root, n: _append(root / "output" / "slides" / "vol1" / "slides.md", f"- 補足 {n}"),
+    ),
+    Stage(
+        "audit",
+        "7",
+        "audit_index",
+        lambda root, cold: ["--root", str(root), *(["--rebuild"] if cold else [])],
+        lambda root, n: _append(root / "output" / "slides" / "vol1" / "slides.md", f"- 監視機能は監査ログを日次バッチで保管できること {n}"),
+    ),
+    Stage(
+        "facts",
+        "7",
+        "fact_index",
+        lambda root, cold: ["--root", str(root), *(["--rebuild"] if cold else [])],
+        lambda root, n: _append(root / "output" / "plan" / "estimation-policy.md", f"- 補足費用{n}: {n * 10}万円"),
+    ),
+    Stage(
+        "estimate",
+        "4",
+        "estimate",
+        lambda root, cold: ["--root", str(root), "--trials", "20000", "--seed", "1"],
+        requires=("numpy",),
+    ),
+)
+
+
+def _invoke(stage: Stage, argv: list[str]) -> int:
+    module = importlib.import_module(f".{stage.module}", __package__)
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return module.main(argv)
+
+
+# ----------------------------------------------------------------------------
+# 計測
+# ----------------------------------------------------------------------------
+
+
+def _median(samples: list[Measurement]) -> dict[str, float]:
+    result = {k: statistics.median(getattr(m, k) for m in samples) for k in asdict(samples[0])}
+    result["min_wall_ms"] = min(m.wall_ms for m in samples)
+    return result
+
+
+def run_stage(stage: Stage, project: Path, setup: Path, repeat: int) -> dict:
+    """1 段を各条件で ``repeat`` 回計測し、中央値を返す。"""
+    missing = [m for m in stage.requires if importlib.util.find_spec(m) is None]
+    if missing:
+        return {"phase": stage.phase, "status": "skipped", "reason": f"{', '.join(missing)} が未インストール", "modes": {}}
+    root = setup if stage.on_setup_tree else project
+    modes: dict[str, dict[str, float]] = {}
+    plan = [("cold", True)] * repeat
+    mutate = stage.mutate
+    if mutate is not None:
+        plan += [("warm", False)] * repeat + [("incremental", False)] * repeat
+    samples: dict[str, list[Measurement]] = {}
+    for n, (mode, cold) in enumerate(plan):
+        if mode == "incremental" and mutate is not None:
+            mutate(root, n)
+        with measure() as m:
+            code = _invoke(stage, stage.argv(root, cold))
+        if code not in (0, None):
+            return {"phase": stage.phase, "status": "failed", "reason": f"{mode}: 終了コード {code}", "modes": modes}
+        samples.setdefault(mode, []).append(m)
+    for mode, ms in samples.items():
+        modes[mode] = _median(ms)
+    return {"phase": stage.phase, "status": "ok", "reason": "", "modes": modes}
+
+
+def _versions() -> dict[str, str | None]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    found: dict[str, str | None] = {}
+    for name in ("numpy", "openpyxl", "pyarrow", "pypdf"):
+        try:
+            found[name] = version(name)
+        except PackageNotFoundError:
+            found[name] = None
+    return found
+
+
+def run_benchmark(root: Path, work: Path, scale: float, seed: int, repeat: int, only: list[str]) -> dict:
+    if work.exists():
+        if not (work / MARKER).exists():
+            raise RuntimeError(f"{work} はベンチマークの作業ディレクトリではありません（{MARKER} がない）")
+        shutil.rmtree(work)
+    work.mkdir(parents=True)
+    (work / MARKER).touch()
+    sizes = Scale().times(scale)
+    started = time.perf_counter()
+    fixture = build_fixture(work / "project", work / "setup", root / "templates", sizes, seed)
+    build_ms = round((time.perf_counter() - started) * 1000, 1)
+    stages = {}
+    for stage in STAGES:
+        if only and stage.name not in only:
+            continue
+        print(f"bench: {stage.name} ...", file=sys.stderr)
+        stages[stage.name] = run_stage(stage, work / "project", work / "setup", repeat)
+    return {
+        "version": RESULT_VERSION,
+        "created": dt.datetime.now().astimezone().isoformat(timespec="seconds"),
+        "scale": scale,
+        "seed": seed,
+        "repeat": repeat,
+        "sizes": asdict(sizes),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "packages": _versions(),
+        },
+        "fixture": {**fixture, "build_ms": build_ms},
+        "stages": stages,
+    }
+
+
+# ----------------------------------------------------------------------------
+# 比較とレポート
+# ----------------------------------------------------------------------------
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[tuple[str, str, str, float, float]]:
+    """``(段, 条件, 指標, 基準, 今回)`` の悪化を返す。"""
+    regressions = []
+    for name, stage in current["stages"].items():
+        base = baseline.get("stages", {}).get(name, {}).get("modes", {})
+        for mode, now in stage["modes"].items():
+            before = base.get(mode)
+            if not before:
+                continue
+            for key, floor in (("wall_ms", MIN_DELTA_MS), ("reads", MIN_DELTA_IO), ("writes", MIN_DELTA_IO)):
+                if now[key] > before[key] * (1 + threshold) and now[key] - before[key] > floor:
+                    regressions.append((name, mode, key, before[key], now[key]))
+    return regressions
+
+
+def format_report(result: dict, baseline: dict | None = None, regressions: list | None = None) -> str:
+    env = result["environment"]
+    fixture = result["fixture"]
+    lines = [
+        "# パイプライン段のベンチマーク",
+        "",
+        f"- 規模: scale {result['scale']} / seed {result['seed']} / 各条件 {result['repeat']} 回の中央値",
+        f"- 合成 RFP: {fixture['files']:,} files / {format_size(fixture['bytes'])}（生成 {fixture['build_ms']:,.0f} ms）",
+        f"- 環境: Python {env['python']} / {env['platform']} / {env['cpus']} CPU",
+        "",
+    ]
+    head = "| 段 | Phase | 条件 | 経過時間 | CPU 時間 | read / write 回数 | 読込 / 書込量 |"
+    sep = "|----|-------|------|---------:|---------:|------------------:|--------------:|"
+    if baseline:
+        head += " 基準 | 比 |"
+        sep += "-----:|---:|"
+    lines += [head, sep]
+    flagged = {(r[0], r[1]) for r in regressions or []}
+    for name, stage in result["stages"].items():
+        if stage["status"] != "ok":
+            lines.append(f"| {name} | {stage['phase']} | {stage['status']}: {stage['reason']} | | | | |" + (" | |" if baseline else ""))
+            continue
+        for mode in MODES:
+            m = stage["modes"].get(mode)
+            if not m:
+                continue
+            row = (
+                f"| {name} | {stage['phase']} | {mode} | {m['wall_ms']:,.1f} ms | {m['cpu_ms']:,.1f} ms | "
+                f"{m['reads']:,.0f} / {m['writes']:,.0f} | {format_size(m['read_bytes'])} / {format_size(m['write_bytes'])} |"
+            )
+            if baseline:
+                before = baseline.get("stages", {}).get(name, {}).get("modes", {}).get(mode)
+                if before:
+                    ratio = m["wall_ms"] / before["wall_ms"] if before["wall_ms"] else float("inf")
+                    mark = " **REGRESSION**" if (name, mode) in flagged else ""
+                    row += f" {before['wall_ms']:,.1f} ms | {ratio:.2f}x{mark} |"
+                else:
+                    row += " - | - |"
+            lines.append(row)
+    if regressions:
+        lines += ["", "## 回帰", ""]
+        for name, mode, key, before, now in regressions:
+            lines.append(f"- {name} / {mode}: {key} {before:,.1f} → {now:,.1f}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--workdir", type=Path, default=None, help=f"合成 RFP の作業ディレクトリ（既定: {WORK_DIR}）")
+    parser.add_argument("--scale", type=float, default=1.0, help="合成 RFP の規模（1 = 資料 40 件・要件 300 件・スライド 50 枚）")
+    parser.add_argument("--seed", type=int, default=0, help="合成 RFP の乱数シード")
+    parser.add_argument("--repeat", type=int, default=3, help="各条件の実行回数（中央値を記録）")
+    parser.add_argument("--stage", action="append", default=[], choices=[s.name for s in STAGES], help="計測する段（複数指定可、既定: すべて）")
+    parser.add_argument("--save", type=Path, default=None, help="結果 JSON の保存先")
+    parser.add_argument("--compare", type=Path, default=None, help="比較する基準の結果 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="回帰とみなす悪化率（既定: 0.2 = 20%%）")
+    parser.add_argument("--output", type=Path, default=None, help="Markdown レポートの書き出し先")
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力する")
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    baseline = None
+    if args.compare:
+        baseline = load_json(args.compare)
+        if not baseline or baseline.get("version") != RESULT_VERSION:
+            print(f"error: 基準の結果を読み込めません: {args.compare}", file=sys.stderr)
+            return 2
+        if (baseline["scale"], baseline["seed"]) != (args.scale, args.seed):
+            print(f"error: 基準と規模が異なります（基準: scale {baseline['scale']} / seed {baseline['seed']}）", file=sys.stderr)
+            return 2
+    try:
+        result = run_benchmark(root, (root / (args.workdir or WORK_DIR)).resolve(), args.scale, args.seed, args.repeat, args.stage)
+    except RuntimeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    regressions = compare(result, baseline, args.threshold) if baseline else []
+    if args.save:
+        save_json(args.save, result)
+
+    if args.json:
+        print(json.dumps(result | {"regressions": regressions}, ensure_ascii=False, indent=2))
+    else:
+        report = format_report(result, baseline, regressions)
+        if args.output:
+            atomic_write_text(args.output, report + "\n")
+        else:
+            print(report)
+    failed = [name for name, s in result["stages"].items() if s["status"] == "failed"]
+    if failed:
+        print(f"error: 失敗した段があります: {', '.join(failed)}", file=sys.stderr)
+        return 2
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
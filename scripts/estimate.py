@@ -0,0 +1,531 @@
+# ============================================================================
+# estimate.py — WBS コスト集計とモンテカルロによるバッファ算定（Phase 4）
+# ============================================================================
+"""``org-data/rate-card.md`` と ``output/plan/wbs.md`` の表を NumPy 配列に変換し、
+工程 × ロールのコスト集計、工数不確実性のモンテカルロ、N 年 TCO をベクトル演算で算出する。
+
+- 単価表は標準単価（ロール・グレード別）、統一単価、請負単価（FP / 画面 / バッチ / IF）、
+  値引基準を読み取る
+- WBS の各作業は「工数 × 人月単価」、数量と単位を持つ作業は「数量 × 請負単価」で原価化する
+- モンテカルロは作業ごとの三点見積（最小・最頻・最大）の PERT 分布を分位点表にしておき、
+  一様乱数で表を引いて工数をサンプリングする。試行はバッチに分けて総額を求める（10 万試行でもメモリは一定）
+- 三点見積のない作業は幅 0（最頻値で固定）として扱う。幅を仮定する場合は ``--spread`` で明示する
+- 結果は ``cost-breakdown.md`` 形式の Markdown で出力する
+
+使い方::
+
+    python -m scripts.estimate                                   # 既定パスを読み、結果を表示
+    python -m scripts.estimate --discount-tier 大型案件 --output output/plan/cost-breakdown.md
+    python -m scripts.estimate --trials 200000 --confidence 90 --seed 42
+    python -m scripts.estimate --spread 0.9,1.5                  # 三点見積のない作業に幅を仮定する
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - main() で案内する
+    np = None  # type: ignore[assignment]
+
+from ._common import atomic_write_text, iter_markdown_tables, parse_number, repo_root
+
+RATE_CARD = Path("org-data/rate-card.md")
+WBS = Path("output/plan/wbs.md")
+
+DEFAULT_TRIALS = 100_000
+BATCH = 10_000
+#: PERT 分布の分位点表の段数（作業ごと）。表の 1 段は確率 1/QUANTILES に相当する
+QUANTILES = 1024
+_GRID = 2049
+
+#: 請負単価の単位キーワード（WBS の「単位」列と rate-card の「見積方式」「単位」列を突き合わせる）
+UNIT_KEYWORDS = {"FP": ("FP", "ファンクション"), "画面": ("画面",), "バッチ": ("バッチ",), "IF": ("IF", "インターフェース")}
+
+
+# ----------------------------------------------------------------------------
+# 表の読み込み
+# ----------------------------------------------------------------------------
+
+
+def _role_key(text: str) -> str:
+    """「PjM（プロジェクトマネージャー）」→「pjm」のように括弧書きを除いて正規化する。"""
+    return re.sub(r"[（(].*?[)）]", "", text).strip().lower()
+
+
+def _column(row: dict[str, str], *needles: str) -> str | None:
+    """見出しに ``needles`` のいずれかを含む列名を返す。"""
+    for key in row:
+        if any(n in key for n in needles):
+            return key
+    return None
+
+
+def _unit_key(text: str) -> str | None:
+    for key, words in UNIT_KEYWORDS.items():
+        if any(w in text for w in words):
+            return key
+    return None
+
+
+@dataclass
+class RateCard:
+    """``rate-card.md`` から読み取った単価体系（単位: 万円）。"""
+
+    roles: dict[tuple[str, str], float] = field(default_factory=dict)  # (ロール, グレード) → 人月単価
+    unified: float | None = None
+    units: dict[str, float] = field(default_factory=dict)  # 単位キー → 単価
+    discounts: dict[str, float] = field(default_factory=dict)  # 条件 → 値引率
+
+    def rate(self, role: str, grade: str = "") -> float | None:
+        """人月単価を返す。単価表にないグレードや、グレード未指定で単価が一意に決まらない場合は ``None``。"""
+        key = _role_key(role)
+        if (key, grade) in self.roles:
+            return self.roles[(key, grade)]
+        same_role = [v for (r, _), v in self.roles.items() if r == key]
+        if same_role:
+            return same_role[0] if not grade and len(same_role) == 1 else None
+        return self.unified
+
+
+def parse_rate_card(text: str) -> RateCard:
+    card = RateCard()
+    for rows in iter_markdown_tables(text):
+        if not rows:
+            continue
+        head = rows[0]
+        price = _column(head, "単価")
+        if "ロール" in head and price and "パートナー" not in head:
+            for r in rows:
+                value = parse_number(r[price])
+                if value is not None:
+                    card.roles[(_role_key(r["ロール"]), r.get("グレード", "").strip())] = value
+        elif "見積方式" in head and price:
+            for r in rows:
+                unit = _unit_key(r["見積方式"]) or _unit_key(r.get("単位", ""))
+                value = parse_number(r[price])
+                if unit and value is not None:
+                    card.units[unit] = value
+        elif "項目" in head and "金額" in head:
+            for r in rows:
+                if "統一" in r["項目"]:
+                    card.unified = parse_number(r["金額"])
+        elif "条件" in head and (rate_col := _column(head, "値引率")):
+            for r in rows:
+                value = parse_number(r[rate_col])
+                if value is not None:
+                    card.discounts[r["条件"].strip()] = value / 100
+    return card
+
+
+@dataclass
+class Wbs:
+    """WBS を列指向の配列にしたもの。"""
+
+    stages: list[str]  # 集計行のラベル（フェーズ列があれば「フェーズ / 工程」）
+    roles: list[str]
+    stage_idx: "np.ndarray"
+    role_idx: "np.ndarray"
+    mode: "np.ndarray"  # 最頻値（人月 または 数量）
+    low: "np.ndarray"
+    high: "np.ndarray"
+    rate: "np.ndarray"  # 単価（万円/人月 または 万円/単位）
+    is_effort: "np.ndarray"  # True: 人月、False: 請負単位
+    running: dict[str, "np.ndarray"]  # 費目 → 年額（万円）の配列
+    warnings: list[str]
+    single: int = 0  # 三点見積（最小・最大）のない作業数
+    spread: tuple[float, float] | None = None  # single の作業に仮定した（最小, 最大）の倍率
+
+
+def parse_wbs(
+    text: str, card: RateCard, *, years: int, spread: tuple[float, float] | None = None
+) -> Wbs:
+    """WBS と運用費の表を読み取り、単価を引き当てて配列化する。
+
+    最小・最大のない作業は ``spread``（最頻値に対する倍率）を指定した場合だけ幅を持たせ、
+    省略時は最頻値で固定する。
+    """
+    stages: dict[str, int] = {}
+    roles: dict[str, int] = {}
+    cols: dict[str, list] = {k: [] for k in ("stage", "role", "mode", "low", "high", "rate", "effort")}
+    running: dict[str, np.ndarray] = {}
+    warnings: list[str] = []
+    single = 0
+
+    for rows in iter_markdown_tables(text):
+        if not rows:
+            continue
+        head = rows[0]
+        if "費目" in head:
+            fy_cols = [k for k in head if re.fullmatch(r"FY\s*\d+.*", k)]
+            annual = _column(head, "年額")
+            for r in rows:
+                if fy_cols:
+                    values = [parse_number(r[k]) or 0.0 for k in fy_cols][:years]
+                    values += [values[-1] if values else 0.0] * (years - len(values))
+                elif annual:
+                    values = [parse_number(r[annual]) or 0.0] * years
+                else:
+                    continue
+                running[r["費目"]] = np.asarray(values, dtype=np.float64)
+            continue
+        if "工程" not in head:
+            continue
+        effort_col = _column(head, "工数")
+        qty_col = _column(head, "数量")
+        low_col = _column(head, "最小", "楽観")
+        high_col = _column(head, "最大", "悲観")
+        phase_col = _column(head, "フェーズ")
+        for r in rows:
+            stage = r["工程"].strip()
+            if not stage or stage.startswith(("合計", "**合計")):
+                continue
+            label = f"{r[phase_col].strip()} / {stage}" if phase_col and r[phase_col].strip() else stage
+            unit = _unit_key(r.get("単位", "")) if qty_col else None
+            likely: float | None
+            if unit is not None and qty_col is not None:
+                likely = parse_number(r[qty_col])
+                rate = card.units.get(unit)
+                role = f"請負（{unit}）"
+                if rate is None:
+                    warnings.append(f"請負単価が未設定: {unit}（{stage} / {r.get('作業項目', '')}）")
+            else:
+                likely = parse_number(r[effort_col]) if effort_col else None
+                role = r.get("ロール", "").strip() or "（未指定）"
+                grade = r.get("グレード", "").strip()
+                rate = card.rate(role, grade)
+                if rate is None:
+                    warnings.append(f"人月単価が未設定: {role}{f' / {grade}' if grade else ''}（{stage} / {r.get('作業項目', '')}）")
+            if likely is None:
+                continue
+            minimum = parse_number(r[low_col]) if low_col else None
+            maximum = parse_number(r[high_col]) if high_col else None
+            if minimum is None and maximum is None:
+                single += 1
+            lo, hi = spread or (1.0, 1.0)
+            cols["stage"].append(stages.setdefault(label, len(stages)))
+            cols["role"].append(roles.setdefault(role, len(roles)))
+            cols["mode"].append(likely)
+            cols["low"].append(minimum if minimum is not None else likely * lo)
+            cols["high"].append(maximum if maximum is not None else likely * hi)
+            cols["rate"].append(rate or 0.0)
+            cols["effort"].append(unit is None)
+
+    mode = np.asarray(cols["mode"], dtype=np.float64)
+    low = np.minimum(np.asarray(cols["low"], dtype=np.float64), mode)
+    high = np.maximum(np.asarray(cols["high"], dtype=np.float64), mode)
+    return Wbs(
+        stages=list(stages),
+        roles=list(roles),
+        stage_idx=np.asarray(cols["stage"], dtype=np.intp),
+        role_idx=np.asarray(cols["role"], dtype=np.intp),
+        mode=mode,
+        low=low,
+        high=high,
+        rate=np.asarray(cols["rate"], dtype=np.float64),
+        is_effort=np.asarray(cols["effort"], dtype=bool),
+        running=running,
+        warnings=warnings,
+        single=single,
+        spread=spread,
+    )
+
+
+# ----------------------------------------------------------------------------
+# 計算
+# ----------------------------------------------------------------------------
+
+
+def rollup(wbs: Wbs) -> tuple[np.ndarray, np.ndarray]:
+    """工程 × ロールのコスト行列（万円）と工数行列（人月、請負単位は 0）を返す。"""
+    shape = (len(wbs.stages), len(wbs.roles))
+    cost = np.zeros(shape)
+    effort = np.zeros(shape)
+    np.add.at(cost, (wbs.stage_idx, wbs.role_idx), wbs.mode * wbs.rate)
+    np.add.at(effort, (wbs.stage_idx, wbs.role_idx), np.where(wbs.is_effort, wbs.mode, 0.0))
+    return cost, effort
+
+
+def pert_quantiles(alpha: np.ndarray, beta: np.ndarray, k: int = QUANTILES) -> np.ndarray:
+    """Beta(alpha, beta) の分位点を ``(k, 作業数)`` の表で返す（各段は確率区間の中点）。
+
+    PERT の形状母数は 1 以上で密度が有界なので、格子上の台形積分で CDF を求めて逆補間する。
+    """
+    shapes, inverse = np.unique(np.stack([alpha, beta], axis=1), axis=0, return_inverse=True)
+    x = np.linspace(0.0, 1.0, _GRID)
+    u = (np.arange(k) + 0.5) / k
+    table = np.empty((k, len(shapes)))
+    for i, (a, b) in enumerate(shapes):
+        pdf = x ** (a - 1) * (1 - x) ** (b - 1)
+        cdf = np.concatenate(([0.0], np.cumsum(pdf[1:] + pdf[:-1])))
+        table[:, i] = np.interp(u, cdf / cdf[-1], x)
+    return table[:, inverse.ravel()]
+
+
+def monte_carlo(wbs: Wbs, trials: int = DEFAULT_TRIALS, seed: int | None = None, batch: int = BATCH) -> np.ndarray:
+    """PERT 分布で作業ごとの工数をサンプリングし、試行ごとの総額（万円）を返す。
+
+    ``rng.beta`` で毎回引く代わりに、作業ごとの分位点表（金額換算済み、float32）を一様な整数乱数で
+    引く。同じ ``seed`` なら結果は同一になる。
+    """
+    rng = np.random.default_rng(seed)
+    width = wbs.high - wbs.low
+    fixed = width <= 0
+    # 幅のない作業は定数項にまとめ、乱数は不確実な作業の分だけ引く
+    base = float(wbs.mode[fixed] @ wbs.rate[fixed])
+    low, width, rate = wbs.low[~fixed], width[~fixed], wbs.rate[~fixed]
+    offset = base + float(low @ rate)
+    totals = np.full(trials, offset)
+    if not width.size:
+        return totals
+    alpha = 1 + 4 * (wbs.mode[~fixed] - low) / width
+    beta = 1 + 4 * (wbs.high[~fixed] - wbs.mode[~fixed]) / width
+    table = (pert_quantiles(alpha, beta) * (width * rate)).astype(np.float32).ravel()
+    items = width.size
+    columns = np.arange(items)
+    for start in range(0, trials, batch):
+        n = min(batch, trials - start)
+        idx = rng.integers(0, QUANTILES, size=(n, items))
+        idx *= items
+        idx += columns
+        totals[start : start + n] += table.take(idx).sum(axis=1, dtype=np.float64)
+    return totals
+
+
+@dataclass
+class Estimate:
+    """集計結果一式（金額の単位はすべて万円）。"""
+
+    base: float
+    discount: float
+    buffer: float
+    initial: float
+    percentiles: dict[int, float]
+    tco: np.ndarray  # 年ごとの TCO
+    elapsed_ms: dict[str, float]
+
+
+def estimate(
+    wbs: Wbs,
+    *,
+    discount: float = 0.0,
+    buffer: float | None = None,
+    confidence: int = 80,
+    trials: int = DEFAULT_TRIALS,
+    seed: int | None = None,
+    years: int = 5,
+) -> Estimate:
+    timings: dict[str, float] = {}
+    t0 = time.perf_counter()
+    base = float(wbs.mode @ wbs.rate)
+    timings["rollup"] = (time.perf_counter() - t0) * 1000
+
+    t1 = time.perf_counter()
+    levels = sorted({50, 80, 95, confidence})
+    if trials > 0 and wbs.mode.size:
+        totals = monte_carlo(wbs, trials, seed)
+        percentiles = dict(zip(levels, np.percentile(totals, levels).tolist()))
+    else:
+        percentiles = {p: base for p in levels}
+    timings["monte_carlo"] = (time.perf_counter() - t1) * 1000
+
+    if buffer is None:
+        buffer = max(percentiles[confidence] / base - 1, 0.0) if base else 0.0
+    # 値引は総額に対して適用する（rate-card.md 3.2）
+    initial = base * (1 + buffer) * (1 - discount)
+    tco = np.zeros(years)
+    tco[0] = initial
+    for values in wbs.running.values():
+        tco += values[:years]
+    return Estimate(base, discount, buffer, initial, percentiles, tco, timings)
+
+
+# ----------------------------------------------------------------------------
+# 出力
+# ----------------------------------------------------------------------------
+
+
+def _yen(value: float) -> str:
+    return f"{value:,.1f}"
+
+
+def format_report(wbs: Wbs, est: Estimate, confidence: int, trials: int) -> str:
+    cost, effort = rollup(wbs)
+    lines = ["# コスト内訳（自動算出）", "", "> 単位: 万円（税抜）。`python -m scripts.estimate` で生成。", ""]
+
+    lines += ["## 1. 工程別 × ロール別コスト", ""]
+    lines.append("| 工程 | " + " | ".join(wbs.roles) + " | 合計 | 工数（人月） |")
+    lines.append("|------|" + "---:|" * (len(wbs.roles) + 2))
+    for i, stage in enumerate(wbs.stages):
+        cells = " | ".join(_yen(v) for v in cost[i])
+        lines.append(f"| {stage} | {cells} | **{_yen(cost[i].sum())}** | {effort[i].sum():,.2f} |")
+    col = cost.sum(axis=0)
+    lines.append(
+        "| **合計** | " + " | ".join(f"**{_yen(v)}**" for v in col) + f" | **{_yen(cost.sum())}** | **{effort.sum():,.2f}** |"
+    )
+
+    lines += [
+        "",
+        "## 2. 初期費用",
+        "",
+        "| 項目 | 金額 |",
+        "|------|-----:|",
+        f"| 積算額（最頻値） | {_yen(est.base)} |",
+        f"| バッファ（{est.buffer:.1%}） | {_yen(est.base * est.buffer)} |",
+        f"| 値引（{est.discount:.1%}、総額に適用） | -{_yen(est.base * (1 + est.buffer) * est.discount)} |",
+        f"| **初期費用** | **{_yen(est.initial)}** |",
+    ]
+
+    lines += ["", "## 3. 工数不確実性（モンテカルロ）", ""]
+    items = wbs.mode.size
+    if wbs.single and wbs.spread:
+        lines += [
+            f"> **仮定**: 三点見積のない作業 {wbs.single} / {items} 件は、最頻値の "
+            f"{wbs.spread[0]:.0%}〜{wbs.spread[1]:.0%} を幅と仮定した（`--spread`）。WBS の見積値ではない。",
+            "",
+        ]
+    elif wbs.single:
+        lines += [
+            f"> **注意**: 三点見積のない作業 {wbs.single} / {items} 件は幅 0（最頻値で固定）として扱った。"
+            "これらの作業の不確実性はバッファ率に含まれない。",
+            "",
+        ]
+    if trials > 0:
+        lines += [
+            f"三点見積（最小・最頻・最大）の PERT 分布で {trials:,} 試行。作業間の相関は考慮しない。",
+            "",
+            "| 信頼水準 | 総額 | 積算額に対するバッファ率 |",
+            "|---------|-----:|----------------------:|",
+        ]
+        for p, value in est.percentiles.items():
+            mark = "**" if p == confidence else ""
+            rate = value / est.base - 1 if est.base else 0.0
+            lines.append(f"| {mark}P{p}{mark} | {_yen(value)} | {mark}{rate:.1%}{mark} |")
+        lines += ["", f"P{confidence} に基づくバッファ率: **{max(est.percentiles[confidence] / est.base - 1, 0) if est.base else 0:.1%}**"]
+    else:
+        lines.append("_(モンテカルロは実行していない)_")
+
+    years = est.tco.size
+    lines += ["", f"## 4. TCO（{years} 年）", ""]
+    lines.append("| 費目 | " + " | ".join(f"FY{i + 1}" for i in range(years)) + " | 合計 |")
+    lines.append("|------|" + "---:|" * (years + 1))
+    initial_row = np.zeros(years)
+    initial_row[0] = est.initial
+    for name, values in [("初期費用", initial_row), *wbs.running.items()]:
+        lines.append(f"| {name} | " + " | ".join(_yen(v) for v in values[:years]) + f" | {_yen(values[:years].sum())} |")
+    lines.append("| **TCO** | " + " | ".join(f"**{_yen(v)}**" for v in est.tco) + f" | **{_yen(est.tco.sum())}** |")
+
+    if wbs.warnings:
+        lines += ["", "## 警告", ""] + [f"- {w}" for w in wbs.warnings]
+    return "\n".join(lines)
+
+
+def _spread(text: str) -> tuple[float, float]:
+    try:
+        low, high = (float(v) for v in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"LOW,HIGH 形式で指定してください: {text}") from None
+    if not 0 < low <= 1 <= high:
+        raise argparse.ArgumentTypeError(f"0 < LOW <= 1 <= HIGH を満たしてください: {text}")
+    return low, high
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.estimate", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--rate-card", type=Path, default=None, help=f"単価表（既定: {RATE_CARD}）")
+    parser.add_argument("--wbs", type=Path, default=None, help=f"WBS（既定: {WBS}）")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS, help="モンテカルロの試行回数（0 で省略）")
+    parser.add_argument("--seed", type=int, default=None, help="乱数シード（再現性が必要な場合）")
+    parser.add_argument("--confidence", type=int, default=80, help="バッファ率の根拠とする信頼水準（%%）")
+    parser.add_argument("--buffer", type=float, default=None, help="バッファ率を固定する（例: 0.15）")
+    parser.add_argument(
+        "--spread",
+        type=_spread,
+        default=None,
+        metavar="LOW,HIGH",
+        help="三点見積のない作業に仮定する幅（最頻値に対する倍率、例: 0.9,1.5）。省略時は幅 0",
+    )
+    discount = parser.add_mutually_exclusive_group()
+    discount.add_argument("--discount", type=float, default=0.0, help="値引率（例: 0.05）")
+    discount.add_argument("--discount-tier", default=None, help="rate-card.md 3.1 の条件名で値引率を指定する")
+    parser.add_argument("--years", type=int, default=5, help="TCO の年数")
+    parser.add_argument("--output", type=Path, default=None, help="Markdown の書き出し先")
+    parser.add_argument("--json", action="store_true", help="集計結果を JSON で出力する")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("error: numpy が必要です（pip install numpy）", file=sys.stderr)
+        return 2
+    root = repo_root(args.root)
+    started = time.perf_counter()
+    card = parse_rate_card((args.rate_card or root / RATE_CARD).read_text(encoding="utf-8"))
+    wbs_path = args.wbs or root / WBS
+    if not wbs_path.exists():
+        print(f"error: {wbs_path} がありません（guides/05-estimation.md の WBS 生成を先に行ってください）", file=sys.stderr)
+        return 2
+    wbs = parse_wbs(wbs_path.read_text(encoding="utf-8"), card, years=args.years, spread=args.spread)
+    parse_ms = (time.perf_counter() - started) * 1000
+
+    rate = args.discount
+    if args.discount_tier is not None:
+        matches = [v for k, v in card.discounts.items() if args.discount_tier in k]
+        if not matches:
+            print(f"error: 値引基準に「{args.discount_tier}」がありません: {', '.join(card.discounts)}", file=sys.stderr)
+            return 2
+        rate = matches[0]
+    est = estimate(
+        wbs,
+        discount=rate,
+        buffer=args.buffer,
+        confidence=args.confidence,
+        trials=args.trials,
+        seed=args.seed,
+        years=args.years,
+    )
+    est.elapsed_ms["parse"] = parse_ms
+
+    if args.json:
+        cost, effort = rollup(wbs)
+        print(
+            json.dumps(
+                {
+                    "stages": wbs.stages,
+                    "roles": wbs.roles,
+                    "cost": cost.tolist(),
+                    "effort": effort.tolist(),
+                    "base": est.base,
+                    "buffer": est.buffer,
+                    "discount": est.discount,
+                    "initial": est.initial,
+                    "percentiles": est.percentiles,
+                    "tco": est.tco.tolist(),
+                    "warnings": wbs.warnings,
+                    "single_estimate_items": wbs.single,
+                    "spread": wbs.spread,
+                    "elapsed_ms": est.elapsed_ms,
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+        return 0
+    report = format_report(wbs, est, args.confidence, args.trials)
+    if args.output:
+        atomic_write_text(args.output, report + "\n")
+    else:
+        print(report)
+    timings = ", ".join(f"{k} {v:,.1f} ms" for k, v in est.elapsed_ms.items())
+    print(f"\n{wbs.mode.size} WBS items; {timings}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
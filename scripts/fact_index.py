@@ -0,0 +1,644 @@
+# ============================================================================
+# fact_index.py — 成果物横断の数値ファクト索引と整合性チェック
+# ============================================================================
+"""スライド・回答シート・中間成果物から金額・工数を抽出して項目名で索引し、
+``estimation-policy.md`` を正本として食い違う記載と、合計と内訳の不一致を検出する。
+
+``guides/08-review.md`` の「2. 数値整合性チェック」の機械的な部分を担う。
+
+- ``万円`` / ``億円`` / ``1億2,000万円`` / ``人月`` / 全角数字 / ``▲`` 付きの負数を正規化し、
+  金額は円、工数は人月の数値として扱う。表のセルは列見出しの単位（``金額（万円）``）や
+  文書中の「単位: 万円」の宣言を引き継ぐ
+- 各ファクトに出典（``path`` と行番号 ``L12`` / シートのセル ``見積!D7``）と項目名を付ける。
+  表は行見出し（同じ行に同じ種類の数値が複数あれば ``行|列``）、本文は数値の直前の語句を項目名にする。
+  WBS の「工程」のように複数行に同じ見出しが現れる列は区分とみなし、その行は作業項目で引く
+- ファクトは SQLite に項目名で索引し、変更のあったファイルだけを再抽出する。正本を 1 行直せば、
+  その 1 ファイルの再抽出と索引の結合だけで全ボリュームの古い記載が分かる
+- 表の「合計」「小計」行・列は、内訳の和と一致するかを検算する
+
+使い方::
+
+    python -m scripts.fact_index                         # 差分更新して不整合を表示
+    python -m scripts.fact_index --check                 # 不整合があれば終了コード 1
+    python -m scripts.fact_index show 初期費用            # 項目名で全成果物の記載を検索
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from ._common import atomic_write_text, cache_path, iter_markdown_grids, repo_root, sha256_file
+
+DB_NAME = "fact-index.sqlite"
+SCHEMA_VERSION = 2
+
+#: 数値の正本（見積の一次ソース）
+CANONICAL = (Path("output/plan/estimation-policy.md"),)
+
+#: 索引するファイル（リポジトリルートからの glob）
+CORPUS_GLOBS = (
+    "output/slides/*/slides.md",
+    "output/plan/**/*.md",
+    "output/*.xlsx",
+)
+
+#: 単位 → (次元, 倍率)。金額は円、工数は人月（人日は換算しない）に揃える
+UNITS = {
+    "千万円": ("円", 1e7),
+    "百万円": ("円", 1e6),
+    "万円": ("円", 1e4),
+    "千円": ("円", 1e3),
+    "億円": ("円", 1e8),
+    "円": ("円", 1.0),
+    "人月": ("人月", 1.0),
+    "人日": ("人日", 1.0),
+}
+_UNIT = "|".join(UNITS)
+_NUM = r"\d[\d,]*(?:\.\d+)?"
+# 「1億2,000万円」「3,804万円」「1.5人月」「¥1,000」「▲300万円」（NFKC 正規化後の文字列に適用）
+_AMOUNT = re.compile(
+    rf"(?<![\dA-Za-z.,])(?P<neg>[-−▲△])?\s*"
+    rf"(?:¥\s*(?P<yen>{_NUM})|"
+    rf"(?:(?P<oku>{_NUM})\s*億\s*)?(?:(?P<man>{_NUM})\s*万\s*)?(?P<rest>{_NUM})?\s*(?P<unit>{_UNIT}))"
+)
+_BARE = re.compile(rf"(?P<neg>[-−▲△])?\s*(?P<num>{_NUM})")
+_DECLARED = re.compile(rf"単位\s*[:]?\s*({_UNIT})")
+_HEADER_UNIT = re.compile(rf"\(\s*({_UNIT})")
+_TOTAL = re.compile(r"合計|小計|総額|総計|^計$|total", re.IGNORECASE)
+_SUBTOTAL = re.compile(r"小計")
+#: 行方向の合計検算から除く列（積で求まる値や比率）
+_NOT_ADDITIVE = re.compile(r"単価|数量|率|割合|%|件数|月額")
+_MARKUP = re.compile(r"[*_`~]+|<[^>]+>")
+_LEADER = re.compile(r"^\s*(?:[-*+>]|\d+[.)]|[①-⑳])\s*")
+_TRAILER = re.compile(r"(?:\s|は|が|を|も|で|:|=|約|およそ|概算|計上|として)+$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_TABLE_SEP = re.compile(r"\|?(\s*:?-{2,}:?\s*\|)+\s*:?-*:?\s*\|?")
+
+
+# ----------------------------------------------------------------------------
+# 抽出
+# ----------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Fact:
+    """出典付きの数値 1 件（``value`` は円または人月、``ulp`` は表記上の最小桁）。"""
+
+    path: str
+    locator: str
+    label: str
+    key: str
+    dim: str
+    value: float
+    ulp: float
+    text: str
+
+
+@dataclass(frozen=True)
+class SumCheck:
+    """合計行・列の検算結果。"""
+
+    path: str
+    locator: str
+    label: str
+    dim: str
+    stated: float
+    parts: float
+    tolerance: float
+
+    @property
+    def ok(self) -> bool:
+        return abs(self.stated - self.parts) <= self.tolerance
+
+
+def normalize(text: str) -> str:
+    """全角英数・記号を半角に揃える（NFKC）。"""
+    return unicodedata.normalize("NFKC", text)
+
+
+def label_key(label: str) -> str:
+    """項目名を照合用のキーにする（装飾・括弧書き・空白を除き小文字化）。"""
+    text = _MARKUP.sub("", normalize(label))
+    text = re.sub(r"\([^)]*\)|\[[^\]]*\]", "", text)
+    text = _LEADER.sub("", text)
+    return re.sub(r"\s+", "", _TRAILER.sub("", text)).lower()
+
+
+def _number(text: str) -> tuple[float, int]:
+    """``"1,234.5"`` → ``(1234.5, 小数桁数)``"""
+    plain = text.replace(",", "")
+    return float(plain), len(plain.partition(".")[2])
+
+
+def parse_amount(m: re.Match[str]) -> tuple[str, float, float]:
+    """``_AMOUNT`` の一致から ``(次元, 値, 最小桁)`` を求める。"""
+    sign = -1.0 if m.group("neg") else 1.0
+    if m.group("yen"):
+        value, dec = _number(m.group("yen"))
+        return "円", sign * value, 10.0**-dec
+    dim, scale = UNITS[m.group("unit")]
+    value, ulp = 0.0, scale
+    for group, mult in (("oku", 1e8), ("man", 1e4), ("rest", scale)):
+        if m.group(group):
+            number, dec = _number(m.group(group))
+            value += number * mult
+            ulp = mult * 10.0**-dec
+    return dim, sign * value, ulp
+
+
+def _amounts(text: str) -> Iterator[tuple[re.Match[str], str, float, float]]:
+    for m in _AMOUNT.finditer(text):
+        if m.group("yen") or m.group("oku") or m.group("man") or m.group("rest"):
+            yield (m, *parse_amount(m))
+
+
+def _prose_label(before: str) -> str:
+    """数値の直前の語句（句読点・区切りより後ろ）を項目名として取り出す。"""
+    text = _MARKUP.sub("", before)
+    text = re.split(r"[。、,;!?「」『』|/]", text)[-1]
+    return _TRAILER.sub("", _LEADER.sub("", text)).strip()[-40:]
+
+
+def _is_label_cell(cell: str) -> bool:
+    plain = _MARKUP.sub("", normalize(cell)).strip()
+    return bool(plain) and not _BARE.fullmatch(plain) and not any(_amounts(plain))
+
+
+def table_facts(
+    path: str, grid: list[list[str]], locate, unit: str | None
+) -> tuple[list[Fact], list[SumCheck]]:
+    """表（先頭がヘッダー行）からファクトを取り出し、合計行・合計列を検算する。
+
+    ``locate(row, col)`` は出典の位置文字列を返す。単位のないセルは列見出しの単位、
+    なければ ``unit``（文書中の宣言）で解釈し、どちらもなければ数値として扱わない。
+    """
+    header = [_MARKUP.sub("", normalize(h)).strip() for h in grid[0]]
+    col_unit = [m.group(1) if (m := _HEADER_UNIT.search(h) or re.fullmatch(r"(人月|人日)", h)) else None for h in header]
+    facts: list[Fact] = []
+    # cells[r][c] = (dim, value, ulp)
+    cells: list[dict[int, tuple[str, float, float]]] = []
+    labels: list[str] = []
+    row_labels: list[list[tuple[int, str]]] = []
+    for row in grid[1:]:
+        found: dict[int, tuple[str, float, float]] = {}
+        for c, raw in enumerate(row):
+            plain = _MARKUP.sub("", normalize(raw)).strip()
+            if not plain:
+                continue
+            parsed = list(_amounts(plain))
+            if len(parsed) == 1:
+                _, dim, value, ulp = parsed[0]
+                found[c] = (dim, value, ulp)
+                continue
+            bare = _BARE.fullmatch(plain)
+            declared = (col_unit[c] if c < len(col_unit) else None) or unit
+            if bare and declared:
+                number, dec = _number(bare.group("num"))
+                dim, scale = UNITS[declared]
+                found[c] = (dim, (-1 if bare.group("neg") else 1) * number * scale, scale * 10.0**-dec)
+        row_labels.append([(c, _MARKUP.sub("", cell).strip()) for c, cell in enumerate(row) if c not in found and _is_label_cell(cell)])
+        labels.append(row_labels[-1][0][1] if row_labels[-1] else "")
+        cells.append(found)
+
+    # 同じ見出しが複数行に現れる列（WBS の「工程」など）は区分であって項目名ではない。
+    # その行は表内で一意な次の見出しセル（作業項目）で引き、なければ内訳としてだけ扱う（照合しない）
+    column_counts: dict[int, Counter[str]] = {}
+    for i, ls in enumerate(row_labels):
+        for c, text in ls:
+            if not _TOTAL.search(labels[i]):
+                column_counts.setdefault(c, Counter())[text] += 1
+    for i, found in enumerate(cells):
+        label, part_only = labels[i], False
+        if label and column_counts.get(row_labels[i][0][0], Counter())[label] > 1:
+            label = next((text for c, text in row_labels[i][1:] if column_counts[c][text] == 1), "")
+            part_only = not label
+        for c, (dim, value, ulp) in found.items():
+            same_dim = [k for k, (d, _, _) in found.items() if d == dim]
+            col = header[c] if c < len(header) else ""
+            name = label if len(same_dim) == 1 and label else f"{label}|{col}" if label else col
+            # 行の合計列（同じ種類の数値のうち最も右の合計・小計列）は行見出しだけでも引けるようにする
+            totals = [k for k in same_dim if k < len(header) and _TOTAL.search(header[k])]
+            key = label_key(label) if label and totals and c == totals[-1] else label_key(name)
+            if part_only:
+                name, key = f"{labels[i]}|{col}", ""
+            facts.append(Fact(path, locate(i + 1, c), name, key, dim, value, ulp, grid[i + 1][c].strip()))
+
+    checks: list[SumCheck] = []
+    # 列方向: 合計行 = 直前の合計行以降の内訳行の和（合計行の前に小計行があれば小計の和でもよい）
+    start = 0
+    subtotals: list[int] = []
+    for i, label in enumerate(labels):
+        if not _TOTAL.search(label):
+            continue
+        parts = [j for j in range(start, i) if not _TOTAL.search(labels[j])]
+        for c, (dim, stated, ulp) in cells[i].items():
+            candidates = [parts]
+            if not _SUBTOTAL.search(label) and subtotals:
+                candidates.append(subtotals)
+            best = None
+            for rows in candidates:
+                vals = [cells[j][c] for j in rows if c in cells[j] and cells[j][c][0] == dim]
+                if not vals:
+                    continue
+                check = SumCheck(path, locate(i + 1, c), f"{label}|{header[c] if c < len(header) else ''}", dim, stated, sum(v for _, v, _ in vals), (ulp + sum(u for _, _, u in vals)) / 2 + 1e-6)
+                if best is None or check.ok:
+                    best = check
+                if check.ok:
+                    break
+            if best:
+                checks.append(best)
+        if _SUBTOTAL.search(label):
+            subtotals.append(i)
+        else:
+            subtotals = []
+        start = i + 1
+    # 行方向: 見出しが合計の列 = 同じ行の加算可能な列の和
+    for c, name in enumerate(header):
+        if not _TOTAL.search(name):
+            continue
+        parts_cols = [k for k, h in enumerate(header) if k != c and not _TOTAL.search(h)]
+        if any(_NOT_ADDITIVE.search(header[k]) for k in parts_cols):
+            continue
+        for i, found in enumerate(cells):
+            if c not in found:
+                continue
+            dim, stated, ulp = found[c]
+            vals = [found[k] for k in parts_cols if k in found and found[k][0] == dim]
+            if len(vals) >= 2:
+                checks.append(SumCheck(path, locate(i + 1, c), f"{labels[i]}|{name}", dim, stated, sum(v for _, v, _ in vals), (ulp + sum(u for _, _, u in vals)) / 2 + 1e-6))
+    return facts, checks
+
+
+def extract_markdown(path: str, text: str) -> tuple[list[Fact], list[SumCheck]]:
+    """Markdown の表と本文からファクトを抽出する。"""
+    lines = text.splitlines()
+    facts: list[Fact] = []
+    checks: list[SumCheck] = []
+    unit: str | None = None
+    heading = ""
+    fenced = False
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if _FENCE.match(line):
+            fenced = not fenced
+            i += 1
+            continue
+        if fenced:
+            i += 1
+            continue
+        norm = normalize(line)
+        if (declared := _DECLARED.search(norm)) is not None:
+            unit = declared.group(1)
+        if norm.lstrip().startswith("|") and i + 1 < len(lines) and _TABLE_SEP.fullmatch(lines[i + 1].strip()):
+            end = i + 2
+            while end < len(lines) and lines[end].strip().startswith("|"):
+                end += 1
+            grid = next(iter_markdown_grids("\n".join(lines[i:end])))
+            first = i + 1
+
+            def locate(r: int, c: int, first: int = first) -> str:
+                return f"L{first + r + (1 if r else 0)}"
+
+            f, s = table_facts(path, grid, locate, unit)
+            facts.extend(f)
+            checks.extend(s)
+            i = end
+            continue
+        if line.lstrip().startswith("#"):
+            heading = _MARKUP.sub("", norm.lstrip("#")).strip()
+        for m, dim, value, ulp in _amounts(norm):
+            label = _prose_label(norm[: m.start()]) or heading
+            facts.append(Fact(path, f"L{i + 1}", label, label_key(label), dim, value, ulp, m.group(0).strip()))
+        i += 1
+    return facts, checks
+
+
+def _cell_text(value: object) -> str:
+    """セル値を文字列にする。浮動小数は有効桁を落とさず、指数表記にもしない（``1234567.5`` → ``"1234567.5"``）。"""
+    if not isinstance(value, float):
+        return str(value)
+    text = format(value, ".15g")
+    return format(value, "f").rstrip("0").rstrip(".") if "e" in text else text
+
+
+def extract_xlsx(path: str, file: Path) -> tuple[list[Fact], list[SumCheck]]:
+    """XLSX の各シートを 1 つの表として扱う（最初に文字列セルが 2 つ以上ある行をヘッダーとする）。"""
+    from openpyxl import load_workbook
+    from openpyxl.utils import get_column_letter
+
+    facts: list[Fact] = []
+    checks: list[SumCheck] = []
+    wb = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            rows = [["" if v is None else _cell_text(v) for v in row] for row in ws.iter_rows(values_only=True)]
+            unit = None
+            header_at = None
+            for r, row in enumerate(rows):
+                joined = normalize(" ".join(row))
+                if (declared := _DECLARED.search(joined)) is not None:
+                    unit = declared.group(1)
+                if sum(1 for v in row if _is_label_cell(v)) >= 2:
+                    header_at = r
+                    break
+            if header_at is None:
+                continue
+            grid = rows[header_at:]
+
+            def locate(r: int, c: int, ws=ws, base=header_at) -> str:
+                return f"{ws.title}!{get_column_letter(c + 1)}{base + r + 1}"
+
+            f, s = table_facts(path, grid, locate, unit)
+            facts.extend(f)
+            checks.extend(s)
+    finally:
+        wb.close()
+    return facts, checks
+
+
+def _suffixes(key: str) -> set[str]:
+    """「本提案の初期費用」→ {"本提案の初期費用", "初期費用"}（「の」の後ろだけを切り出す）。"""
+    found = {key}
+    for i, ch in enumerate(key):
+        if ch == "の" and len(key) - i > 2:
+            found.add(key[i + 1 :])
+    return found
+
+
+# ----------------------------------------------------------------------------
+# 索引
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class Finding:
+    """正本との照合・検算で見つかった不整合。"""
+
+    status: str  # STALE / CONFLICT / SUM
+    label: str
+    location: str
+    found: str
+    expected: str
+
+
+def format_value(dim: str, value: float) -> str:
+    if dim == "円":
+        if abs(value) >= 1e4:
+            return f"{value / 1e4:,.2f}".rstrip("0").rstrip(".") + "万円"
+        return f"{value:,.0f}円"
+    return f"{value:,.2f}".rstrip("0").rstrip(".") + dim
+
+
+class FactIndex:
+    """ファクトと検算結果を保持する SQLite インデックス。"""
+
+    def __init__(self, root: Path, db_path: Path | None = None) -> None:
+        self.root = root
+        self.db = sqlite3.connect(db_path or cache_path(root, DB_NAME))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+        self.warnings: list[str] = []
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> FactIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _ensure_schema(self) -> None:
+        (version,) = self.db.execute("PRAGMA user_version").fetchone()
+        if version == SCHEMA_VERSION:
+            return
+        self.db.executescript(
+            """
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS facts;
+            DROP TABLE IF EXISTS labels;
+            DROP TABLE IF EXISTS sums;
+            CREATE TABLE files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT);
+            CREATE TABLE facts (
+                id INTEGER PRIMARY KEY, path TEXT, locator TEXT, label TEXT, key TEXT, dim TEXT,
+                value REAL, ulp REAL, text TEXT
+            );
+            CREATE INDEX facts_key ON facts (key, dim);
+            CREATE INDEX facts_path ON facts (path);
+            CREATE TABLE labels (fact_id INTEGER, suffix TEXT);
+            CREATE INDEX labels_suffix ON labels (suffix);
+            CREATE INDEX labels_fact ON labels (fact_id);
+            CREATE TABLE sums (
+                path TEXT, locator TEXT, label TEXT, dim TEXT, stated REAL, parts REAL, tolerance REAL
+            );
+            CREATE INDEX sums_path ON sums (path);
+            """
+        )
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.commit()
+
+    # -- 同期 -----------------------------------------------------------------
+
+    def scan_corpus(self) -> list[Path]:
+        found: set[Path] = set()
+        for pattern in CORPUS_GLOBS:
+            found.update(p for p in self.root.glob(pattern) if p.is_file() and not p.name.startswith(("~$", ".")))
+        return sorted(found)
+
+    def sync(self, paths: Iterable[Path] | None = None) -> list[str]:
+        """変更のあったファイルだけ再抽出し、変更されたファイルの相対パスを返す。"""
+        current = {p.relative_to(self.root).as_posix(): p for p in (paths or self.scan_corpus())}
+        known = {row[0]: row[1:] for row in self.db.execute("SELECT path, size, mtime_ns, sha256 FROM files")}
+        changed: list[str] = []
+        for rel in known.keys() - current.keys():
+            self._drop(rel)
+            changed.append(rel)
+        for rel, path in current.items():
+            st = path.stat()
+            prev = known.get(rel)
+            if prev and prev[0] == st.st_size and prev[1] == st.st_mtime_ns:
+                continue
+            digest = sha256_file(path)
+            if prev and prev[2] == digest:
+                self.db.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?", (st.st_size, st.st_mtime_ns, rel))
+                continue
+            try:
+                if path.suffix.lower() == ".xlsx":
+                    facts, checks = extract_xlsx(rel, path)
+                else:
+                    facts, checks = extract_markdown(rel, path.read_text(encoding="utf-8", errors="replace"))
+            except ImportError as exc:
+                self.warnings.append(f"{rel}: {exc.name} が未インストールのためスキップ（pip install {exc.name}）")
+                continue
+            self._drop(rel)
+            self._insert(facts, checks)
+            self.db.execute("INSERT INTO files VALUES (?, ?, ?, ?)", (rel, st.st_size, st.st_mtime_ns, digest))
+            changed.append(rel)
+        self.db.commit()
+        return sorted(changed)
+
+    def _drop(self, rel: str) -> None:
+        self.db.execute("DELETE FROM labels WHERE fact_id IN (SELECT id FROM facts WHERE path = ?)", (rel,))
+        for table in ("facts", "sums", "files"):
+            self.db.execute(f"DELETE FROM {table} WHERE path = ?", (rel,))
+
+    def _insert(self, facts: list[Fact], checks: list[SumCheck]) -> None:
+        for f in facts:
+            cur = self.db.execute(
+                "INSERT INTO facts (path, locator, label, key, dim, value, ulp, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (f.path, f.locator, f.label, f.key, f.dim, f.value, f.ulp, f.text),
+            )
+            if f.key:
+                self.db.executemany("INSERT INTO labels VALUES (?, ?)", [(cur.lastrowid, s) for s in _suffixes(f.key)])
+        self.db.executemany(
+            "INSERT INTO sums VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(s.path, s.locator, s.label, s.dim, s.stated, s.parts, s.tolerance) for s in checks],
+        )
+
+    # -- 照会 -----------------------------------------------------------------
+
+    def show(self, label: str, limit: int = 100) -> list[Fact]:
+        """項目名（部分一致）でファクトを検索する。"""
+        rows = self.db.execute(
+            "SELECT path, locator, label, key, dim, value, ulp, text FROM facts WHERE key LIKE ? ORDER BY key, path, id LIMIT ?",
+            (f"%{label_key(label)}%", limit),
+        )
+        return [Fact(*row) for row in rows]
+
+    def findings(self, canonical: Iterable[str]) -> tuple[list[Finding], dict[str, int]]:
+        """正本と食い違う記載・正本内の矛盾・合計の不一致を返す。"""
+        canon = sorted(set(canonical))
+        marks = ",".join("?" * len(canon)) or "''"
+        findings: list[Finding] = []
+
+        # 正本: 同じ項目名に異なる値があれば CONFLICT とし、照合には使わない
+        truth: dict[tuple[str, str], tuple[float, float, str]] = {}
+        conflicts: set[tuple[str, str]] = set()
+        for key, dim, value, ulp, label, path, loc in self.db.execute(
+            f"SELECT key, dim, value, ulp, label, path, locator FROM facts WHERE path IN ({marks}) AND key != '' ORDER BY path, id",
+            canon,
+        ):
+            prev = truth.get((key, dim))
+            if prev is None:
+                truth[(key, dim)] = (value, ulp, f"{path}:{loc}")
+            elif abs(prev[0] - value) > (prev[1] + ulp) / 2 and (key, dim) not in conflicts:
+                conflicts.add((key, dim))
+                findings.append(Finding("CONFLICT", label, f"{path}:{loc}", format_value(dim, value), f"{format_value(dim, prev[0])} ({prev[2]})"))
+
+        # 参照: 項目名（「の」以降の部分を含む）が正本と一致する記載を、最も長く一致した正本と比べる
+        best: dict[int, tuple[int, str, str, str, float, float, str, str]] = {}
+        for fid, suffix, dim, value, ulp, label, path, loc in self.db.execute(
+            f"""
+            SELECT f.id, l.suffix, f.dim, f.value, f.ulp, f.label, f.path, f.locator
+            FROM labels l JOIN facts f ON f.id = l.fact_id
+            WHERE f.path NOT IN ({marks})
+              AND EXISTS (SELECT 1 FROM facts c WHERE c.key = l.suffix AND c.dim = f.dim AND c.path IN ({marks}))
+            """,
+            canon + canon,
+        ):
+            if (suffix, dim) in conflicts or (suffix, dim) not in truth:
+                continue
+            if fid not in best or len(suffix) > best[fid][0]:
+                best[fid] = (len(suffix), suffix, dim, label, value, ulp, path, loc)
+        matched = 0
+        for _, suffix, dim, label, value, ulp, path, loc in sorted(best.values(), key=lambda b: (b[6], b[7])):
+            expected, exp_ulp, origin = truth[(suffix, dim)]
+            # 記載側の表記桁（例: 万円単位の丸め）の範囲内なら一致とみなす
+            if abs(expected - value) <= (ulp + exp_ulp) / 2 + 1e-6:
+                matched += 1
+            else:
+                findings.append(Finding("STALE", label, f"{path}:{loc}", format_value(dim, value), f"{format_value(dim, expected)} ({origin})"))
+
+        sums = list(self.db.execute("SELECT path, locator, label, dim, stated, parts, tolerance FROM sums ORDER BY path, rowid"))
+        for path, loc, label, dim, stated, parts, tol in sums:
+            if abs(stated - parts) > tol:
+                findings.append(Finding("SUM", label, f"{path}:{loc}", format_value(dim, stated), f"内訳の和 {format_value(dim, parts)}"))
+        (facts,) = self.db.execute("SELECT COUNT(*) FROM facts").fetchone()
+        stats = {"facts": facts, "canonical_labels": len(truth), "matched": matched, "sum_checks": len(sums)}
+        return findings, stats
+
+
+def format_report(findings: list[Finding], stats: dict[str, int], canonical: list[str]) -> str:
+    lines = [
+        "# 数値整合性チェック（ファクト索引）",
+        "",
+        f"- 正本: {', '.join(f'`{c}`' for c in canonical)}（項目 {stats['canonical_labels']} 件）",
+        f"- 正本と一致した記載: {stats['matched']} 件 / 索引済みファクト {stats['facts']} 件",
+        f"- 合計・小計の検算: {stats['sum_checks']} 件",
+        "",
+    ]
+    if not findings:
+        lines.append("不整合は見つかりませんでした。")
+        return "\n".join(lines)
+    lines += ["| 判定 | 項目 | 箇所 | 記載値 | 期待値 |", "|------|------|------|-------:|--------|"]
+    for f in findings:
+        label = (f.label or "-").replace("|", "\\|")
+        lines.append(f"| {f.status} | {label} | `{f.location}` | {f.found} | {f.expected} |")
+    lines += [
+        "",
+        "- STALE: 正本と値が異なる記載（正本の修正が反映されていない）",
+        "- CONFLICT: 正本の中で同じ項目に異なる値がある",
+        "- SUM: 合計・小計が内訳の和と一致しない",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.fact_index", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--canonical", type=Path, action="append", default=None, help=f"正本（既定: {CANONICAL[0]}、複数指定可）")
+    parser.add_argument("--output", type=Path, default=None, help="Markdown レポートの書き出し先")
+    parser.add_argument("--json", action="store_true", help="結果を JSON で出力する")
+    parser.add_argument("--check", action="store_true", help="不整合があれば終了コード 1")
+    parser.add_argument("--rebuild", action="store_true", help="インデックスを作り直す")
+    sub = parser.add_subparsers(dest="command")
+    p_show = sub.add_parser("show", help="項目名でファクトを検索する")
+    p_show.add_argument("label")
+    p_show.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    canonical = [p.as_posix() for p in (args.canonical or CANONICAL)]
+    if args.rebuild:
+        cache_path(root, DB_NAME).unlink(missing_ok=True)
+    started = time.perf_counter()
+    with FactIndex(root) as index:
+        changed = index.sync()
+        for w in index.warnings:
+            print(f"warning: {w}", file=sys.stderr)
+        if args.command == "show":
+            for f in index.show(args.label, args.limit):
+                print(f"{format_value(f.dim, f.value):>16}  {f.label}  {f.path}:{f.locator}")
+            return 0
+        missing = [c for c in canonical if not (root / c).is_file()]
+        if missing:
+            print(f"warning: 正本が見つかりません: {', '.join(missing)}（合計の検算のみ行います）", file=sys.stderr)
+        findings, stats = index.findings(canonical)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps({"stats": stats, "changed_files": changed, "elapsed_ms": elapsed, "findings": [asdict(f) for f in findings]}, ensure_ascii=False, indent=2))
+    else:
+        report = format_report(findings, stats, canonical)
+        if args.output:
+            atomic_write_text(args.output, report + "\n")
+        else:
+            print(report)
+        print(f"\n{len(changed)} files re-indexed; {len(findings)} findings; {elapsed:,.1f} ms", file=sys.stderr)
+    return 1 if args.check and findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,450 @@
+# ============================================================================
+# ingest.py — input/ の差分・並列取込エンジン
+# ============================================================================
+"""``input/`` に投入された資料を分類・変換し、``source/`` / ``org-data/`` へ配置する。
+
+``data-import`` スキルの決定論的な部分（分類・Markdown 変換・配置）を担う。
+
+- 内容ハッシュのマニフェスト（``tmp/cache/ingest-manifest.json``）を保持し、
+  サイズと mtime が一致するファイルはハッシュ計算すら行わずスキップする
+- PDF / XLSX / PPTX / DOCX はプロセスプールで並列に Markdown へ変換する
+- XLSX は read-only モードで行単位にストリーミングし、シート全体をメモリに載せない
+- ファイルごとのハッシュ・変換時間をレポートする
+
+使い方::
+
+    python -m scripts.ingest              # 差分取込
+    python -m scripts.ingest --dry-run    # 分類結果のみ表示
+    python -m scripts.ingest --force      # マニフェストを無視して全件再変換
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, TextIO
+
+from ._common import atomic_write_text, cache_path, load_json, repo_root, save_json, sha256_file
+
+MANIFEST_NAME = "ingest-manifest.json"
+MANIFEST_VERSION = 1
+
+#: 取込対象外のファイル名
+IGNORED_NAMES = frozenset({".gitkeep", ".DS_Store", "Thumbs.db", "desktop.ini"})
+
+
+@dataclass(frozen=True)
+class Rule:
+    """ファイル名キーワードによる分類ルール。"""
+
+    category: str
+    axis: str  # "source" | "org-data"
+    dest: str  # リポジトリルートからの相対パス
+    keywords: tuple[str, ...]
+
+    def matches(self, name: str) -> bool:
+        return any(re.search(k, name, re.IGNORECASE) for k in self.keywords)
+
+
+# 上から順に評価する。org-data の rate-card / service-catalog / company-profile は
+# 既存 .md への統合が必要なため、変換結果を tmp/import/ に置き data-import スキルがマージする。
+RULES: tuple[Rule, ...] = (
+    Rule("rate-card", "org-data", "tmp/import/org-data/rate-card", ("単価", "原価", r"rate[-_ ]?card")),
+    Rule("service-catalog", "org-data", "tmp/import/org-data/service-catalog", ("サービス", "カタログ", "製品資料", "catalog")),
+    Rule("company-profile", "org-data", "tmp/import/org-data/company-profile", ("会社概要", "導入実績", "company[-_ ]?profile")),
+    Rule("whitepapers", "org-data", "org-data/whitepapers", ("ホワイトペーパー", "技術資料", "white[-_ ]?paper")),
+    Rule("amendments", "source", "source/rfp_reference/amendments", ("正誤", "訂正", "修正版", "amendment", "errata")),
+    Rule("qa", "source", "source/rfp_reference/qa", ("質問", "回答書", "q[&＆]a", r"(?<![a-z])qa(?![a-z])")),
+    Rule("minutes", "source", "source/minutes", ("議事録", "ヒアリング", "minutes")),
+    Rule("specs", "source", "source/rfp_reference/specs", ("設計書", "仕様書", "定義書", "spec")),
+    Rule("estimation", "source", "source/rfp_reference/estimation", ("見積", "estimat")),
+)
+
+#: 該当ルールがない場合の既定の配置先（軸ごと）
+DEFAULT_DEST = {
+    "source": ("rfp_reference", "source/rfp_reference"),
+    "org-data": ("whitepapers", "org-data/whitepapers"),
+}
+
+
+def classify(rel: Path) -> tuple[str, str]:
+    """``input/`` からの相対パスを ``(category, dest_dir)`` に分類する。
+
+    ``input/source/`` / ``input/org-data/`` 配下に置かれたファイルは、その軸のルールだけで判定する。
+    """
+    axis = rel.parts[0] if len(rel.parts) > 1 and rel.parts[0] in DEFAULT_DEST else None
+    for rule in RULES:
+        if (axis is None or rule.axis == axis) and rule.matches(rel.name):
+            return rule.category, rule.dest
+    return DEFAULT_DEST[axis or "source"]
+
+
+# ----------------------------------------------------------------------------
+# Markdown 変換（ワーカープロセス内で実行）
+# ----------------------------------------------------------------------------
+
+
+def _cell(value: object) -> str:
+    if value is None:
+        return ""
+    return str(value).replace("|", "\\|").replace("\r", "").replace("\n", "<br>").strip()
+
+
+def _write_table(out: TextIO, rows: Iterable[Iterable[object]]) -> int:
+    """行イテレータを Markdown 表として逐次書き出し、書き出した行数を返す。"""
+    width = 0
+    count = 0
+    for row in rows:
+        cells = [_cell(v) for v in row]
+        while cells and not cells[-1]:
+            cells.pop()
+        if not cells:
+            continue
+        if count == 0:
+            width = len(cells)
+            out.write("| " + " | ".join(cells) + " |\n")
+            out.write("|" + "---|" * width + "\n")
+        else:
+            cells.extend([""] * (width - len(cells)))
+            out.write("| " + " | ".join(cells) + " |\n")
+        count += 1
+    return count
+
+
+def _convert_xlsx(src: Path, out: TextIO) -> None:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(src, read_only=True, data_only=True)
+    try:
+        out.write(f"# {src.stem}\n")
+        for ws in wb.worksheets:
+            out.write(f"\n## {ws.title}\n\n")
+            if _write_table(out, ws.iter_rows(values_only=True)) == 0:
+                out.write("_(空のシート)_\n")
+    finally:
+        wb.close()
+
+
+def _convert_pdf(src: Path, out: TextIO) -> None:
+    from pypdf import PdfReader
+
+    reader = PdfReader(src)
+    out.write(f"# {src.stem}\n")
+    for i, page in enumerate(reader.pages, 1):
+        out.write(f"\n## p.{i}\n\n")
+        out.write((page.extract_text() or "").strip() + "\n")
+
+
+def _convert_pptx(src: Path, out: TextIO) -> None:
+    from pptx import Presentation
+
+    prs = Presentation(src)
+    out.write(f"# {src.stem}\n")
+    for i, slide in enumerate(prs.slides, 1):
+        out.write(f"\n## Slide {i}\n\n")
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                for para in shape.text_frame.paragraphs:
+                    text = "".join(run.text for run in para.runs).strip()
+                    if text:
+                        out.write("  " * para.level + f"- {text}\n")
+            elif getattr(shape, "has_table", False) and shape.has_table:
+                out.write("\n")
+                _write_table(out, ([c.text for c in r.cells] for r in shape.table.rows))
+                out.write("\n")
+        if slide.has_notes_slide:
+            notes = slide.notes_slide.notes_text_frame.text.strip()
+            if notes:
+                out.write(f"\n> **Notes**: {notes}\n")
+
+
+def _convert_docx(src: Path, out: TextIO) -> None:
+    from docx import Document
+    from docx.oxml.ns import qn
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    doc = Document(src)
+    out.write(f"# {src.stem}\n\n")
+    # doc.paragraphs / doc.tables は種類別の一覧なので、本文要素を文書順に辿って段落と表の前後関係を保つ
+    for child in doc.element.body.iterchildren():
+        if child.tag == qn("w:tbl"):
+            _write_table(out, ([c.text for c in r.cells] for r in Table(child, doc).rows))
+            out.write("\n")
+            continue
+        if child.tag != qn("w:p"):
+            continue
+        para = Paragraph(child, doc)
+        text = para.text.strip()
+        if not text:
+            continue
+        style = para.style.name if para.style is not None else ""
+        if style.startswith("Heading") and style[-1:].isdigit():
+            out.write("#" * min(int(style[-1]) + 1, 6) + f" {text}\n\n")
+        else:
+            out.write(f"{text}\n\n")
+
+
+CONVERTERS: dict[str, tuple[Callable[[Path, TextIO], None], str]] = {
+    ".xlsx": (_convert_xlsx, "openpyxl"),
+    ".xlsm": (_convert_xlsx, "openpyxl"),
+    ".pdf": (_convert_pdf, "pypdf"),
+    ".pptx": (_convert_pptx, "python-pptx"),
+    ".docx": (_convert_docx, "python-docx"),
+}
+
+
+# ----------------------------------------------------------------------------
+# 取込処理
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class IngestTask:
+    """1 ファイル分の取込指示（ワーカーへ pickle で渡す）。"""
+
+    root: str
+    rel: str  # input/ からの相対パス
+    category: str
+    dest: str
+    name: str  # 配置先でのファイル名
+    known_sha256: str | None = None
+    move: bool = False
+
+
+@dataclass
+class IngestResult:
+    """1 ファイル分の取込結果とタイミング。"""
+
+    rel: str
+    category: str
+    status: str  # "converted" | "copied" | "unchanged" | "skipped" | "error"
+    sha256: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+    outputs: list[str] = field(default_factory=list)
+    hash_ms: float = 0.0
+    convert_ms: float = 0.0
+    error: str = ""
+
+
+def _dest_name(root: Path, dest: str, rel: Path, key: str, claimed: dict[str, str]) -> str:
+    """配置先のファイル名を決める。
+
+    他の入力ファイル由来、またはマニフェスト管理外の既存ファイルは上書きせず、
+    入力側のディレクトリ名を付けた別名にする。
+    """
+    def free(name: str) -> bool:
+        for candidate in (name, f"{Path(name).stem}.md"):
+            path = f"{dest}/{candidate}"
+            owner = claimed.get(path)
+            if owner is not None and owner != key:
+                return False
+            if owner is None and (root / path).exists():
+                return False
+        return True
+
+    if free(rel.name):
+        return rel.name
+    tag = re.sub(r"[^\w.-]+", "_", rel.parent.as_posix()).strip("_.") or "input"
+    name = f"{rel.stem}__{tag}{rel.suffix}"
+    n = 2
+    while not free(name):
+        name = f"{rel.stem}__{tag}-{n}{rel.suffix}"
+        n += 1
+    return name
+
+
+def process_file(task: IngestTask) -> IngestResult:
+    """1 ファイルをハッシュ・配置・変換する。プロセスプールのワーカーから呼ばれる。"""
+    root = Path(task.root)
+    src = root / "input" / task.rel
+    stat = src.stat()
+    result = IngestResult(task.rel, task.category, "copied", size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    t0 = time.perf_counter()
+    result.sha256 = sha256_file(src)
+    result.hash_ms = (time.perf_counter() - t0) * 1000
+    if task.known_sha256 == result.sha256:
+        result.status = "unchanged"
+        if task.move:
+            src.unlink()
+        return result
+
+    dest_dir = root / task.dest
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    original = dest_dir / task.name
+    converter = CONVERTERS.get(src.suffix.lower())
+    if converter is not None:
+        func, package = converter
+        md_path = original.with_suffix(".md")
+        part = md_path.with_name(f".{md_path.name}.part")
+        t1 = time.perf_counter()
+        try:
+            with open(part, "w", encoding="utf-8", newline="\n") as out:
+                out.write(f"<!-- source: input/{task.rel} sha256:{result.sha256} -->\n")
+                func(src, out)
+            os.replace(part, md_path)
+        except ImportError:
+            part.unlink(missing_ok=True)
+            result.status = "error"
+            result.error = f"{package} が未インストールのため変換できません（pip install {package}）"
+            return result
+        except Exception as exc:  # 壊れたファイルでも他のファイルの取込は続ける
+            part.unlink(missing_ok=True)
+            result.status = "error"
+            result.error = f"{type(exc).__name__}: {exc}"
+            return result
+        result.convert_ms = (time.perf_counter() - t1) * 1000
+        result.outputs.append(md_path.relative_to(root).as_posix())
+        result.status = "converted"
+
+    # 変換に成功してから原本を配置する（失敗時に配置先へ残骸を残さない）
+    shutil.copy2(src, original)
+    result.outputs.insert(0, original.relative_to(root).as_posix())
+
+    if task.move:
+        src.unlink()
+    return result
+
+
+def scan_inputs(root: Path) -> list[Path]:
+    """``input/`` 配下の取込対象ファイルを ``input/`` からの相対パスで返す。"""
+    base = root / "input"
+    if not base.is_dir():
+        return []
+    found = []
+    for dirpath, dirnames, filenames in os.walk(base):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            if name in IGNORED_NAMES or name.startswith((".", "~$")):
+                continue
+            found.append((Path(dirpath) / name).relative_to(base))
+    return found
+
+
+def run(
+    root: Path,
+    *,
+    jobs: int | None = None,
+    force: bool = False,
+    move: bool = False,
+    dry_run: bool = False,
+) -> list[IngestResult]:
+    """``input/`` を差分取込し、ファイルごとの結果を返す。"""
+    manifest_file = cache_path(root, MANIFEST_NAME, create=not dry_run)
+    manifest = load_json(manifest_file, {})
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION, "files": {}}
+    entries: dict[str, dict] = manifest["files"]
+    claimed = {out: key for key, e in entries.items() for out in e.get("outputs", [])}
+
+    results: list[IngestResult] = []
+    tasks: list[IngestTask] = []
+    for rel in scan_inputs(root):
+        key = rel.as_posix()
+        category, dest = classify(rel)
+        stat = (root / "input" / rel).stat()
+        prev = entries.get(key)
+        outputs_ok = prev is not None and all((root / o).exists() for o in prev.get("outputs", []))
+        if dry_run:
+            results.append(IngestResult(key, category, "skipped", size=stat.st_size, outputs=[dest]))
+            continue
+        if (
+            not force
+            and prev is not None
+            and outputs_ok
+            and prev.get("size") == stat.st_size
+            and prev.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            results.append(IngestResult(key, category, "unchanged", prev["sha256"], stat.st_size, stat.st_mtime_ns, prev["outputs"]))
+            if move:
+                (root / "input" / rel).unlink()
+            continue
+        name = _dest_name(root, dest, rel, key, claimed)
+        claimed[f"{dest}/{name}"] = claimed[f"{dest}/{Path(name).stem}.md"] = key
+        known = None if force or prev is None or not outputs_ok else prev.get("sha256")
+        tasks.append(IngestTask(str(root), key, category, dest, name, known, move))
+
+    if tasks:
+        workers = jobs or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                done = list(pool.map(process_file, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        else:
+            done = [process_file(t) for t in tasks]
+        for res in done:
+            if res.status != "error":
+                # 内容が同じ（mtime だけ変わった）ファイルは配置済みの出力をそのまま返す
+                res.outputs = res.outputs or list(entries.get(res.rel, {}).get("outputs", []))
+                entries[res.rel] = {
+                    "sha256": res.sha256,
+                    "size": res.size,
+                    "mtime_ns": res.mtime_ns,
+                    "category": res.category,
+                    "outputs": res.outputs,
+                }
+        results.extend(done)
+        save_json(manifest_file, manifest)
+
+    results.sort(key=lambda r: r.rel)
+    return results
+
+
+def format_report(results: list[IngestResult]) -> str:
+    """ファイルごとのタイミングを Markdown 表にまとめる。"""
+    lines = [
+        "| File | Category | Status | Size (KB) | Hash (ms) | Convert (ms) |",
+        "|------|----------|--------|----------:|----------:|-------------:|",
+    ]
+    for r in results:
+        status = f"{r.status}: {r.error}" if r.error else r.status
+        lines.append(
+            f"| `{r.rel}` | {r.category} | {status} | {r.size / 1024:,.1f} | {r.hash_ms:,.1f} | {r.convert_ms:,.1f} |"
+        )
+    counts: dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    summary = ", ".join(f"{k}={v}" for k, v in sorted(counts.items())) or "no files"
+    total = sum(r.hash_ms + r.convert_ms for r in results)
+    lines.append("")
+    lines.append(f"{len(results)} files ({summary}); worker time {total:,.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.ingest", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="ワーカープロセス数（既定: CPU 数）")
+    parser.add_argument("--force", action="store_true", help="マニフェストを無視して全件再変換する")
+    parser.add_argument("--move", action="store_true", help="取込後に input/ から元ファイルを削除する")
+    parser.add_argument("--dry-run", action="store_true", help="分類結果のみ表示し、何も書き込まない")
+    parser.add_argument("--json", action="store_true", help="レポートを JSON で出力する")
+    parser.add_argument("--report", type=Path, default=None, help="Markdown レポートの書き出し先")
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    started = time.perf_counter()
+    results = run(root, jobs=args.jobs, force=args.force, move=args.move, dry_run=args.dry_run)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], ensure_ascii=False, indent=2))
+    else:
+        report = format_report(results) + f"; wall time {elapsed:,.1f} ms"
+        print(report)
+        if args.report:
+            atomic_write_text(args.report, report + "\n")
+    return 1 if any(r.status == "error" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,736 @@
+# ============================================================================
+# mockgen.py — テーブル定義からのデモ用モックデータ生成（Phase 6）
+# ============================================================================
+"""RFP 参照資料のテーブル定義から、デモ用のモックデータをシード固定・列指向で生成する。
+
+- ``demo-app-spec.md`` と ``source/rfp_reference/**/*.md`` のテーブル定義表（物理名・型・PK・FK）を読む
+- 列ごとに NumPy でベクトル化したサンプリングを行う。金額は対数正規、区分値・外部キーはべき分布
+  （少数の値に集中する偏り）、日時は業務時間帯に寄せるなど、型と項目名から分布を推定する。
+  定義表の「生成」列（または備考の ``mock:``）で分布を明示できる
+- 主キーは行番号の関数、外部キーは親テーブルの行番号をサンプリングして同じ関数で求めるため、
+  親を生成・保持せずに参照整合性が保たれる。キーは定義の桁数で切り詰めず、件数が桁数に
+  収まらない定義はエラーにする
+- 一定行数のチャンク単位で生成・書き出しするのでメモリ使用量は行数に依存しない。
+  チャンクをまとめたシャード（Parquet / CSV）をプロセスプールで並列に書き出す
+- 乱数はシード・テーブル・列・チャンク番号から導出するため、並列度によらず同じデータになる
+- ``PLATFORM_HOST`` 未設定時にデモアプリが使う小規模なフォールバック（JSON）も同じ分布で生成する
+
+使い方::
+
+    python -m scripts.mockgen --list                                   # 読み取ったテーブル定義を表示
+    python -m scripts.mockgen --rows transactions=30000000 --format parquet -j 8
+    python -m scripts.mockgen --sample-only                            # フォールバック JSON だけ生成
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import importlib.util
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - main() で案内する
+    np = None  # type: ignore[assignment]
+
+from ._common import (
+    atomic_open,
+    atomic_write_text,
+    iter_markdown_grids,
+    load_json,
+    parse_number,
+    repo_root,
+    save_json,
+    sha256_text,
+    split_sections,
+)
+
+SPEC_SOURCES = ("demo-app-spec.md", "source/rfp_reference/**/*.md")
+DATA_DIR = Path("demo-app/data")
+MOCK_DIR = Path("demo-app/src/data/mock")
+MANIFEST = "_manifest.json"
+
+DEFAULT_ROWS = 1_000
+DEFAULT_SAMPLE = 100
+DEFAULT_CHUNK = 500_000
+CHUNKS_PER_SHARD = 4
+#: 日付列の既定範囲（3 会計年度）。実行日に依存させないよう固定値にする
+DEFAULT_DATES = ("2022-04-01", "2025-03-31")
+#: 外部キー・区分値のべき指数（大きいほど上位への集中が強い）
+DEFAULT_SKEW = 0.8
+
+# 定義表の列見出し
+NAME_COLUMNS = ("物理名", "カラム名", "列名", "カラムID", "項目ID", "column", "Column")
+TYPE_COLUMNS = ("データ型", "型", "type", "Type")
+LABEL_COLUMNS = ("論理名", "項目名", "名称")
+LENGTH_COLUMNS = ("桁数", "長さ", "サイズ", "length", "Length")
+PK_COLUMNS = ("PK", "主キー", "キー")
+FK_COLUMNS = ("FK", "外部キー", "参照先", "参照")
+NOTE_COLUMNS = ("備考", "説明", "コード値", "note")
+RULE_COLUMNS = ("生成", "mock")
+
+_ROWS_LINE = re.compile(r"(?:想定)?(?:件数|レコード数|行数)\s*[:：]?\s*(?:約)?\s*([\d,，.０-９]+)\s*(億|千万|百万|万|千)?")
+_ROWS_UNIT = {"億": 10**8, "千万": 10**7, "百万": 10**6, "万": 10**4, "千": 10**3}
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_CODE = re.compile(r"([0-9A-Za-z]+)\s*[:：=]\s*([^,、，/／\s]+)")
+
+SURNAMES = ("佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤", "吉田", "山田", "佐々木", "山口", "松本", "井上", "木村", "林", "斎藤", "清水")
+GIVEN_NAMES = ("翔太", "陽菜", "蓮", "結衣", "大翔", "美咲", "健太", "さくら", "拓海", "葵", "直樹", "愛", "悠真", "彩", "誠", "由美", "隆", "恵", "大輔", "真由美")
+#: 人口の多い順（べき分布の重みを順位で与える）
+PREFECTURES = (
+    "東京都", "神奈川県", "大阪府", "愛知県", "埼玉県", "千葉県", "兵庫県", "北海道", "福岡県", "静岡県",
+    "茨城県", "広島県", "京都府", "宮城県", "新潟県", "長野県", "岐阜県", "群馬県", "栃木県", "岡山県",
+    "福島県", "三重県", "熊本県", "鹿児島県", "沖縄県", "滋賀県", "山口県", "愛媛県", "奈良県", "長崎県",
+    "青森県", "岩手県", "石川県", "大分県", "宮崎県", "山形県", "富山県", "秋田県", "香川県", "和歌山県",
+    "佐賀県", "山梨県", "福井県", "徳島県", "高知県", "島根県", "鳥取県",
+)
+#: 時刻の分布（0〜23 時の相対頻度。業務時間帯に集中させる）
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 2, 4, 8, 14, 18, 18, 16, 14, 16, 18, 18, 16, 14, 10, 8, 6, 4, 2, 1)
+
+# 項目名から分布を推定するキーワード（論理名・物理名のいずれかに含まれれば該当）
+KEYWORDS = {
+    "person": ("氏名", "名前", "担当者名", "顧客名", "full_name", "person_name", "customer_name"),
+    "prefecture": ("都道府県", "prefecture", "pref"),
+    "email": ("メール", "mail"),
+    "phone": ("電話", "tel", "phone"),
+    "amount": ("金額", "額", "価格", "単価", "売上", "費用", "残高", "amount", "price", "sales", "cost", "balance"),
+    "quantity": ("数量", "件数", "回数", "個数", "qty", "quantity", "count", "cnt"),
+    "age": ("年齢", "age"),
+    "ratio": ("率", "割合", "rate", "ratio"),
+    "flag": ("フラグ", "有無", "flag", "flg", "is_"),
+}
+
+
+# ----------------------------------------------------------------------------
+# テーブル定義の読み込み
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class Column:
+    name: str
+    label: str
+    kind: str  # int / float / str / date / timestamp / bool
+    length: int | None = None
+    scale: int = 0
+    pk: bool = False
+    ref: str | None = None  # 参照先テーブル名（FK）
+    codes: list[str] = field(default_factory=list)
+    rule: dict[str, list[str]] = field(default_factory=dict)
+
+    def matches(self, key: str) -> bool:
+        text = f"{self.label} {self.name}".lower()
+        return any(w.lower() in text for w in KEYWORDS[key])
+
+
+@dataclass
+class Table:
+    name: str
+    label: str
+    columns: list[Column]
+    rows: int
+    source: str
+
+    @property
+    def key(self) -> Column | None:
+        return next((c for c in self.columns if c.pk), None)
+
+
+def _kind(type_text: str) -> tuple[str, int | None, int]:
+    """``VARCHAR(20)`` / ``DECIMAL(12,2)`` / ``数値`` 等を ``(kind, 桁数, 小数桁)`` に変換する。"""
+    t = type_text.strip().lower()
+    m = re.search(r"\((\d+)\s*(?:,\s*(\d+))?\)", t)
+    length = int(m.group(1)) if m else None
+    scale = int(m.group(2)) if m and m.group(2) else 0
+    if any(w in t for w in ("timestamp", "datetime", "日時")):
+        return "timestamp", None, 0
+    if any(w in t for w in ("date", "日付")):
+        return "date", None, 0
+    if any(w in t for w in ("bool", "bit", "真偽")):
+        return "bool", None, 0
+    if any(w in t for w in ("decimal", "numeric", "number", "float", "double", "real", "数値")):
+        return ("float" if scale or "float" in t or "double" in t or "real" in t else "int"), length, scale
+    if any(w in t for w in ("int", "整数", "serial")):
+        return "int", length, 0
+    return "str", length, 0
+
+
+def _cell(row: dict[str, str], names: tuple[str, ...]) -> str:
+    for key, value in row.items():
+        if any(n == key or n in key for n in names):
+            return value.strip()
+    return ""
+
+
+def _truthy(text: str) -> bool:
+    return text.strip().lower() in {"○", "〇", "◯", "●", "y", "yes", "true", "1", "pk", "fk", "✓", "✔"}
+
+
+def _parse_rule(text: str) -> dict[str, list[str]]:
+    """``lognormal:8,1; null:0.05`` → ``{"lognormal": ["8", "1"], "null": ["0.05"]}``"""
+    rule: dict[str, list[str]] = {}
+    for part in re.split(r"[;；]", text):
+        name, _, args = part.strip().partition(":")
+        if name:
+            rule[name.strip().lower()] = [a.strip() for a in re.split(r"[,|]", args) if a.strip()] if args else []
+    return rule
+
+
+def _table_name(title: str, meta: list[list[str]]) -> tuple[str, str]:
+    """見出しと表上部のメタ行から ``(物理名, 論理名)`` を決める。"""
+    for cells in meta:
+        for i, cell in enumerate(cells[:-1]):
+            if "テーブル" in cell and ("物理" in cell or "ID" in cell) and _IDENT.fullmatch(cells[i + 1].strip()):
+                return cells[i + 1].strip(), title
+    m = re.search(r"[（(`]\s*([A-Za-z_][A-Za-z0-9_.]*)\s*[)）`]", title) or _IDENT.fullmatch(title.strip())
+    name = m.group(1) if m and m.lastindex else title.strip()
+    label = re.sub(r"[（(`].*?[)）`]", "", title).strip() or name
+    return name.split(".")[-1], label
+
+
+def _rows_hint(text: str) -> int | None:
+    m = _ROWS_LINE.search(text)
+    if not m:
+        return None
+    value = parse_number(m.group(1))
+    return int(value * _ROWS_UNIT.get(m.group(2) or "", 1)) if value else None
+
+
+def parse_specs(text: str, source: str) -> list[Table]:
+    """Markdown 中の見出しごとに、カラム名列と型列を持つ表をテーブル定義として読み取る。
+
+    表の先頭行が見出しでない場合（Excel の表紙行など）は、カラム名・型を含む行を探して見出しとみなす。
+    """
+    tables = []
+    for title, _, body in split_sections(text):
+        for grid in iter_markdown_grids(body):
+            header_at = next(
+                (
+                    i
+                    for i, cells in enumerate(grid)
+                    if any(c.strip() in NAME_COLUMNS or c.strip().lower() == "column" for c in cells)
+                    and any(any(t in c for t in TYPE_COLUMNS) for c in cells)
+                ),
+                None,
+            )
+            if header_at is None:
+                continue
+            header = [c.strip() for c in grid[header_at]]
+            name, label = _table_name(title, grid[:header_at])
+            columns = []
+            for cells in grid[header_at + 1 :]:
+                row = dict(zip(header, cells))
+                col_name = _cell(row, NAME_COLUMNS)
+                if not _IDENT.fullmatch(col_name):
+                    continue
+                kind, length, scale = _kind(_cell(row, TYPE_COLUMNS))
+                if not length:
+                    size = parse_number(_cell(row, LENGTH_COLUMNS))
+                    length = int(size) if size else None
+                note = _cell(row, NOTE_COLUMNS)
+                rule_text = _cell(row, RULE_COLUMNS) or (note.split("mock:", 1)[1] if "mock:" in note else "")
+                fk = _cell(row, FK_COLUMNS)
+                ref = None
+                if fk and not _truthy(fk):
+                    ref = fk.split(".")[0].strip("` ")
+                elif _truthy(fk):  # 「○」だけの場合は備考の「xxx 参照」から参照先を探す
+                    m = re.search(r"([A-Za-z_][A-Za-z0-9_]*)(?:\.[A-Za-z_]\w*)?\s*(?:を)?参照", note)
+                    ref = m.group(1) if m else None
+                codes = [c for c, _ in _CODE.findall(note)] if len(_CODE.findall(note)) >= 2 else []
+                columns.append(
+                    Column(
+                        name=col_name,
+                        label=_cell(row, LABEL_COLUMNS) or col_name,
+                        kind=kind,
+                        length=length,
+                        scale=scale,
+                        pk=_truthy(_cell(row, PK_COLUMNS)),
+                        ref=ref,
+                        codes=codes,
+                        rule=_parse_rule(rule_text),
+                    )
+                )
+            if columns:
+                tables.append(Table(name, label, columns, _rows_hint(body) or DEFAULT_ROWS, source))
+    return tables
+
+
+def load_specs(root: Path, paths: list[Path] | None = None) -> tuple[dict[str, Table], list[str]]:
+    """テーブル定義を読み込み、``(テーブル名 → 定義, 警告)`` を返す。先に見つかった定義を優先する。"""
+    files = [root / p for p in paths] if paths else [f for pattern in SPEC_SOURCES for f in sorted(root.glob(pattern))]
+    tables: dict[str, Table] = {}
+    warnings = []
+    for f in files:
+        if not f.is_file():
+            continue
+        for table in parse_specs(f.read_text(encoding="utf-8"), f.relative_to(root).as_posix()):
+            if table.name in tables:
+                warnings.append(f"{table.name}: {table.source} の定義は {tables[table.name].source} と重複するため無視")
+                continue
+            tables[table.name] = table
+    for table in tables.values():
+        for col in table.columns:
+            if col.ref and (col.ref not in tables or tables[col.ref].key is None):
+                warnings.append(f"{table.name}.{col.name}: 参照先 {col.ref} の主キーが見つからないため通常の列として生成")
+                col.ref = None
+    return tables, warnings
+
+
+# ----------------------------------------------------------------------------
+# 列の生成
+# ----------------------------------------------------------------------------
+
+
+def _rng(seed: int, table: str, column: int, chunk: int) -> "np.random.Generator":
+    """シード・テーブル・列・チャンクごとに独立した乱数列（並列度や列の追加に影響されない）。"""
+    return np.random.default_rng([seed, zlib.crc32(table.encode()), column, chunk])
+
+
+def _prefix(table: Table) -> str:
+    letters = re.sub(r"[^A-Za-z]", "", table.name).upper()
+    return (letters or "K")[:3]
+
+
+class KeyWidthError(ValueError):
+    """主キーの定義桁数に件数分のキーが収まらない。"""
+
+
+def key_format(table: Table) -> tuple[str, int]:
+    """文字列の主キーの ``(接頭辞, 数字部の桁数)`` を返す。
+
+    定義の桁数があれば全体をその桁数にそろえ（件数の桁が足りなければ接頭辞を削る）、
+    なければ数字部を 8 桁（件数がそれを超える場合は件数の桁数）にする。接頭辞を削っても
+    収まらない場合は ``KeyWidthError`` を送出する。
+    """
+    col = table.key
+    assert col is not None
+    prefix = _prefix(table)
+    digits = len(str(table.rows))
+    if not col.length:
+        return prefix, max(8, digits)
+    if digits > col.length:
+        raise KeyWidthError(
+            f"{table.name}.{col.name}: {table.rows:,} 行分のキーは {col.length} 桁に収まりません"
+            "（定義の桁数か --rows を見直してください）"
+        )
+    prefix = prefix[: col.length - digits]
+    return prefix, col.length - len(prefix)
+
+
+def key_values(table: Table, idx: "np.ndarray") -> "np.ndarray":
+    """行番号（0 始まり）から主キー値を求める。外部キーも同じ関数で親の主キーを得る。"""
+    col = table.key
+    assert col is not None
+    if col.kind in ("int", "float"):
+        return idx.astype(np.int64) + 1
+    prefix, width = key_format(table)
+    return np.char.add(prefix, np.char.zfill((idx + 1).astype(str), width))
+
+
+def check_keys(tables: dict[str, Table]) -> list[str]:
+    """生成前に主キーの桁数を検証し、外部キー列の桁数が参照先のキーより短い箇所を警告として返す。
+
+    主キーが収まらない場合は ``KeyWidthError`` を送出する。外部キー値は参照先の主キーと同じ形式で
+    出力する（切り詰めると存在しない親を指すため）。
+    """
+    widths: dict[str, int] = {}
+    for table in tables.values():
+        col = table.key
+        if col is None:
+            continue
+        if col.kind == "int" and col.length and len(str(table.rows)) > col.length:
+            raise KeyWidthError(f"{table.name}.{col.name}: {table.rows:,} 行分のキーは {col.length} 桁に収まりません")
+        if col.kind == "str":
+            prefix, width = key_format(table)
+            widths[table.name] = len(prefix) + width
+    warnings = []
+    for table in tables.values():
+        for col in table.columns:
+            if col.ref in widths and col.kind == "str" and col.length and col.length < widths[col.ref]:
+                warnings.append(
+                    f"{table.name}.{col.name}: 桁数 {col.length} は参照先 {col.ref} のキー（{widths[col.ref]} 桁）より短いため、"
+                    "参照先のキーをそのまま出力"
+                )
+    return warnings
+
+
+def power_law(rng: "np.random.Generator", n: int, size: int, skew: float) -> "np.ndarray":
+    """0..n-1 の順位をべき分布（順位 k の重み ∝ 1/(k+1)^skew）で引く（逆関数法の連続近似）。"""
+    u = rng.random(size)
+    if skew <= 0:
+        return (u * n).astype(np.int64)
+    if abs(skew - 1.0) < 1e-9:
+        ranks = np.power(n + 1.0, u)
+    else:
+        e = 1.0 - skew
+        ranks = np.power(u * (np.power(n + 1.0, e) - 1.0) + 1.0, 1.0 / e)
+    return np.minimum(ranks.astype(np.int64) - 1, n - 1).clip(0)
+
+
+def _scramble(ranks: "np.ndarray", n: int) -> "np.ndarray":
+    """人気順位を行番号にばらす全単射（人気の親が ID の若い順に並ばないようにする）。"""
+    step = 2654435761 % n or 1
+    while math.gcd(step, n) != 1:
+        step += 1
+    return (ranks * step) % n
+
+
+def _weights(count: int, skew: float = DEFAULT_SKEW) -> "np.ndarray":
+    w = 1.0 / np.power(np.arange(1, count + 1), skew)
+    return w / w.sum()
+
+
+def _date_range(col: Column, dates: tuple[str, str]) -> tuple[int, int]:
+    explicit = col.rule.get("date") or []
+    lo, hi = explicit[:2] if len(explicit) >= 2 else dates
+    return int(np.datetime64(lo, "D").astype(np.int64)), int(np.datetime64(hi, "D").astype(np.int64))
+
+
+def generate_column(
+    table: Table, index: int, start: int, size: int, *, seed: int, chunk: int, tables: dict[str, Table], dates: tuple[str, str]
+) -> tuple["np.ndarray", "np.ndarray | None"]:
+    """``table`` の ``index`` 番目の列について、行 ``start`` からの ``size`` 行分の値と NULL マスクを返す。"""
+    col = table.columns[index]
+    rng = _rng(seed, table.name, index, chunk)
+    rule = col.rule
+    rows = np.arange(start, start + size, dtype=np.int64)
+
+    def arg(name: str, i: int, default: float) -> float:
+        values = rule.get(name, [])
+        return float(values[i]) if len(values) > i else default
+
+    if col.pk and col is table.key:
+        values = key_values(table, rows)
+    elif col.ref:
+        parent = tables[col.ref]
+        if "uniform" in rule:
+            ranks = rng.integers(0, parent.rows, size)
+        else:
+            ranks = _scramble(power_law(rng, parent.rows, size, arg("zipf", 0, DEFAULT_SKEW)), parent.rows)
+        values = key_values(parent, ranks)
+    elif "const" in rule:
+        values = np.full(size, rule["const"][0] if rule["const"] else "")
+    elif "seq" in rule:
+        values = rows + int(arg("seq", 0, 1))
+    elif "choice" in rule or col.codes:
+        options = rule.get("choice") or col.codes
+        labels = [o.split("=")[0] for o in options]
+        explicit = [parse_number(o.split("=")[1]) if "=" in o else None for o in options]
+        p = np.asarray([w or 0.0 for w in explicit]) / sum(w or 0.0 for w in explicit) if all(explicit) else _weights(len(options), arg("zipf", 0, DEFAULT_SKEW))
+        values = np.asarray(labels)[rng.choice(len(labels), size=size, p=p)]
+    elif col.kind in ("date", "timestamp"):
+        lo, hi = _date_range(col, dates)
+        days = rng.integers(lo, hi + 1, size)
+        if col.kind == "date":
+            values = days.astype("datetime64[D]")
+        else:
+            hours = rng.choice(24, size=size, p=np.asarray(HOUR_WEIGHTS) / sum(HOUR_WEIGHTS))
+            seconds = days * 86400 + hours * 3600 + rng.integers(0, 3600, size)
+            values = seconds.astype("datetime64[s]")
+    elif col.kind == "bool" or col.matches("flag") or "bool" in rule:
+        flags = rng.random(size) < arg("bool", 0, 0.2)
+        values = flags if col.kind == "bool" else np.where(flags, "1", "0") if col.kind == "str" else flags.astype(np.int64)
+    elif col.kind == "str" and col.matches("person"):
+        values = np.char.add(np.asarray(SURNAMES)[rng.integers(0, len(SURNAMES), size)], np.asarray(GIVEN_NAMES)[rng.integers(0, len(GIVEN_NAMES), size)])
+    elif col.kind == "str" and col.matches("prefecture"):
+        values = np.asarray(PREFECTURES)[rng.choice(len(PREFECTURES), size=size, p=_weights(len(PREFECTURES), 1.0))]
+    elif col.kind == "str" and col.matches("email"):
+        values = np.char.add(np.char.add("user", (rows + 1).astype(str)), "@example.com")
+    elif col.kind == "str" and col.matches("phone"):
+        values = np.char.add("0", rng.integers(10**8, 10**9, size).astype(str))
+    else:
+        values = _numeric_or_text(col, rng, size, arg)
+
+    if col.kind in ("int", "float") and values.dtype.kind == "U":
+        try:  # 区分コード・定数が数値の場合は列の型に合わせる
+            values = values.astype(np.float64)
+        except ValueError:
+            pass
+    if col.kind == "int" and values.dtype.kind == "f":
+        values = np.rint(values).astype(np.int64)
+    elif col.kind == "float" and values.dtype.kind in "fi":
+        values = np.round(values.astype(np.float64), col.scale or 2)
+    elif col.kind == "str" and values.dtype.kind != "U":
+        values = values.astype(str)
+    # 主キー・外部キーは切り詰めると重複・参照切れになるため、桁数の調整は key_format に任せる
+    if col.kind == "str" and col.length and not (col.pk or col.ref) and values.dtype.itemsize // 4 > col.length:
+        values = values.astype(f"<U{col.length}")
+    mask = rng.random(size) < arg("null", 0, 0.0) if "null" in rule and not col.pk else None
+    return values, mask
+
+
+def _numeric_or_text(col: Column, rng: "np.random.Generator", size: int, arg) -> "np.ndarray":
+    """明示ルール → 項目名からの推定 → 型ごとの既定、の順に分布を決める。"""
+    rule = col.rule
+    if "uniform" in rule:
+        return rng.uniform(arg("uniform", 0, 0), arg("uniform", 1, 100), size)
+    if "normal" in rule:
+        return rng.normal(arg("normal", 0, 0), arg("normal", 1, 1), size)
+    if "lognormal" in rule:
+        return rng.lognormal(arg("lognormal", 0, 8), arg("lognormal", 1, 1), size)
+    if "poisson" in rule:
+        return rng.poisson(arg("poisson", 0, 3), size)
+    if "zipf" in rule:
+        return power_law(rng, int(arg("zipf", 1, 1000)), size, arg("zipf", 0, DEFAULT_SKEW)) + 1
+    if col.kind in ("int", "float"):
+        if col.matches("age"):
+            return np.clip(rng.normal(45, 15, size), 18, 90)
+        if col.matches("ratio"):
+            return rng.beta(2, 5, size) * (1 if col.kind == "float" else 100)
+        if col.matches("quantity"):
+            return rng.geometric(0.35, size)
+        if col.matches("amount"):
+            return rng.lognormal(math.log(5_000), 1.0, size)
+        if col.kind == "int":
+            return power_law(rng, 1_000, size, DEFAULT_SKEW) + 1
+        return rng.lognormal(4, 1.0, size)
+    # 文字列: 列名ベースのカテゴリ値（少数のカテゴリに偏る）
+    categories = np.char.add(f"{col.name.upper()}_", np.arange(1, 51).astype(str))
+    return categories[rng.choice(50, size=size, p=_weights(50))]
+
+
+# ----------------------------------------------------------------------------
+# 書き出し
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class Plan:
+    """ワーカーに渡す生成計画（pickle 可能な値だけを持つ）。"""
+
+    tables: dict[str, Table]
+    seed: int
+    dates: tuple[str, str]
+    chunk_rows: int
+
+
+def generate_chunk(plan: Plan, table: Table, start: int, size: int) -> dict[str, tuple["np.ndarray", "np.ndarray | None"]]:
+    chunk = start // plan.chunk_rows
+    return {
+        col.name: generate_column(table, i, start, size, seed=plan.seed, chunk=chunk, tables=plan.tables, dates=plan.dates)
+        for i, col in enumerate(table.columns)
+    }
+
+
+def _arrow_batch(table: Table, data: dict):
+    import pyarrow as pa
+
+    types = {"i": pa.int64(), "f": pa.float64(), "U": pa.string(), "b": pa.bool_()}
+    arrays = []
+    for col in table.columns:
+        values, mask = data[col.name]
+        if values.dtype.kind == "M":
+            typ = pa.date32() if values.dtype == np.dtype("datetime64[D]") else pa.timestamp("s")
+        else:
+            typ = types[values.dtype.kind]
+        arrays.append(pa.array(values, mask=mask, type=typ))
+    return pa.RecordBatch.from_arrays(arrays, names=[c.name for c in table.columns])
+
+
+def _to_python(values: "np.ndarray", mask: "np.ndarray | None") -> list:
+    items = values.astype(str).tolist() if values.dtype.kind == "M" else values.tolist()
+    if mask is not None:
+        items = [None if m else v for v, m in zip(items, mask.tolist())]
+    return items
+
+
+def write_shard(plan: Plan, table_name: str, start: int, stop: int, path: Path, fmt: str) -> tuple[str, int, float]:
+    """``[start, stop)`` 行をチャンクごとに生成し、1 つのシャードファイルに追記する（ワーカーで実行）。"""
+    started = time.perf_counter()
+    table = plan.tables[table_name]
+    with atomic_open(path) as f:
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            writer = None
+            for s in range(start, stop, plan.chunk_rows):
+                batch = _arrow_batch(table, generate_chunk(plan, table, s, min(plan.chunk_rows, stop - s)))
+                writer = writer or pq.ParquetWriter(f, batch.schema, compression="zstd")
+                writer.write_batch(batch)
+            if writer:
+                writer.close()
+        else:
+            text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+            out = csv.writer(text)
+            out.writerow([c.name for c in table.columns])
+            for s in range(start, stop, plan.chunk_rows):
+                data = generate_chunk(plan, table, s, min(plan.chunk_rows, stop - s))
+                out.writerows(zip(*(_to_python(*data[c.name]) for c in table.columns)))
+            text.detach()  # フラッシュしてからファイルの close を atomic_open に任せる
+    return path.name, stop - start, (time.perf_counter() - started) * 1000
+
+
+def table_digest(plan: Plan, table: Table, fmt: str) -> str:
+    """テーブルの出力を決める入力（定義・件数・シード・参照先の件数など）のハッシュ。"""
+    parents = {c.ref: plan.tables[c.ref].rows for c in table.columns if c.ref}
+    return sha256_text(json.dumps(asdict(table), sort_keys=True, ensure_ascii=False), json.dumps(parents, sort_keys=True), str(plan.seed), "|".join(plan.dates), str(plan.chunk_rows), fmt)
+
+
+def generate(root: Path, plan: Plan, *, fmt: str, out_dir: Path, jobs: int, force: bool = False) -> list[dict]:
+    """全テーブルをシャード単位で並列に生成し、マニフェストを更新する。前回と同じ入力のテーブルは省略する。"""
+    target = root / out_dir
+    manifest_path = target / MANIFEST
+    manifest = load_json(manifest_path, {}) if not force else {}
+    recorded = manifest.get("tables", {})
+    shard_rows = plan.chunk_rows * CHUNKS_PER_SHARD
+    ext = "parquet" if fmt == "parquet" else "csv"
+    summary: list[dict] = []
+    tasks = []
+    for table in plan.tables.values():
+        digest = table_digest(plan, table, fmt)
+        prev = recorded.get(table.name, {})
+        shards = [f"{table.name}/part-{i:05d}.{ext}" for i in range(math.ceil(table.rows / shard_rows) or 1)]
+        if prev.get("digest") == digest and all((target / s).is_file() for s in shards):
+            summary.append({"table": table.name, "rows": table.rows, "shards": len(shards), "status": "cached", "ms": 0.0})
+            continue
+        table_dir = target / table.name
+        if table_dir.is_dir():
+            for stale in table_dir.glob("part-*"):
+                stale.unlink()
+        for i, shard in enumerate(shards):
+            tasks.append((table.name, i * shard_rows, min(table.rows, (i + 1) * shard_rows), target / shard))
+        recorded[table.name] = {
+            "digest": digest,
+            "rows": table.rows,
+            "shards": shards,
+            "source": table.source,
+            "columns": [{"name": c.name, "type": c.kind, "pk": c.pk, "ref": c.ref} for c in table.columns],
+        }
+        summary.append({"table": table.name, "rows": table.rows, "shards": len(shards), "status": "written", "ms": 0.0})
+
+    elapsed: dict[str, float] = {}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(write_shard, plan, name, start, stop, path, fmt) for name, start, stop, path in tasks]
+            for (name, *_), future in zip(tasks, futures):
+                _, _, ms = future.result()
+                elapsed[name] = elapsed.get(name, 0.0) + ms
+    for row in summary:
+        row["ms"] = elapsed.get(row["table"], 0.0)
+    for name in set(recorded) - set(plan.tables):
+        del recorded[name]
+    save_json(manifest_path, {"format": fmt, "seed": plan.seed, "tables": recorded})
+    return summary
+
+
+def write_samples(root: Path, plan: Plan, size: int, out_dir: Path = MOCK_DIR) -> list[Path]:
+    """デモアプリのフォールバック用に、各テーブル ``size`` 行の JSON を書き出す。
+
+    件数だけを縮小した計画で生成するため、外部キーはサンプル内の親を参照し、分布は本番量と同じになる。
+    """
+    tables = {name: Table(t.name, t.label, t.columns, min(t.rows, size), t.source) for name, t in plan.tables.items()}
+    small = Plan(tables, plan.seed, plan.dates, plan.chunk_rows)
+    written = []
+    for table in tables.values():
+        data = generate_chunk(small, table, 0, table.rows)
+        columns = [_to_python(*data[c.name]) for c in table.columns]
+        records = [dict(zip((c.name for c in table.columns), values)) for values in zip(*columns)]
+        path = root / out_dir / f"{table.name}.json"
+        atomic_write_text(path, json.dumps(records, ensure_ascii=False, indent=2) + "\n")
+        written.append(path)
+    return written
+
+
+# ----------------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------------
+
+
+def _apply_rows(tables: dict[str, Table], overrides: list[str], scale: float) -> None:
+    for table in tables.values():
+        table.rows = max(1, int(table.rows * scale))
+    for item in overrides:
+        name, sep, value = item.partition("=")
+        count = parse_number(value) if sep else None
+        if name not in tables or count is None:
+            raise SystemExit(f"error: --rows は TABLE=ROWS 形式で、定義済みのテーブルを指定してください: {item}")
+        tables[name].rows = int(count)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.mockgen", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--spec", type=Path, action="append", default=None, help="テーブル定義の Markdown（既定: demo-app-spec.md と source/rfp_reference/）")
+    parser.add_argument("--table", action="append", default=None, help="生成するテーブル（参照先は自動で含める）")
+    parser.add_argument("--rows", action="append", default=[], metavar="TABLE=ROWS", help="テーブルの件数を指定する")
+    parser.add_argument("--scale", type=float, default=1.0, help="定義上の件数に掛ける倍率")
+    parser.add_argument("--seed", type=int, default=42, help="乱数シード")
+    parser.add_argument("--format", choices=("parquet", "csv"), default="parquet", help="シャードの形式")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK, help="1 チャンクの行数（メモリ使用量の上限を決める）")
+    parser.add_argument("--dates", nargs=2, default=DEFAULT_DATES, metavar=("FROM", "TO"), help="日付列の既定範囲")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="ワーカープロセス数")
+    parser.add_argument("--out", type=Path, default=DATA_DIR, help=f"シャードの出力先（既定: {DATA_DIR}）")
+    parser.add_argument("--sample", type=int, default=DEFAULT_SAMPLE, help="フォールバック JSON の 1 テーブルあたり件数（0 で省略）")
+    parser.add_argument("--sample-only", action="store_true", help="フォールバック JSON だけを生成する")
+    parser.add_argument("--force", action="store_true", help="前回と同じ入力のテーブルも生成し直す")
+    parser.add_argument("--list", action="store_true", help="読み取ったテーブル定義を表示して終了する")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("error: numpy が必要です（pip install numpy）", file=sys.stderr)
+        return 2
+    root = repo_root(args.root)
+    tables, warnings = load_specs(root, args.spec)
+    for w in warnings:
+        print(f"warning: {w}", file=sys.stderr)
+    if not tables:
+        print("テーブル定義が見つかりません（物理名・型の列を持つ表が必要です）", file=sys.stderr)
+        return 1
+    if args.table:
+        wanted, queue = set(), list(args.table)
+        while queue:
+            name = queue.pop()
+            if name not in tables:
+                print(f"error: 未定義のテーブル: {name}", file=sys.stderr)
+                return 1
+            if name not in wanted:
+                wanted.add(name)
+                queue.extend(c.ref for c in tables[name].columns if c.ref)
+        tables = {k: v for k, v in tables.items() if k in wanted}
+    _apply_rows(tables, args.rows, args.scale)
+    try:
+        for w in check_keys(tables):
+            print(f"warning: {w}", file=sys.stderr)
+    except KeyWidthError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.list:
+        for t in tables.values():
+            refs = ", ".join(f"{c.name}→{c.ref}" for c in t.columns if c.ref)
+            print(f"{t.name:24} {t.rows:>14,} rows  {len(t.columns):3} cols  {t.source}" + (f"  FK: {refs}" if refs else ""))
+        return 0
+
+    plan = Plan(tables, args.seed, tuple(args.dates), max(1, args.chunk_rows))
+    started = time.perf_counter()
+    if not args.sample_only:
+        if args.format == "parquet":
+            if importlib.util.find_spec("pyarrow") is None:
+                print("error: Parquet の出力には pyarrow が必要です（pip install pyarrow、または --format csv）", file=sys.stderr)
+                return 2
+        summary = generate(root, plan, fmt=args.format, out_dir=args.out, jobs=max(1, args.jobs), force=args.force)
+        print("| テーブル | 行数 | シャード | 状態 | 生成時間 (ms) |\n|---|---:|---:|---|---:|")
+        for row in summary:
+            print(f"| {row['table']} | {row['rows']:,} | {row['shards']} | {row['status']} | {row['ms']:,.0f} |")
+    if args.sample:
+        paths = write_samples(root, plan, args.sample)
+        print(f"\nフォールバック: {len(paths)} テーブル × 最大 {args.sample} 行 → {MOCK_DIR.as_posix()}/")
+    if not os.environ.get("PLATFORM_HOST"):
+        print("PLATFORM_HOST が未設定のため、デモアプリはフォールバックのモックデータで動作します", file=sys.stderr)
+    print(f"{(time.perf_counter() - started) * 1000:,.1f} ms", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
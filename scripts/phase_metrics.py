@@ -0,0 +1,483 @@
+# ============================================================================
+# phase_metrics.py — フェーズ・スキル実行の所要時間と I/O の計測
+# ============================================================================
+"""フェーズ・スキル実行ごとの所要時間、成果物サイズ、ファイル I/O 回数を集計する。
+
+- フェーズの期間は ``phase-state.md`` の Started / Completed と、change-log WAL の
+  PLAN / DONE の追記時刻から求める。PLAN → DONE の組を 1 タスクとし、所要時間と
+  対象ファイルを集計する（``.change-log/`` がなければ ``change-log.md`` の日付だけを使う）
+- 成果物サイズは ``guides/09-resume.md`` Step 2 の確認対象パスと PLAN の対象ファイルから求める
+- ``run`` はコマンドを子プロセスで実行し、経過時間・CPU 時間・read/write のシステムコール回数と
+  バイト数・ピークメモリ、実行中に作成・更新されたファイルを ``tmp/metrics/runs.jsonl`` に追記する
+- ``guides/00-overview.md`` の「フェーズ所要期間サマリー」の目安日数と並べて表示する
+
+使い方::
+
+    python -m scripts.phase_metrics                                  # フェーズ別の集計を表示
+    python -m scripts.phase_metrics --json
+    python -m scripts.phase_metrics run --phase 1 --skill data-import -- python -m scripts.ingest
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+from ._common import atomic_write_text, iter_markdown_tables, repo_root
+from .resume import PHASE_PATHS, PHASE_STATE, parse_phase_state
+from .wal import CHANGE_LOG, WAL_DIR, ChangeLog, parse_markdown
+
+METRICS_LOG = Path("tmp") / "metrics" / "runs.jsonl"
+OVERVIEW = Path("guides/00-overview.md")
+
+#: ``run`` の前後で作成・更新を検出するディレクトリ
+WATCH_DIRS = ("input", "source", "org-data", "output", "demo-app/src", "demo-app/data", "tmp/import")
+
+
+# ----------------------------------------------------------------------------
+# 計測
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class Measurement:
+    """1 回の実行の計測値（子プロセスの分を含む）。"""
+
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    reads: int = 0  # read 系システムコール回数（/proc のない環境ではブロック入力回数）
+    writes: int = 0
+    read_bytes: int = 0  # /proc のない環境では 0
+    write_bytes: int = 0
+    peak_rss_mb: float = 0.0
+
+
+def _io_counters() -> tuple[int, int, int, int]:
+    """``(reads, writes, read_bytes, write_bytes)``。Linux では回収済みの子プロセスの分も含む。"""
+    try:
+        with open("/proc/self/io", "rb") as f:
+            fields = dict(line.split(b":", 1) for line in f.read().splitlines())
+        return int(fields[b"syscr"]), int(fields[b"syscw"]), int(fields[b"rchar"]), int(fields[b"wchar"])
+    except (OSError, KeyError, ValueError):
+        if resource is None:
+            return 0, 0, 0, 0
+        own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+        return own.ru_inblock + children.ru_inblock, own.ru_oublock + children.ru_oublock, 0, 0
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def measure() -> Iterator[Measurement]:
+    """ブロック内の経過時間・CPU 時間・I/O 回数を計測する。
+
+    ``with measure() as m:`` の終了時に ``m`` へ値が入る。ピークメモリはプロセス開始以降の最大値。
+    """
+    m = Measurement()
+    io0, cpu0, t0 = _io_counters(), _cpu_seconds(), time.perf_counter()
+    try:
+        yield m
+    finally:
+        m.wall_ms = (time.perf_counter() - t0) * 1000
+        m.cpu_ms = (_cpu_seconds() - cpu0) * 1000
+        m.reads, m.writes, m.read_bytes, m.write_bytes = (b - a for a, b in zip(io0, _io_counters()))
+        m.peak_rss_mb = _peak_rss_mb()
+
+
+@dataclass
+class FileChanges:
+    """実行前後のファイル一覧の差分。"""
+
+    created: int = 0
+    modified: int = 0
+    deleted: int = 0
+    bytes: int = 0  # 作成・更新されたファイルの合計サイズ
+
+
+def snapshot(root: Path, dirs: tuple[str, ...] = WATCH_DIRS) -> dict[str, tuple[int, int]]:
+    """``dirs`` 配下の全ファイルの ``相対パス → (サイズ, mtime_ns)``。"""
+    files: dict[str, tuple[int, int]] = {}
+    for d in dirs:
+        for base, _, names in os.walk(root / d):
+            for name in names:
+                path = os.path.join(base, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files[os.path.relpath(path, root)] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def diff_snapshots(before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]]) -> FileChanges:
+    changes = FileChanges(deleted=len(before.keys() - after.keys()))
+    for path, stat in after.items():
+        prev = before.get(path)
+        if prev == stat:
+            continue
+        if prev is None:
+            changes.created += 1
+        else:
+            changes.modified += 1
+        changes.bytes += stat[0]
+    return changes
+
+
+@dataclass
+class Run:
+    """``run`` で計測したコマンド 1 回分（``runs.jsonl`` の 1 行）。"""
+
+    started: str
+    phase: str
+    skill: str
+    command: list[str]
+    exit_code: int
+    measurement: Measurement
+    files: FileChanges
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Run:
+        return cls(
+            **{k: v for k, v in data.items() if k not in ("measurement", "files")},
+            measurement=Measurement(**data["measurement"]),
+            files=FileChanges(**data["files"]),
+        )
+
+
+def run_command(root: Path, phase: str, skill: str, command: list[str]) -> Run:
+    """コマンドを ``root`` で実行して計測し、``runs.jsonl`` に追記する。"""
+    started = dt.datetime.now().astimezone().isoformat(timespec="seconds")
+    before = snapshot(root)
+    with measure() as m:
+        code = subprocess.call(command, cwd=root)
+    run = Run(started, phase, skill, command, code, m, diff_snapshots(before, snapshot(root)))
+    log = root / METRICS_LOG
+    log.parent.mkdir(parents=True, exist_ok=True)
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(json.dumps(asdict(run), ensure_ascii=False) + "\n")
+    return run
+
+
+def load_runs(root: Path) -> list[Run]:
+    runs = []
+    path = root / METRICS_LOG
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                runs.append(Run.from_dict(json.loads(line)))
+            except (ValueError, TypeError, KeyError):
+                continue  # 書きかけの行
+    return runs
+
+
+# ----------------------------------------------------------------------------
+# change-log / phase-state からの集計
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class Task:
+    """PLAN とそれを完了させた DONE の組。"""
+
+    phase: str
+    desc: str
+    planned: str  # 追記時刻（なければ日付）
+    done: str | None
+    targets: list[str] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float | None:
+        """PLAN から DONE までの秒数（両方に時刻が記録されている場合のみ）。"""
+        if not self.done or "T" not in self.planned or "T" not in self.done:
+            return None
+        return (dt.datetime.fromisoformat(self.done) - dt.datetime.fromisoformat(self.planned)).total_seconds()
+
+
+def load_tasks(root: Path) -> list[Task]:
+    """WAL（なければ ``change-log.md``）から PLAN → DONE の組を古い順に返す。"""
+    if (root / WAL_DIR).is_dir():
+        with ChangeLog(root, readonly=True) as log:
+            records = [(r.seq, r.kind, r.phase, r.desc, r.ts or r.date, r.targets, r.plan) for r in log.records()]
+    elif (root / CHANGE_LOG).exists():
+        text = (root / CHANGE_LOG).read_text(encoding="utf-8")
+        records = [(i, kind, phase, desc, date, targets, None) for i, (date, kind, phase, desc, targets) in enumerate(parse_markdown(text), 1)]
+    else:
+        return []
+    tasks: dict[int, Task] = {}
+    open_plans: list[int] = []
+    for seq, kind, phase, desc, when, targets, plan in records:
+        if kind == "PLAN":
+            tasks[seq] = Task(phase, desc, when, None, targets)
+            open_plans.append(seq)
+            continue
+        if plan is None:  # change-log.md: 説明が一致する最古の未完了 PLAN
+            plan = next((s for s in open_plans if tasks[s].phase == phase and tasks[s].desc == desc), None)
+        if plan in tasks and plan in open_plans:
+            tasks[plan].done = when
+            open_plans.remove(plan)
+    return list(tasks.values())
+
+
+def target_days(root: Path) -> dict[str, str]:
+    """``guides/00-overview.md`` の「フェーズ所要期間サマリー」から ``フェーズ番号 → 日数`` を返す。"""
+    path = root / OVERVIEW
+    if not path.exists():
+        return {}
+    for rows in iter_markdown_tables(path.read_text(encoding="utf-8")):
+        if rows and {"フェーズ", "日数"} <= rows[0].keys():
+            return {m.group(1): r["日数"] for r in rows if (m := re.match(r"([\d.]+)\.\s", r["フェーズ"]))}
+    return {}
+
+
+def _files(root: Path, patterns: list[str]) -> dict[str, int]:
+    """パターン（末尾 ``/`` はディレクトリ配下すべて）に一致するファイルの ``相対パス → サイズ``。"""
+    found: dict[str, int] = {}
+    for pattern in patterns:
+        # PLAN の対象は自由記述のため、絶対パスやルートの外を指すものは数えない
+        if not pattern.strip("/") or Path(pattern).is_absolute() or ".." in Path(pattern).parts:
+            print(f"warning: リポジトリ外の対象は集計しません: {pattern}", file=sys.stderr)
+            continue
+        paths = (root / pattern.rstrip("/")).rglob("*") if pattern.endswith("/") else root.glob(pattern)
+        for p in paths:
+            if p.is_file():
+                found[p.relative_to(root).as_posix()] = p.stat().st_size
+    return found
+
+
+@dataclass
+class PhaseMetrics:
+    """1 フェーズ分の集計。"""
+
+    number: str
+    name: str
+    status: str
+    started: str | None
+    completed: str | None
+    days: int | None
+    target_days: str
+    tasks: int
+    done: int
+    task_seconds: float  # 時刻の記録がある PLAN → DONE の合計
+    span_seconds: float | None  # 最初の PLAN から最後の DONE まで
+    artifacts: int
+    artifact_bytes: int
+    runs: int
+    run_ms: float
+    reads: int
+    writes: int
+    files_written: int
+
+
+def _calendar_days(started: str | None, completed: str | None) -> int | None:
+    try:
+        start = dt.date.fromisoformat(started or "")
+    except ValueError:
+        return None
+    try:
+        end = dt.date.fromisoformat(completed or "")
+    except ValueError:
+        end = dt.date.today()
+    return (end - start).days + 1
+
+
+def collect(root: Path) -> tuple[list[PhaseMetrics], list[Task], list[Run]]:
+    """フェーズ別の集計、全タスク、全計測実行を返す。"""
+    state_path = root / PHASE_STATE
+    phases = parse_phase_state(state_path.read_text(encoding="utf-8")).phases if state_path.exists() else []
+    rows = [(p.number, p.name, p.status, p.started, p.completed) for p in phases] or [
+        (n, "", "-", None, None) for n in PHASE_PATHS
+    ]
+    tasks = load_tasks(root)
+    runs = load_runs(root)
+    targets = target_days(root)
+
+    metrics = []
+    for number, name, status, started, completed in rows:
+        mine = [t for t in tasks if t.phase == number]
+        # (PLAN 時刻, DONE 時刻, 秒数)。時刻が記録されたタスクだけ
+        timed = [(t.planned, t.done, s) for t in mine if t.done is not None and (s := t.seconds) is not None]
+        span = None
+        if timed:
+            span = (max(dt.datetime.fromisoformat(done) for _, done, _ in timed) - min(dt.datetime.fromisoformat(planned) for planned, _, _ in timed)).total_seconds()
+        files = _files(root, list(PHASE_PATHS.get(number, ())) + [t for task in mine for t in task.targets])
+        phase_runs = [r for r in runs if r.phase == number]
+        metrics.append(
+            PhaseMetrics(
+                number,
+                name,
+                status,
+                started,
+                completed,
+                _calendar_days(started, completed),
+                targets.get(number, "-"),
+                len(mine),
+                sum(t.done is not None for t in mine),
+                sum(s for _, _, s in timed),
+                span,
+                len(files),
+                sum(files.values()),
+                len(phase_runs),
+                sum(r.measurement.wall_ms for r in phase_runs),
+                sum(r.measurement.reads for r in phase_runs),
+                sum(r.measurement.writes for r in phase_runs),
+                sum(r.files.created + r.files.modified for r in phase_runs),
+            )
+        )
+    return metrics, tasks, runs
+
+
+# ----------------------------------------------------------------------------
+# レポート
+# ----------------------------------------------------------------------------
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1:
+        return f"{seconds * 1000:,.0f} ms"
+    if seconds < 60:
+        return f"{seconds:,.1f} s"
+    if seconds < 3600:
+        return f"{seconds / 60:,.1f} min"
+    return f"{seconds / 3600:,.1f} h"
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:,.0f} {unit}" if unit == "B" else f"{size:,.1f} {unit}"
+        size /= 1024
+    return f"{size:,.1f} GB"
+
+
+def format_report(metrics: list[PhaseMetrics], tasks: list[Task], runs: list[Run], top: int = 10) -> str:
+    lines = [
+        "# フェーズ別の所要時間",
+        "",
+        "| Phase | Status | 日数（目安） | PLAN → DONE | 作業時間 | 成果物 | 計測実行 | I/O 読 / 書 |",
+        "|-------|--------|-------------|-------------|----------|--------|----------|-------------|",
+    ]
+    for m in metrics:
+        days = "-" if m.days is None else str(m.days)
+        work = format_duration(m.task_seconds if m.task_seconds else None)
+        if m.span_seconds:
+            work += f"（区間 {format_duration(m.span_seconds)}）"
+        run = f"{m.runs} 回 / {format_duration(m.run_ms / 1000)}" if m.runs else "-"
+        io = f"{m.reads:,} / {m.writes:,}" if m.runs else "-"
+        lines.append(
+            f"| {m.number} {m.name} | {m.status} | {days}（{m.target_days}） | {m.done}/{m.tasks} | {work} | "
+            f"{m.artifacts} files / {format_size(m.artifact_bytes)} | {run} | {io} |"
+        )
+
+    slow = sorted((t for t in tasks if t.seconds is not None), key=lambda t: t.seconds or 0, reverse=True)[:top]
+    if slow:
+        lines += ["", "## 所要時間の長いタスク", "", "| Phase | タスク | 所要時間 | 対象 |", "|-------|--------|----------|------|"]
+        for t in slow:
+            lines.append(f"| {t.phase} | {t.desc} | {format_duration(t.seconds)} | {', '.join(f'`{x}`' for x in t.targets) or '-'} |")
+    pending = [t for t in tasks if t.done is None]
+    if pending:
+        lines += ["", f"未完了の PLAN が {len(pending)} 件あります（作業時間に含まれません）。"]
+
+    if runs:
+        by_skill: dict[tuple[str, str], list[Run]] = {}
+        for r in runs:
+            by_skill.setdefault((r.phase, r.skill or "-"), []).append(r)
+        lines += [
+            "",
+            "## スキル・コマンド別の計測実行",
+            "",
+            "| Phase | スキル | 回数 | 経過時間（中央値） | CPU 時間 | read / write 回数 | 作成・更新ファイル | 書き出し量 | ピークメモリ |",
+            "|-------|--------|------|--------------------|----------|-------------------|--------------------|------------|--------------|",
+        ]
+        for (phase, skill), group in sorted(by_skill.items()):
+            wall = statistics.median(r.measurement.wall_ms for r in group) / 1000
+            cpu = sum(r.measurement.cpu_ms for r in group) / 1000
+            reads = sum(r.measurement.reads for r in group)
+            writes = sum(r.measurement.writes for r in group)
+            files = sum(r.files.created + r.files.modified for r in group)
+            written = sum(r.files.bytes for r in group)
+            peak = max(r.measurement.peak_rss_mb for r in group)
+            failed = sum(r.exit_code != 0 for r in group)
+            count = f"{len(group)}" + (f"（失敗 {failed}）" if failed else "")
+            lines.append(
+                f"| {phase} | {skill} | {count} | {format_duration(wall)} | {format_duration(cpu)} | {reads:,} / {writes:,} | "
+                f"{files:,} | {format_size(written)} | {peak:,.0f} MB |"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.phase_metrics", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--json", action="store_true", help="集計結果を JSON で出力する")
+    parser.add_argument("--output", type=Path, default=None, help="Markdown レポートの書き出し先")
+    parser.add_argument("--top", type=int, default=10, help="所要時間の長いタスクの表示件数")
+    sub = parser.add_subparsers(dest="command")
+    p_run = sub.add_parser("run", help="コマンドを実行して計測を記録する")
+    p_run.add_argument("--phase", required=True)
+    p_run.add_argument("--skill", default="", help="スキル・エージェント名（集計のキー）")
+    p_run.add_argument("cmd", nargs=argparse.REMAINDER, help="-- の後に実行するコマンド")
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    if args.command == "run":
+        cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+        if not cmd:
+            print("error: 実行するコマンドを -- の後に指定してください", file=sys.stderr)
+            return 2
+        run = run_command(root, args.phase, args.skill, cmd)
+        m, f = run.measurement, run.files
+        print(
+            f"Phase {run.phase} {run.skill or ' '.join(cmd)}: exit {run.exit_code}; {m.wall_ms:,.1f} ms "
+            f"(cpu {m.cpu_ms:,.1f} ms); read {m.reads:,} / write {m.writes:,} calls; "
+            f"{f.created} created, {f.modified} modified, {f.deleted} deleted ({format_size(f.bytes)})",
+            file=sys.stderr,
+        )
+        return run.exit_code
+
+    metrics, tasks, runs = collect(root)
+    if args.json:
+        payload = {
+            "phases": [asdict(m) for m in metrics],
+            "tasks": [asdict(t) | {"seconds": t.seconds} for t in tasks],
+            "runs": [asdict(r) for r in runs],
+        }
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+        return 0
+    report = format_report(metrics, tasks, runs, args.top)
+    if args.output:
+        atomic_write_text(args.output, report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
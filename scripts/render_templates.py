@@ -0,0 +1,335 @@
+# ============================================================================
+# render_templates.py — templates/ の __VAR__ プレースホルダー展開エンジン
+# ============================================================================
+"""``templates/`` 配下の ``*.tmpl`` をプロジェクト変数で展開し、所定の配置先に書き出す。
+
+``/setup`` が行うテンプレート展開の決定論的な部分を担う。
+
+- 各テンプレートは一度だけ「リテラルと変数名が交互に並ぶセグメント列」にコンパイルし、
+  ``tmp/cache/templates.pkl`` に pickle でキャッシュする（ソースのサイズ・mtime が変わったら再コンパイル）
+- 展開はセグメント列を 1 回走査するだけの単一パス置換
+- 全テンプレートをスレッドプールで並行に処理する
+- 未解決のプレースホルダーは書き込み前にまとめて検出してエラーにする（fail fast）
+- 出力ごとに「ソースのハッシュ」と「そのテンプレートが使う変数だけのハッシュ」を記録し、
+  どちらかが変わった出力だけを書き直す。展開後に手で編集された出力は上書きしない
+- ``TODAY`` を省略した場合は初回展開日を記録して使い続ける（日付が変わっても再展開しない）
+
+使い方::
+
+    python -m scripts.render_templates --vars project-vars.json
+    python -m scripts.render_templates --vars project-vars.json --set CLIENT_NAME=ABC銀行
+    python -m scripts.render_templates --vars project-vars.json --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import pickle
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ._common import (
+    atomic_write_bytes,
+    atomic_write_text,
+    cache_path,
+    load_json,
+    repo_root,
+    save_json,
+    sha256_text,
+)
+
+COMPILED_NAME = "templates.pkl"
+STATE_NAME = "render-state.json"
+CACHE_VERSION = 1
+
+PLACEHOLDER = re.compile(r"__([A-Z][A-Z0-9_]*?)__")
+
+#: /setup が埋める変数（guides/01-kickoff.md の変数一覧 + セットアップ時に決まる値）。
+#: これらはどのテンプレートでも未解決であってはならない
+SETUP_VARIABLES = frozenset(
+    {
+        "CLIENT_NAME",
+        "PROPOSER_NAME",
+        "PARTNER_NAMES",
+        "PROJECT_DESCRIPTION",
+        "PROPOSED_PRODUCTS",
+        "PLATFORM_NAME",
+        "PLATFORM_TYPE",
+        "CLOUD_PROVIDER",
+        "CLOUD_REGION",
+        "DEADLINE",
+        "PRESENTATION_DATE",
+        "PROJECT_SLUG",
+        "DEMO_CONCEPT",
+        "CURRENT_SYSTEM",
+        "TODAY",
+        "SLIDE_METHOD",
+        "DESIGN_PRESET",
+        "CONTEXT7_API_KEY",
+    }
+)
+
+#: 省略可能な変数の既定値（guides/01-kickoff.md で「必須: No」のもの）
+OPTIONAL_DEFAULTS = {
+    "PARTNER_NAMES": "",
+    "PRESENTATION_DATE": "",
+    "DEMO_CONCEPT": "",
+    "CURRENT_SYSTEM": "",
+    "CONTEXT7_API_KEY": "",
+}
+
+
+@dataclass(frozen=True)
+class Target:
+    """テンプレート 1 件の配置先と検証ポリシー。"""
+
+    source: str  # リポジトリルートからの相対パス
+    output: str
+    #: True なら全プレースホルダーの解決を必須にする。False（フェーズ作業で埋める
+    #: 記入欄を含むドキュメント）は SETUP_VARIABLES だけを必須とし、残りはそのまま残す
+    strict: bool
+
+
+#: 配置先が output/plan/ 以外のテンプレート
+_ROOT_OUTPUTS = {
+    "templates/.mcp.json.tmpl": ".mcp.json",
+    "templates/env-example.tmpl": ".env.example",
+    "templates/docs/DESIGN.md.tmpl": "DESIGN.md",
+    "templates/docs/phase-state.md.tmpl": "phase-state.md",
+    "templates/docs/change-log.md.tmpl": "change-log.md",
+    "templates/docs/client-profile.md.tmpl": "source/client-profile.md",
+}
+
+
+def discover_targets(root: Path) -> list[Target]:
+    """テンプレートを列挙し、配置先を決める。
+
+    - ``templates/docs/**`` → ``output/plan/**``（``_ROOT_OUTPUTS`` に載っているものを除く）
+    - ``.claude/**/*.tmpl`` → 同じ場所の拡張子なしファイル
+    """
+    targets = []
+    for path in sorted(root.glob("templates/**/*.tmpl")) + sorted(root.glob(".claude/**/*.tmpl")):
+        rel = path.relative_to(root).as_posix()
+        if rel in _ROOT_OUTPUTS:
+            targets.append(Target(rel, _ROOT_OUTPUTS[rel], strict=True))
+        elif rel.startswith("templates/docs/"):
+            targets.append(Target(rel, "output/plan/" + rel[len("templates/docs/") : -len(".tmpl")], strict=False))
+        elif rel.startswith(".claude/"):
+            targets.append(Target(rel, rel[: -len(".tmpl")], strict=True))
+    return targets
+
+
+# ----------------------------------------------------------------------------
+# コンパイル
+# ----------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Compiled:
+    """コンパイル済みテンプレート。``segments`` は偶数番目がリテラル、奇数番目が変数名。"""
+
+    digest: str
+    segments: tuple[str, ...]
+
+    @property
+    def variables(self) -> frozenset[str]:
+        return frozenset(self.segments[1::2])
+
+    def render(self, values: dict[str, str]) -> str:
+        parts = list(self.segments)
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            parts[i] = values[name] if name in values else f"__{name}__"
+        return "".join(parts)
+
+
+def compile_template(text: str) -> Compiled:
+    """テンプレート文字列をセグメント列にコンパイルする。"""
+    return Compiled(sha256_text(text), tuple(PLACEHOLDER.split(text)))
+
+
+class TemplateCache:
+    """コンパイル済みテンプレートの pickle キャッシュ。"""
+
+    def __init__(self, root: Path, *, create: bool = True) -> None:
+        self.path = cache_path(root, COMPILED_NAME, create=create)
+        self.entries: dict[str, tuple[tuple[int, int], Compiled]] = {}
+        self.dirty = False
+        try:
+            with open(self.path, "rb") as f:
+                version, entries = pickle.load(f)
+            if version == CACHE_VERSION:
+                self.entries = entries
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+            pass
+
+    def get(self, path: Path, rel: str) -> Compiled:
+        st = path.stat()
+        key = (st.st_size, st.st_mtime_ns)
+        hit = self.entries.get(rel)
+        if hit and hit[0] == key:
+            return hit[1]
+        compiled = compile_template(path.read_text(encoding="utf-8"))
+        self.entries[rel] = (key, compiled)
+        self.dirty = True
+        return compiled
+
+    def save(self) -> None:
+        if self.dirty:
+            atomic_write_bytes(self.path, pickle.dumps((CACHE_VERSION, self.entries), pickle.HIGHEST_PROTOCOL))
+
+
+# ----------------------------------------------------------------------------
+# 展開
+# ----------------------------------------------------------------------------
+
+
+class UnresolvedError(ValueError):
+    """未解決のプレースホルダーがある。"""
+
+    def __init__(self, missing: dict[str, list[str]]) -> None:
+        self.missing = missing
+        detail = "\n".join(f"  {src}: " + ", ".join(f"__{v}__" for v in names) for src, names in missing.items())
+        super().__init__(f"未解決のプレースホルダーがあります:\n{detail}")
+
+
+@dataclass
+class RenderResult:
+    """出力 1 件の処理結果。"""
+
+    output: str
+    status: str  # "written" | "unchanged" | "modified" (手編集のため未更新)
+    variables: list[str] = field(default_factory=list)
+
+
+def normalize_vars(raw: dict[str, object]) -> dict[str, str]:
+    """``__CLIENT_NAME__`` / ``CLIENT_NAME`` のどちらの形式のキーも受け付ける。"""
+    return {str(k).strip("_").upper(): "" if v is None else str(v) for k, v in raw.items()}
+
+
+def with_defaults(root: Path, values: dict[str, str]) -> dict[str, str]:
+    """``TODAY``・``PROJECT_SLUG`` と省略可能な変数の既定値を補う。
+
+    ``TODAY`` は前回の展開で記録した日付を優先し、記録がない初回だけ当日にする。
+    """
+    state = load_json(cache_path(root, STATE_NAME, create=False), {})
+    merged = dict(OPTIONAL_DEFAULTS)
+    merged["TODAY"] = state.get("today") or dt.date.today().isoformat()
+    merged["PROJECT_SLUG"] = root.name
+    merged.update(values)
+    return merged
+
+
+def render_all(
+    root: Path,
+    values: dict[str, str],
+    *,
+    targets: list[Target] | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+    workers: int = 8,
+) -> list[RenderResult]:
+    """全テンプレートを展開する。未解決のプレースホルダーがあれば何も書かずに例外を送出する。"""
+    targets = targets if targets is not None else discover_targets(root)
+    cache = TemplateCache(root, create=not dry_run)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        compiled = list(pool.map(lambda t: cache.get(root / t.source, t.source), targets))
+    if not dry_run:
+        cache.save()
+
+    missing: dict[str, list[str]] = {}
+    for target, tmpl in zip(targets, compiled):
+        required = tmpl.variables if target.strict else tmpl.variables & SETUP_VARIABLES
+        unresolved = sorted(required - values.keys())
+        if unresolved:
+            missing[target.source] = unresolved
+    if missing:
+        raise UnresolvedError(missing)
+
+    state_path = cache_path(root, STATE_NAME, create=not dry_run)
+    state = load_json(state_path, {})
+    if state.get("version") != CACHE_VERSION:
+        state = {"version": CACHE_VERSION, "outputs": {}}
+    outputs: dict[str, dict] = state["outputs"]
+    if "TODAY" in values:
+        state["today"] = values["TODAY"]
+
+    def process(pair: tuple[Target, Compiled]) -> RenderResult:
+        target, tmpl = pair
+        used = sorted(tmpl.variables & values.keys())
+        vars_digest = sha256_text(*(f"{k}={values[k]}" for k in used))
+        out = root / target.output
+        prev = outputs.get(target.output)
+        exists = out.exists()
+        if exists and prev and not force:
+            if sha256_text(out.read_text(encoding="utf-8")) != prev["output"]:
+                return RenderResult(target.output, "modified", used)
+            if prev["source"] == tmpl.digest and prev["vars"] == vars_digest:
+                return RenderResult(target.output, "unchanged", used)
+        elif exists and not prev and not force:
+            # 本ツール以外（/setup の手作業等）で作られた出力は上書きしない
+            return RenderResult(target.output, "modified", used)
+        text = tmpl.render(values)
+        if not dry_run:
+            atomic_write_text(out, text)
+            outputs[target.output] = {"source": tmpl.digest, "vars": vars_digest, "output": sha256_text(text)}
+        return RenderResult(target.output, "written", used)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(process, zip(targets, compiled)))
+    if not dry_run:
+        save_json(state_path, state)
+    return results
+
+
+def load_vars(paths: list[Path], assignments: list[str]) -> dict[str, str]:
+    """``--vars`` の JSON と ``--set KEY=VALUE`` を後勝ちでマージする。"""
+    values: dict[str, str] = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            values.update(normalize_vars(json.load(f)))
+    for item in assignments:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--set は KEY=VALUE 形式で指定してください: {item}")
+        values.update(normalize_vars({key: value}))
+    return values
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.render_templates", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--vars", type=Path, action="append", default=[], help="変数定義の JSON（複数指定可）")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="変数を個別に指定する")
+    parser.add_argument("--force", action="store_true", help="未変更・手編集済みの出力も書き直す")
+    parser.add_argument("--dry-run", action="store_true", help="書き込まずに処理結果だけ表示する")
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    values = with_defaults(root, load_vars(args.vars, args.set))
+    started = time.perf_counter()
+    try:
+        results = render_all(root, values, force=args.force, dry_run=args.dry_run, workers=min(32, (os.cpu_count() or 1) + 4))
+    except UnresolvedError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for r in results:
+        print(f"{r.status:9}  {r.output}")
+    counts = {s: sum(r.status == s for r in results) for s in ("written", "unchanged", "modified")}
+    print(f"\n{len(results)} templates: " + ", ".join(f"{k}={v}" for k, v in counts.items()) + f"; {elapsed:,.1f} ms")
+    if counts["modified"]:
+        print("modified の出力は手編集されているため更新していません（上書きする場合は --force）", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
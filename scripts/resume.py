@@ -0,0 +1,348 @@
+# ============================================================================
+# resume.py — セッション復帰（guides/09-resume.md Step 1〜3）の高速化
+# ============================================================================
+"""``phase-state.md`` を型付きモデルに解析し、成果物の存在を検証して状態サマリーを出力する。
+
+- 成果物の検証は ``guides/09-resume.md`` Step 2 のパス表に従い、スレッドプールで並列に行う
+- glob の結果は走査したディレクトリの mtime、テンプレート残存判定はファイルのサイズと
+  mtime をキーに ``tmp/cache/resume-cache.json`` へキャッシュし、変化がなければ再走査しない
+- 記録上のステータスとディスク上の状態の不一致（ドリフト）を検出する
+- ``.change-log/`` があれば未完了の PLAN も併せて表示する
+
+使い方::
+
+    python -m scripts.resume            # Step 3 の状態サマリーを表示
+    python -m scripts.resume --json     # 解析結果と検証結果を JSON で出力
+    python -m scripts.resume --check    # ドリフトがあれば終了コード 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from ._common import cache_path, iter_markdown_tables, load_json, repo_root, save_json, split_sections
+
+PHASE_STATE = "phase-state.md"
+CACHE_NAME = "resume-cache.json"
+CACHE_VERSION = 1
+
+#: guides/09-resume.md Step 2 の確認対象パス（Phase 2.5 は DESIGN.md）
+PHASE_PATHS: dict[str, tuple[str, ...]] = {
+    "0": (".claude/CLAUDE.md", "source/", "output/plan/"),
+    "1": (
+        ".claude/skills/rfp-auditor/references/docs-catalog.md",
+        ".claude/skills/rfp-auditor/references/rfp-requirements-checklist.md",
+        "output/plan/rfp-analysis.md",
+    ),
+    "2": ("output/plan/proposal-strategy.md", "output/plan/proposal-items-checklist.md"),
+    "2.5": ("DESIGN.md",),
+    "3": ("output/plan/architecture-plan/architecture-policy.md", "output/plan/architecture-plan/*.drawio"),
+    "4": ("output/plan/estimation-policy.md",),
+    "5": ("output/slides/*/slides.md",),
+    "6": ("demo-app/src/app/*/page.tsx", "demo-app-spec.md"),
+    "7": ("output/plan/audit-report.md",),
+}
+
+_PLACEHOLDER = re.compile(rb"__[A-Z][A-Z0-9_]*__")
+_CHECKBOX = re.compile(r"^\s*- \[( |x|X)\]\s+(.*)$")
+_PHASE_HEADING = re.compile(r"^Phase\s+([\d.]+)\s*:")
+
+
+# ----------------------------------------------------------------------------
+# phase-state.md のモデル
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class Deliverable:
+    """Deliverables セクションのチェックボックス 1 行。"""
+
+    text: str
+    checked: bool
+
+
+@dataclass
+class Phase:
+    """Phase Summary の 1 行と、対応するフェーズセクションの内容。"""
+
+    number: str
+    name: str
+    status: str
+    started: str | None
+    completed: str | None
+    deliverables: list[Deliverable] = field(default_factory=list)
+    checkpoint: str = ""
+
+    @property
+    def progress(self) -> tuple[int, int]:
+        return sum(d.checked for d in self.deliverables), len(self.deliverables)
+
+
+@dataclass
+class PhaseState:
+    """``phase-state.md`` 全体。"""
+
+    last_checkpoint: dict[str, str]
+    phases: list[Phase]
+
+    def phase(self, number: str) -> Phase | None:
+        return next((p for p in self.phases if p.number == number), None)
+
+
+def _date(value: str) -> str | None:
+    value = value.strip()
+    return None if value in ("", "-") or value.startswith("_(") else value
+
+
+def parse_phase_state(text: str) -> PhaseState:
+    """``phase-state.md`` を解析する。"""
+    last: dict[str, str] = {}
+    phases: list[Phase] = []
+    for rows in iter_markdown_tables(text):
+        if rows and {"Item", "Value"} <= rows[0].keys() and not last:
+            last = {r["Item"]: r["Value"] for r in rows}
+        elif rows and {"#", "Phase", "Status"} <= rows[0].keys() and not phases:
+            for r in rows:
+                status = r["Status"].strip("` ")
+                phases.append(
+                    Phase(r["#"], r["Phase"], status, _date(r.get("Started", "")), _date(r.get("Completed", "")))
+                )
+
+    by_number = {p.number: p for p in phases}
+    for title, _, body in split_sections(text, max_level=2):
+        m = _PHASE_HEADING.match(title)
+        phase = by_number.get(m.group(1)) if m else None
+        if phase is None:
+            continue
+        current = None
+        notes: list[str] = []
+        for line in body.splitlines():
+            if line.startswith("### "):
+                current = line[4:].strip()
+                continue
+            if current == "Deliverables":
+                cb = _CHECKBOX.match(line)
+                if cb:
+                    phase.deliverables.append(Deliverable(cb.group(2).strip(), cb.group(1) != " "))
+            elif current == "Checkpoint" and line.strip() and not line.strip().startswith("_("):
+                notes.append(line.strip())
+        phase.checkpoint = "\n".join(notes)
+    return PhaseState(last, phases)
+
+
+# ----------------------------------------------------------------------------
+# 成果物の検証
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class PathCheck:
+    """確認対象パス 1 件の検証結果。"""
+
+    pattern: str
+    matches: list[str]
+    template: list[str]  # __VAR__ プレースホルダーが残っているファイル
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.matches) and len(self.template) < len(self.matches)
+
+
+class DeliverableCache:
+    """glob 結果とプレースホルダー判定の stat/mtime キャッシュ。"""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.path = cache_path(root, CACHE_NAME)
+        data = load_json(self.path, {})
+        if data.get("version") != CACHE_VERSION:
+            data = {"version": CACHE_VERSION, "globs": {}, "files": {}}
+        self.data = data
+        self.dirty = False
+
+    def save(self) -> None:
+        if self.dirty:
+            save_json(self.path, self.data)
+
+    def _mtime(self, rel: str) -> int | None:
+        try:
+            return os.stat(self.root / rel).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def expand(self, pattern: str) -> list[str]:
+        """glob を展開する。走査対象ディレクトリの mtime が変わっていなければキャッシュを返す。"""
+        if not glob.has_magic(pattern):
+            return [pattern] if os.path.exists(self.root / pattern) else []
+        entry = self.data["globs"].get(pattern)
+        if entry and all(self._mtime(d) == m for d, m in entry["dirs"].items()):
+            return entry["matches"]
+        matches = sorted(Path(p).relative_to(self.root).as_posix() for p in self.root.glob(pattern))
+        # パターン中のワイルドカードより前のディレクトリと、一致した各ファイルの親ディレクトリを監視する
+        base = pattern.split("*", 1)[0].rsplit("/", 1)[0]
+        dirs = {base} | {Path(m).parent.as_posix() for m in matches}
+        if "/*/" in pattern:
+            head = pattern.split("/*/", 1)[0]
+            dirs |= {Path(p).relative_to(self.root).as_posix() for p in (self.root / head).glob("*") if p.is_dir()}
+        self.data["globs"][pattern] = {"dirs": {d: self._mtime(d) for d in sorted(dirs)}, "matches": matches}
+        self.dirty = True
+        return matches
+
+    def is_template(self, rel: str) -> bool:
+        """ファイルに ``__VAR__`` プレースホルダーが残っているか（サイズ・mtime でキャッシュ）。"""
+        path = self.root / rel
+        if path.is_dir():
+            return False
+        st = path.stat()
+        key = [st.st_size, st.st_mtime_ns]
+        entry = self.data["files"].get(rel)
+        if entry and entry["stat"] == key:
+            return entry["template"]
+        template = path.suffix in (".md", ".tsx") and bool(_PLACEHOLDER.search(path.read_bytes()))
+        self.data["files"][rel] = {"stat": key, "template": template}
+        self.dirty = True
+        return template
+
+    def check(self, pattern: str) -> PathCheck:
+        matches = self.expand(pattern)
+        return PathCheck(pattern, matches, [m for m in matches if self.is_template(m)])
+
+
+def verify(root: Path, cache: DeliverableCache, numbers: list[str], workers: int = 8) -> dict[str, list[PathCheck]]:
+    """フェーズごとの確認対象パスを並列に検証する。"""
+    jobs = [(n, pattern) for n in numbers for pattern in PHASE_PATHS.get(n, ())]
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs) or 1)) as pool:
+        checks = list(pool.map(lambda job: cache.check(job[1]), jobs))
+    results: dict[str, list[PathCheck]] = {n: [] for n in numbers}
+    for (n, _), check in zip(jobs, checks):
+        results[n].append(check)
+    return results
+
+
+def detect_drift(phase: Phase, checks: list[PathCheck]) -> list[str]:
+    """記録上のステータスとディスク上の状態の不一致を説明する文を返す。"""
+    if not checks:
+        return []
+    missing = [c.pattern for c in checks if not c.matches]
+    template = [t for c in checks for t in c.template]
+    present = [c for c in checks if c.ok]
+    drift = []
+    if phase.status == "completed" and missing:
+        drift.append(f"Phase {phase.number} は completed だが成果物がない: " + ", ".join(f"`{m}`" for m in missing))
+    if phase.status == "completed" and template:
+        drift.append(f"Phase {phase.number} は completed だが `__VAR__` プレースホルダーが残っている: " + ", ".join(f"`{t}`" for t in template))
+    if phase.status == "not_started" and len(present) == len(checks):
+        drift.append(f"Phase {phase.number} は not_started だが成果物が揃っている（ステータス更新漏れの可能性）")
+    done, total = phase.progress
+    if phase.status == "completed" and total and done < total:
+        drift.append(f"Phase {phase.number} は completed だが Deliverables のチェックが {done}/{total}")
+    return drift
+
+
+# ----------------------------------------------------------------------------
+# サマリー
+# ----------------------------------------------------------------------------
+
+
+def _open_plans(root: Path) -> list[str]:
+    from .wal import WAL_DIR, ChangeLog
+
+    if not (root / WAL_DIR).is_dir():
+        return []
+    # 復帰時の確認は参照のみ。ロック・change-log.md の取り込み・末尾の切り詰めは行わない
+    with ChangeLog(root, readonly=True) as log:
+        return [f"#{r.seq} Phase {r.phase}: {r.desc}" for r in log.pending()]
+
+
+def summarize(root: Path, state: PhaseState, checks: dict[str, list[PathCheck]]) -> tuple[str, list[str]]:
+    """Step 3 の状態サマリー（Markdown）とドリフト一覧を返す。"""
+    lines = ["## 現在の状態", "", "| Phase | Status | 進捗 | 成果物 |", "|-------|--------|------|--------|"]
+    drift: list[str] = []
+    for phase in state.phases:
+        done, total = phase.progress
+        progress = f"{done}/{total}" if total else "-"
+        phase_checks = checks.get(phase.number, [])
+        on_disk = f"{sum(c.ok for c in phase_checks)}/{len(phase_checks)}" if phase_checks else "-"
+        lines.append(f"| {phase.number} {phase.name} | {phase.status} | {progress} | {on_disk} |")
+        drift.extend(detect_drift(phase, phase_checks))
+
+    last = state.last_checkpoint
+    active = [p for p in state.phases if p.status in ("in_progress", "blocked")]
+    lines += [
+        "",
+        "### 前回のチェックポイント",
+        f"- 最終更新: {last.get('Updated', '-')}",
+        f"- 作業中フェーズ: {last.get('Active Phase(s)', '-')}",
+        f"- 次のアクション: {last.get('Next Action', '-')}",
+    ]
+    blocked = last.get("Blocked By", "")
+    if blocked and not blocked.startswith("_("):
+        lines.append(f"- ブロッカー: {blocked}")
+
+    pending = _open_plans(root)
+    if pending:
+        lines += ["", "### 未完了の変更（change-log）"] + [f"- {p}" for p in pending]
+    if drift:
+        lines += ["", "### 状態の不一致"] + [f"- {d}" for d in drift]
+
+    actions: list[str] = []
+    if pending:
+        actions.append("未完了の変更の対象ファイルを確認し、完了していれば DONE を追記する")
+    if drift:
+        actions.append("状態の不一致を確認し、phase-state.md またはファイルを修正する")
+    for phase in active:
+        note = phase.checkpoint.splitlines()[-1] if phase.checkpoint else ""
+        actions.append(f"Phase {phase.number} {phase.name}（{phase.status}）を再開する" + (f": {note.lstrip('- ')}" if note else ""))
+    if not active:
+        nxt = next((p for p in state.phases if p.status == "not_started"), None)
+        if nxt:
+            actions.append(f"Phase {nxt.number} {nxt.name} を開始する")
+    lines += ["", "### 推奨アクション"] + [f"{i}. {a}" for i, a in enumerate(actions, 1)]
+    return "\n".join(lines), drift
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.resume", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--json", action="store_true", help="解析結果と検証結果を JSON で出力する")
+    parser.add_argument("--check", action="store_true", help="ドリフトがあれば終了コード 1 を返す")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    root = repo_root(args.root)
+    state_path = root / PHASE_STATE
+    if not state_path.exists():
+        print("phase-state.md がありません。/setup 未実行か、guides/09-resume.md「状態の再構築」に従ってください。", file=sys.stderr)
+        return 2
+    state = parse_phase_state(state_path.read_text(encoding="utf-8"))
+    cache = DeliverableCache(root)
+    checks = verify(root, cache, [p.number for p in state.phases])
+    cache.save()
+    report, drift = summarize(root, state, checks)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if args.json:
+        payload = {
+            "state": asdict(state),
+            "checks": {n: [asdict(c) | {"ok": c.ok} for c in cs] for n, cs in checks.items()},
+            "drift": drift,
+            "elapsed_ms": elapsed,
+        }
+        print(json.dumps(payload, ensure_ascii=False, indent=2))
+    else:
+        print(report)
+        print(f"\n({elapsed:,.1f} ms)", file=sys.stderr)
+    return 1 if args.check and drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,651 @@
+# ============================================================================
+# slide_render.py — スライド画像の差分レンダリングと proposal-all.pdf のストリーミング結合
+# ============================================================================
+"""NanoBanana 方式のスライド画像を内容アドレスのキャッシュで差分生成し、PDF に結合する。
+
+``output/slides/vol{N}-{topic}/slides.md`` の各スライド（``##`` 見出し単位）について、
+
+- スライド本文・per-volume ``design.md``（共通部分 + 同番号スライドの指示）・``DESIGN.md`` の
+  デザイントークン（トークン表と Slide-Specific Rules）からレンダリング指示を組み立てる
+- 指示のハッシュをキーにし、前回と同じキーで出力が未変更のスライドはスキップする
+  （スピーカーノートと HTML コメントは画像に影響しないためキーから除く）
+- 生成は上限付きのワーカープールでバックエンドに投げる。バックエンドは差し替え可能で、
+  外部コマンド（``command``）、テスト用のローカルスタブ（``stub``）、``module:factory`` 形式の
+  任意の Python 実装を選べる
+- ``output/proposal-all.pdf`` は PNG の圧縮データ（IDAT）をそのまま 1 ページずつ書き出すため、
+  ピークメモリはデッキの枚数に依存しない。ページ構成が前回と同じなら結合自体を省略する
+
+使い方::
+
+    python -m scripts.slide_render --backend command --command "render-slide {prompt} {output}"
+    python -m scripts.slide_render --dry-run              # 再生成が必要なスライドを表示
+    python -m scripts.slide_render --adopt                # スキルで生成済みの画像を現在の指示で登録
+    python -m scripts.slide_render --pdf-only             # PDF の結合だけ行う
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import os
+import re
+import shlex
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Protocol
+
+from ._common import (
+    atomic_open,
+    atomic_write_bytes,
+    cache_path,
+    iter_markdown_tables,
+    load_json,
+    repo_root,
+    save_json,
+    sha256_file,
+    sha256_text,
+    split_sections,
+)
+
+SLIDES_DIR = Path("output/slides")
+PDF_PATH = Path("output/proposal-all.pdf")
+STATE_NAME = "slide-render.json"
+
+#: PDF のページ幅（pt）。高さは画像の縦横比から決める（16:9 なら 960 x 540）
+PAGE_WIDTH = 960.0
+_COPY_CHUNK = 1 << 20
+
+_NOTES = re.compile(r"^\s*(?:#{3,6}\s*|\*\*|>\s*)?(?:スピーカーノート|Speaker Notes|ノート)", re.IGNORECASE)
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_NUMBER = re.compile(r"\d+")
+
+
+class RenderError(RuntimeError):
+    """バックエンドの生成失敗や PDF 結合の前提不足。"""
+
+
+# ----------------------------------------------------------------------------
+# スライドの抽出と指示の組み立て
+# ----------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class SlideJob:
+    """1 枚のスライドの生成依頼。``key`` は ``prompt`` のハッシュ。"""
+
+    deck: str
+    number: int
+    title: str
+    prompt: str
+    output: Path  # リポジトリルートからの相対パス
+    key: str
+
+
+def _natural_key(text: str) -> list:
+    return [int(p) if p.isdigit() else p for p in re.split(r"(\d+)", text)]
+
+
+def _strip_notes(body: str) -> str:
+    """スピーカーノート以降と HTML コメントを除いた本文を返す。"""
+    lines = _COMMENT.sub("", body).splitlines()
+    for i, line in enumerate(lines):
+        if _NOTES.match(line):
+            lines = lines[:i]
+            break
+    return "\n".join(lines).strip()
+
+
+def _level2(text: str) -> tuple[str, list[tuple[str, str]]]:
+    """``(最初の ## より前の本文, [(## 見出し, 本文), ...])`` に分ける。"""
+    lines = text.splitlines()
+    head: list[str] = []
+    sections: list[tuple[str, str]] = []
+    for title, start, body in split_sections(text, max_level=2):
+        if title and lines[start - 1].lstrip().startswith("## "):
+            sections.append((title, body))
+        elif sections:  # ## の後に現れた # 見出しは直前のスライドに含める
+            prev_title, prev_body = sections[-1]
+            sections[-1] = (prev_title, f"{prev_body}\n# {title}\n{body}")
+        else:
+            head.append(f"# {title}\n{body}" if title else body)
+    return "\n".join(head).strip(), sections
+
+
+def design_tokens(text: str) -> str:
+    """``DESIGN.md`` からスライドに効くトークン（``Token`` 列を持つ表と §7）だけを正規化して返す。
+
+    Change Log やデモアプリ向けの節を編集しても、スライドのキャッシュは無効にならない。
+    """
+    tokens: list[str] = []
+    for rows in iter_markdown_tables(text):
+        if rows and "Token" in rows[0]:
+            tokens.extend(" | ".join(v for v in r.values()) for r in rows)
+    slide_rules = [f"## {t}\n{b.strip()}" for t, _, b in split_sections(text, max_level=2) if "Slide-Specific" in t]
+    return "\n".join(tokens + slide_rules)
+
+
+def token_colors(tokens: str) -> dict[str, str]:
+    """トークン文字列から ``{トークン名: #RRGGBB}`` を取り出す。"""
+    colors = {}
+    for line in tokens.splitlines():
+        m = re.match(r"`?([\w-]+)`?\s*\|\s*`?(#[0-9A-Fa-f]{6})`?", line)
+        if m:
+            colors[m.group(1)] = m.group(2)
+    return colors
+
+
+def build_jobs(root: Path, decks: Iterable[str] = ()) -> list[SlideJob]:
+    """全デッキ（``decks`` 指定時は ``vol2`` / ``vol2-architecture`` のように指定したもの）の生成依頼を作る。"""
+    design_path = root / "DESIGN.md"
+    tokens = design_tokens(design_path.read_text(encoding="utf-8")) if design_path.is_file() else ""
+    filters = tuple(decks)
+    jobs = []
+    deck_dirs = sorted((p.parent for p in (root / SLIDES_DIR).glob("*/slides.md")), key=lambda p: _natural_key(p.name))
+    for deck_dir in deck_dirs:
+        if filters and not any(deck_dir.name == f or deck_dir.name.startswith(f"{f}-") for f in filters):
+            continue
+        _, slides = _level2((deck_dir / "slides.md").read_text(encoding="utf-8"))
+        design_file = deck_dir / "design.md"
+        common, per_slide = _level2(design_file.read_text(encoding="utf-8")) if design_file.is_file() else ("", [])
+        by_number: dict[int, str] = {}
+        for title, body in per_slide:
+            m = _NUMBER.search(title)
+            if m:
+                by_number.setdefault(int(m.group(0)), f"## {title}\n{body.strip()}")
+            else:
+                common = f"{common}\n\n## {title}\n{body.strip()}"
+        for number, (title, body) in enumerate(slides, 1):
+            prompt = "\n\n".join(
+                (
+                    f"# DESIGN.md tokens\n{tokens}",
+                    f"# Volume design\n{common.strip()}",
+                    f"# Slide design\n{by_number.get(number, '')}",
+                    f"# Slide {number}: {title}\n{_strip_notes(body)}",
+                )
+            )
+            output = (deck_dir / f"slide-{number:02d}.png").relative_to(root)
+            jobs.append(SlideJob(deck_dir.name, number, title, prompt, output, sha256_text(prompt)))
+    return jobs
+
+
+# ----------------------------------------------------------------------------
+# バックエンド
+# ----------------------------------------------------------------------------
+
+
+class Backend(Protocol):
+    """スライド 1 枚分の PNG バイト列を返すレンダラー。複数スレッドから同時に呼ばれる。"""
+
+    name: str
+
+    def render(self, job: SlideJob) -> bytes: ...
+
+
+def encode_png(width: int, height: int, rows: Iterable[bytes]) -> bytes:
+    """8bit RGB の行データ列から PNG を組み立てる。"""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    raw = b"".join(b"\0" + row for row in rows)
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+class StubBackend:
+    """外部サービスを使わないテスト用バックエンド。
+
+    ``DESIGN.md`` の色トークンでヘッダー帯・背景・アクセント線だけを描いた決定論的な PNG を返す。
+    表紙（1 枚目）は ``primary-800`` の反転背景にする。
+    """
+
+    name = "stub"
+
+    def __init__(self, width: int = 1280, height: int = 720) -> None:
+        self.width, self.height = width, height
+
+    def render(self, job: SlideJob) -> bytes:
+        colors = token_colors(job.prompt)
+
+        def rgb(token: str, default: str) -> bytes:
+            return bytes.fromhex(colors.get(token, default)[1:]) * self.width
+
+        surface = rgb("primary-800", "#2D3748") if job.number == 1 else rgb("surface-raised", "#FFFFFF")
+        header, accent = rgb("primary-800", "#2D3748"), rgb("accent-500", "#319795")
+        band = self.height * 48 // 720
+        # ページの取り違えが目で分かるよう、スライド番号に比例した長さのアクセント線を引く
+        cut = 3 * min(self.width, job.number * self.width // 40)
+        marker = accent[:cut] + surface[cut:]
+        rows = [header] * band + [marker] * 4 + [surface] * (self.height - band - 4)
+        return encode_png(self.width, self.height, rows)
+
+
+class CommandBackend:
+    """外部コマンドで生成するバックエンド。
+
+    ``command`` の ``{prompt}`` は指示を書いた一時ファイル、``{output}`` は書き出し先の一時 PNG、
+    ``{deck}`` / ``{number}`` はデッキ名とスライド番号に置き換えて実行する。
+    """
+
+    def __init__(self, command: str, timeout: float = 600.0) -> None:
+        if not command:
+            raise RenderError(
+                "command バックエンドには --command（または環境変数 SLIDE_RENDER_COMMAND）が必要です"
+                "（動作確認は --backend stub、スキルで生成済みの画像は --adopt）"
+            )
+        self.command, self.timeout = command, timeout
+        self.name = f"command:{command}"
+
+    def render(self, job: SlideJob) -> bytes:
+        with tempfile.TemporaryDirectory(prefix="slide-render-") as tmp:
+            prompt, output = Path(tmp) / "prompt.md", Path(tmp) / "slide.png"
+            prompt.write_text(job.prompt, encoding="utf-8")
+            argv = [
+                part.format(prompt=prompt, output=output, deck=job.deck, number=job.number)
+                for part in shlex.split(self.command)
+            ]
+            try:
+                subprocess.run(argv, capture_output=True, text=True, timeout=self.timeout, check=True)
+            except subprocess.CalledProcessError as exc:
+                raise RenderError(f"exit {exc.returncode}: {(exc.stderr or '').strip()[-500:]}") from exc
+            except subprocess.TimeoutExpired as exc:
+                raise RenderError(f"{self.timeout:g} 秒以内に終了しませんでした: {self.command}") from exc
+            except OSError as exc:
+                raise RenderError(f"実行できません: {argv[0]}（{exc.strerror}）") from exc
+            if not output.is_file():
+                raise RenderError(f"{{output}} に画像が書き出されていません: {self.command}")
+            return output.read_bytes()
+
+
+BACKENDS: dict[str, Callable[[argparse.Namespace], Backend]] = {
+    "stub": lambda args: StubBackend(),
+    "command": lambda args: CommandBackend(args.command or os.environ.get("SLIDE_RENDER_COMMAND", "")),
+}
+
+
+def load_backend(spec: str, args: argparse.Namespace) -> Backend:
+    """``BACKENDS`` の名前、または ``module:factory``（``factory(args)`` がバックエンドを返す）から生成する。"""
+    if spec in BACKENDS:
+        return BACKENDS[spec](args)
+    module, sep, attr = spec.partition(":")
+    if not sep:
+        raise RenderError(f"不明なバックエンド: {spec}（{' / '.join(BACKENDS)} または module:factory）")
+    return getattr(importlib.import_module(module), attr)(args)
+
+
+# ----------------------------------------------------------------------------
+# 差分レンダリング
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class SlideResult:
+    job: SlideJob
+    status: str  # cached / rendered / stale / adopted / modified / failed
+    elapsed_ms: float = 0.0
+    error: str = ""
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _record(path: Path, key: str, digest: str | None = None) -> dict:
+    size, mtime = _stat_key(path)
+    return {"key": key, "sha256": digest or sha256_file(path), "size": size, "mtime_ns": mtime}
+
+
+def _unchanged(path: Path, entry: dict) -> bool:
+    """前回記録した出力から変わっていないか（サイズと mtime が同じならハッシュを省く）。"""
+    if (entry.get("size"), entry.get("mtime_ns")) == _stat_key(path):
+        return True
+    return sha256_file(path) == entry.get("sha256")
+
+
+def render_slides(
+    root: Path,
+    jobs: list[SlideJob],
+    backend: Backend | None,
+    *,
+    workers: int = 4,
+    force: bool = False,
+    adopt: bool = False,
+    dry_run: bool = False,
+    on_result: Callable[[SlideResult], None] | None = None,
+) -> list[SlideResult]:
+    """キーが変わったスライドだけを ``backend`` で生成する。
+
+    - 前回のキーと一致し出力も未変更なら ``cached``
+    - 出力が本ツールの記録と異なる（手で差し替えた・スキルで生成した）場合は ``modified`` として
+      上書きしない。``adopt=True`` なら現在のキーで登録し、``force=True`` なら再生成する
+    - 生成中のジョブは最大 ``workers * 2`` 件に抑え、完了したものから原子的に書き出す
+    """
+    state_path = cache_path(root, STATE_NAME, create=not dry_run)
+    state = load_json(state_path, {})
+    slides: dict[str, dict] = state.setdefault("slides", {})
+    results: list[SlideResult] = []
+    pending: list[SlideJob] = []
+
+    def emit(result: SlideResult) -> None:
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    for job in jobs:
+        path = root / job.output
+        entry = slides.get(job.output.as_posix())
+        exists = path.is_file()
+        tracked = exists and entry is not None and _unchanged(path, entry)
+        if tracked and entry is not None and entry["key"] == job.key and not force:
+            emit(SlideResult(job, "cached"))
+        elif exists and not tracked and adopt:
+            if not dry_run:
+                slides[job.output.as_posix()] = _record(path, job.key)
+            emit(SlideResult(job, "adopted"))
+        elif exists and not tracked and not force:
+            emit(SlideResult(job, "modified"))
+        elif dry_run or backend is None:
+            emit(SlideResult(job, "stale"))
+        else:
+            pending.append(job)
+
+    def run(job: SlideJob) -> tuple[bytes, float]:
+        started = time.perf_counter()
+        data = backend.render(job)  # type: ignore[union-attr]
+        if not data.startswith(b"\x89PNG\r\n\x1a\n"):
+            raise RenderError("バックエンドの出力が PNG ではありません")
+        return data, (time.perf_counter() - started) * 1000
+
+    try:
+        if pending:
+            queue = iter(pending)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                inflight: dict[Future, SlideJob] = {}
+                while True:
+                    while len(inflight) < workers * 2 and (queued := next(queue, None)) is not None:
+                        inflight[pool.submit(run, queued)] = queued
+                    if not inflight:
+                        break
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = inflight.pop(future)
+                        try:
+                            data, elapsed = future.result()
+                        except Exception as exc:  # noqa: BLE001 - 失敗はスライド単位で報告する
+                            emit(SlideResult(job, "failed", error=f"{type(exc).__name__}: {exc}"))
+                            continue
+                        atomic_write_bytes(root / job.output, data)
+                        entry = _record(root / job.output, job.key, hashlib.sha256(data).hexdigest())
+                        slides[job.output.as_posix()] = {**entry, "backend": backend.name}  # type: ignore[union-attr]
+                        emit(SlideResult(job, "rendered", elapsed))
+    finally:
+        if not dry_run:
+            save_json(state_path, state)
+    return results
+
+
+# ----------------------------------------------------------------------------
+# PDF 結合
+# ----------------------------------------------------------------------------
+
+
+@dataclass
+class PngInfo:
+    width: int
+    height: int
+    bit_depth: int
+    color_type: int
+    interlace: int
+    palette: bytes
+
+
+def _png_chunks(f) -> Iterator[tuple[bytes, int]]:
+    """``(chunk 種別, データ長)`` を順に返す。呼び出し側がデータを読むか読み飛ばす。"""
+    if f.read(8) != b"\x89PNG\r\n\x1a\n":
+        raise RenderError(f"PNG ではありません: {f.name}")
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        length, kind = struct.unpack(">I4s", header)
+        start = f.tell()
+        yield kind, length
+        f.seek(start + length + 4)  # データ + CRC
+        if kind == b"IEND":
+            return
+
+
+def png_info(path: Path) -> PngInfo:
+    with open(path, "rb") as f:
+        info = None
+        for kind, length in _png_chunks(f):
+            if kind == b"IHDR":
+                w, h, depth, ctype, _, _, interlace = struct.unpack(">IIBBBBB", f.read(13))
+                info = PngInfo(w, h, depth, ctype, interlace, b"")
+            elif kind == b"PLTE" and info:
+                info.palette = f.read(length)
+            elif kind == b"IDAT":
+                break
+    if info is None:
+        raise RenderError(f"IHDR がありません: {path}")
+    return info
+
+
+class PdfWriter:
+    """画像ページを 1 枚ずつ追記していくストリーミング PDF ライター。
+
+    オブジェクトは書いた順にファイルへ流し、保持するのは xref 用のオフセットとページ参照だけ。
+    """
+
+    _CATALOG, _PAGES = 1, 2
+
+    def __init__(self, f) -> None:
+        self.f = f
+        self.offsets: dict[int, int] = {}
+        self.pages: list[int] = []
+        self.next_id = 3
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _alloc(self) -> int:
+        self.next_id += 1
+        return self.next_id - 1
+
+    def _begin(self, obj: int) -> None:
+        self.offsets[obj] = self.f.tell()
+        self.f.write(f"{obj} 0 obj\n".encode())
+
+    def _object(self, obj: int, body: str) -> None:
+        self._begin(obj)
+        self.f.write(body.encode("latin-1") + b"\nendobj\n")
+
+    def _stream(self, obj: int, header: str, chunks: Iterable[bytes]) -> None:
+        """長さを後続の間接オブジェクトで与えるストリームを書く（データを溜めずに済む）。"""
+        length_obj = self._alloc()
+        self._begin(obj)
+        self.f.write(f"<< {header} /Length {length_obj} 0 R >>\nstream\n".encode("latin-1"))
+        start = self.f.tell()
+        for chunk in chunks:
+            self.f.write(chunk)
+        length = self.f.tell() - start
+        self.f.write(b"\nendstream\nendobj\n")
+        self._object(length_obj, str(length))
+
+    def add_png(self, path: Path) -> None:
+        info = png_info(path)
+        if info.interlace or info.color_type in (4, 6):
+            header, data = self._decoded_png(path)
+        else:
+            colors = {0: 1, 2: 3, 3: 1}[info.color_type]
+            if info.color_type == 3:
+                space = f"[/Indexed /DeviceRGB {len(info.palette) // 3 - 1} <{info.palette.hex()}>]"
+            else:
+                space = "/DeviceGray" if colors == 1 else "/DeviceRGB"
+            header = (
+                f"/Type /XObject /Subtype /Image /Width {info.width} /Height {info.height} "
+                f"/ColorSpace {space} /BitsPerComponent {info.bit_depth} /Filter /FlateDecode "
+                f"/DecodeParms << /Predictor 15 /Colors {colors} /BitsPerComponent {info.bit_depth} "
+                f"/Columns {info.width} >>"
+            )
+            data = self._idat(path)
+        image = self._alloc()
+        self._stream(image, header, data)
+
+        height = PAGE_WIDTH * info.height / info.width
+        content = self._alloc()
+        self._stream(content, "", [f"q {PAGE_WIDTH:.2f} 0 0 {height:.2f} 0 0 cm /Im0 Do Q".encode()])
+        page = self._alloc()
+        self._object(
+            page,
+            f"<< /Type /Page /Parent {self._PAGES} 0 R /MediaBox [0 0 {PAGE_WIDTH:.2f} {height:.2f}] "
+            f"/Resources << /XObject << /Im0 {image} 0 R >> >> /Contents {content} 0 R >>",
+        )
+        self.pages.append(page)
+
+    @staticmethod
+    def _idat(path: Path) -> Iterator[bytes]:
+        """IDAT チャンクのデータ（連結すると 1 本の zlib ストリーム）を少しずつ読み出す。"""
+        with open(path, "rb") as f:
+            for kind, length in _png_chunks(f):
+                if kind != b"IDAT":
+                    continue
+                remaining = length
+                while remaining:
+                    chunk = f.read(min(remaining, _COPY_CHUNK))
+                    if not chunk:
+                        raise RenderError(f"PNG が途中で切れています: {path}")
+                    remaining -= len(chunk)
+                    yield chunk
+
+    @staticmethod
+    def _decoded_png(path: Path) -> tuple[str, Iterable[bytes]]:
+        """アルファ付き・インターレース PNG は Pillow で白背景に合成して RGB で埋め込む（1 枚分だけ展開）。"""
+        try:
+            from PIL import Image
+        except ImportError as exc:
+            raise RenderError(f"アルファ付き／インターレース PNG の結合には Pillow が必要です（pip install pillow）: {path}") from exc
+        with Image.open(path) as im:
+            rgba = im.convert("RGBA")
+            flat = Image.new("RGB", rgba.size, (255, 255, 255))
+            flat.paste(rgba, mask=rgba.getchannel("A"))
+            header = (
+                f"/Type /XObject /Subtype /Image /Width {flat.width} /Height {flat.height} "
+                "/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode"
+            )
+            return header, [zlib.compress(flat.tobytes(), 6)]
+
+    def close(self) -> None:
+        kids = " ".join(f"{p} 0 R" for p in self.pages)
+        self._object(self._PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>")
+        self._object(self._CATALOG, f"<< /Type /Catalog /Pages {self._PAGES} 0 R >>")
+        xref = self.f.tell()
+        count = self.next_id
+        self.f.write(f"xref\n0 {count}\n0000000000 65535 f \n".encode())
+        for obj in range(1, count):
+            self.f.write(f"{self.offsets[obj]:010d} 00000 n \n".encode())
+        self.f.write(f"trailer\n<< /Size {count} /Root {self._CATALOG} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+
+def assemble_pdf(root: Path, pages: list[Path], output: Path = PDF_PATH, *, force: bool = False) -> bool:
+    """``pages``（ルート相対の PNG）を順に結合して ``output`` に原子的に書き出す。
+
+    ページ構成（パスと各 PNG の内容）が前回と同じで PDF も残っていれば何もせず ``False`` を返す。
+    """
+    missing = [p.as_posix() for p in pages if not (root / p).is_file()]
+    if missing:
+        raise RenderError("画像が未生成のスライドがあります: " + ", ".join(missing))
+    state_path = cache_path(root, STATE_NAME, create=False)  # 書き出すときに save_json が作る
+    state = load_json(state_path, {})
+    slides = state.get("slides", {})
+    parts = []
+    for p in pages:
+        entry = slides.get(p.as_posix())
+        digest = entry["sha256"] if entry and _unchanged(root / p, entry) else sha256_file(root / p)
+        parts.append(f"{p.as_posix()}={digest}")
+    digest = sha256_text(*parts)
+    target = root / output
+    recorded = state.get("pdf", {})
+    if not force and recorded.get("digest") == digest and target.is_file() and _unchanged(target, recorded):
+        return False
+
+    with atomic_open(target) as f:
+        writer = PdfWriter(f)
+        for p in pages:
+            writer.add_png(root / p)
+        writer.close()
+    state["pdf"] = {"digest": digest, **_record(target, digest)}
+    save_json(state_path, state)
+    return True
+
+
+# ----------------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.slide_render", description=__doc__.splitlines()[0])
+    parser.add_argument("decks", nargs="*", help="対象デッキ（例: vol2）。省略時は全デッキ")
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    parser.add_argument("--backend", default="command", help="stub / command / module:factory（既定: command）")
+    parser.add_argument("--command", default=None, help="command バックエンドの実行コマンド（{prompt} {output} {deck} {number}）")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="同時に生成するスライド数")
+    parser.add_argument("--force", action="store_true", help="キャッシュ・手差し替えを無視して再生成する")
+    parser.add_argument("--adopt", action="store_true", help="本ツール以外で生成された画像を現在の指示で登録する")
+    parser.add_argument("--dry-run", action="store_true", help="生成せずに再生成が必要なスライドを表示する")
+    parser.add_argument("--no-pdf", action="store_true", help="PDF を結合しない")
+    parser.add_argument("--pdf-only", action="store_true", help="生成せずに PDF の結合だけ行う")
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    started = time.perf_counter()
+    try:
+        backend = None if args.dry_run or args.pdf_only or args.adopt else load_backend(args.backend, args)
+    except RenderError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    jobs = build_jobs(root, args.decks)
+    if not jobs:
+        print(f"{SLIDES_DIR}/*/slides.md にスライドがありません", file=sys.stderr)
+        return 1
+
+    def show(r: SlideResult) -> None:
+        detail = f"  {r.elapsed_ms:,.0f} ms" if r.status == "rendered" else f"  {r.error}" if r.error else ""
+        print(f"{r.status:8}  {r.job.output.as_posix()}{detail}", flush=True)
+
+    results: list[SlideResult] = []
+    if not args.pdf_only:
+        quiet = lambda r: None if r.status == "cached" else show(r)  # noqa: E731
+        results = render_slides(
+            root, jobs, backend, workers=max(1, args.jobs), force=args.force, adopt=args.adopt,
+            dry_run=args.dry_run, on_result=quiet,
+        )
+        counts = {s: sum(r.status == s for r in results) for s in ("cached", "rendered", "adopted", "stale", "modified", "failed")}
+        print(f"\n{len(results)} slides: " + ", ".join(f"{k}={v}" for k, v in counts.items() if v or k == "cached"))
+        if counts["modified"]:
+            print("modified の画像は本ツール以外で差し替えられています（登録は --adopt、再生成は --force）", file=sys.stderr)
+        if counts["failed"]:
+            return 1
+
+    code = 0
+    if not (args.no_pdf or args.dry_run or args.decks):
+        try:
+            written = assemble_pdf(root, [j.output for j in jobs], force=args.force)
+            print(f"{PDF_PATH.as_posix()}: {'written' if written else 'unchanged'} ({len(jobs)} pages)")
+        except RenderError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            code = 1
+    print(f"{(time.perf_counter() - started) * 1000:,.1f} ms", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,491 @@
+# ============================================================================
+# wal.py — change-log.md のセグメント化 Write-Ahead Log
+# ============================================================================
+"""``change-log.md`` の PLAN / DONE プロトコルを、セグメント化された WAL として実装する。
+
+- レコードは ``.change-log/segment-NNNNNN.log`` に 1 行 1 レコード（CRC32 付き JSON）で
+  追記し、書き込みごとに fsync する。セグメントが一定サイズを超えたらローテーションする
+- 未完了 PLAN のオフセット索引（サイドカー）を含むチェックポイントを定期的に書き出す。
+  復帰時はチェックポイント以降の末尾だけを読むため、ログ全体の長さに依存しない
+- 人が読む ``change-log.md`` にも同じエントリを追記する（``render`` で WAL から再生成も可能）
+- 末尾の書きかけレコード（改行で終わらない最終行）は復帰時に切り詰める。途中のレコードの
+  破損は以降の正常なレコードを失わないよう切り詰めず、エラーにする
+- ``readonly=True`` で開くとロック・取り込み・切り詰めを行わずに状態だけを読む（``resume`` 等の参照用）
+
+使い方::
+
+    python -m scripts.wal plan --phase 3 "論理構成図を作成" output/plan/architecture-plan/logical-architecture.drawio
+    python -m scripts.wal done --phase 3 "論理構成図を作成"   # 説明が一致する最古の PLAN を完了
+    python -m scripts.wal done --id 42
+    python -m scripts.wal open                              # 未完了の PLAN を一覧（復帰時）
+    python -m scripts.wal render                            # change-log.md を WAL から再生成
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import json
+import os
+import re
+import sys
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+from ._common import atomic_write_text, load_json, repo_root
+
+WAL_DIR = ".change-log"
+CHANGE_LOG = "change-log.md"
+CHECKPOINT = "checkpoint.json"
+LOCK = "lock"
+
+#: セグメントのローテーション閾値（バイト）
+SEGMENT_BYTES = 1 << 20
+#: この件数のレコードを追記するごとにチェックポイントを書く
+CHECKPOINT_EVERY = 256
+
+_SEGMENT = re.compile(r"segment-(\d{6})\.log$")
+_ENTRY = re.compile(
+    r"^- `(?P<date>\d{4}-\d{2}-\d{2}|__TODAY__)` \*\*(?P<kind>PLAN|DONE)\*\* "
+    r"Phase (?P<phase>[\w.]+): (?P<desc>.*?)(?: → (?P<targets>.+))?$"
+)
+
+
+@dataclass
+class Record:
+    """WAL の 1 レコード（PLAN または DONE）。"""
+
+    seq: int
+    kind: str  # "PLAN" | "DONE"
+    phase: str
+    desc: str
+    date: str
+    targets: list[str] = field(default_factory=list)
+    plan: int | None = None  # DONE が完了させた PLAN の seq
+    ts: str | None = None  # 追記時刻（ISO 8601、秒精度）。change-log.md からの取り込み分は None
+
+    def to_markdown(self) -> str:
+        """``change-log.md`` の 1 行として整形する。"""
+        line = f"- `{self.date}` **{self.kind}** Phase {self.phase}: {self.desc}"
+        if self.kind == "PLAN" and self.targets:
+            line += " → " + ", ".join(f"`{t}`" for t in self.targets)
+        return line
+
+    def encode(self) -> bytes:
+        payload = json.dumps(asdict(self), ensure_ascii=False, separators=(",", ":"))
+        return f"{zlib.crc32(payload.encode('utf-8')):08x} {payload}\n".encode("utf-8")
+
+    @classmethod
+    def decode(cls, line: bytes) -> Record | None:
+        """1 行を復号する。書きかけ・破損している場合は ``None`` を返す。"""
+        if not line.endswith(b"\n") or len(line) < 10:
+            return None
+        crc, payload = line[:8], line[9:-1]
+        try:
+            if int(crc, 16) != zlib.crc32(payload):
+                return None
+            return cls(**json.loads(payload))
+        except (ValueError, TypeError):
+            return None
+
+
+@dataclass
+class Position:
+    """WAL 上の位置（セグメント番号とバイトオフセット）。"""
+
+    segment: int
+    offset: int
+
+
+class WalError(RuntimeError):
+    """WAL 操作の失敗（対応する PLAN がない等）。"""
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """プロセス間の排他ロック（並行するサブエージェントからの同時追記に備える）。"""
+    with open(path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _fsync_dir(path: Path) -> None:
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class ChangeLog:
+    """セグメント化 WAL。``with ChangeLog(root) as log:`` の間は排他ロックを保持する。
+
+    ``readonly=True`` の場合はロックを取らず、WAL が空でも ``change-log.md`` を取り込まず、
+    書きかけの末尾レコードも切り詰めずに読み飛ばす。追記・チェックポイントは ``WalError`` になる。
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        segment_bytes: int = SEGMENT_BYTES,
+        checkpoint_every: int = CHECKPOINT_EVERY,
+        mirror: bool = True,
+        readonly: bool = False,
+    ) -> None:
+        self.root = root
+        self.dir = root / WAL_DIR
+        self.segment_bytes = segment_bytes
+        self.checkpoint_every = checkpoint_every
+        self.mirror = mirror
+        self.readonly = readonly
+        self.next_seq = 1
+        self.head = Position(1, 0)
+        #: 未完了 PLAN の seq → 位置（サイドカー索引）
+        self.open_plans: dict[int, Position] = {}
+        self._since_checkpoint = 0
+        self._lock: contextlib.ExitStack | None = None
+
+    # -- ライフサイクル -------------------------------------------------------
+
+    def __enter__(self) -> ChangeLog:
+        self._lock = contextlib.ExitStack()
+        if self.readonly:
+            self.recover()
+            return self
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._lock.enter_context(_file_lock(self.dir / LOCK))
+        try:
+            self.recover()
+        except BaseException:
+            self._lock.close()
+            raise
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        assert self._lock is not None
+        self._lock.close()
+        self._lock = None
+
+    def _segment_path(self, n: int) -> Path:
+        return self.dir / f"segment-{n:06d}.log"
+
+    def segments(self) -> list[int]:
+        if not self.dir.is_dir():
+            return []
+        return sorted(int(m.group(1)) for p in self.dir.iterdir() if (m := _SEGMENT.search(p.name)))
+
+    # -- 復帰 -----------------------------------------------------------------
+
+    def recover(self) -> int:
+        """チェックポイントと末尾の再生で状態を復元し、再生したレコード数を返す。"""
+        segments = self.segments()
+        if not segments and not self.readonly:
+            self._bootstrap()
+            segments = self.segments()
+        cp = load_json(self.dir / CHECKPOINT)
+        if cp and cp.get("segment") in segments:
+            self.head = Position(cp["segment"], cp["offset"])
+            self.next_seq = cp["next_seq"]
+            self.open_plans = {int(k): Position(*v) for k, v in cp["open"].items()}
+        else:
+            self.head = Position(segments[0] if segments else 1, 0)
+            self.next_seq = 1
+            self.open_plans = {}
+
+        replayed = 0
+        for n in [s for s in segments if s >= self.head.segment]:
+            start = self.head.offset if n == self.head.segment else 0
+            for pos, rec in self._scan(n, start, tail=n == segments[-1]):
+                self._apply(rec, pos)
+                replayed += 1
+            self.head = Position(n, self._segment_path(n).stat().st_size)
+        self._since_checkpoint = replayed
+        return replayed
+
+    def _scan(self, segment: int, start: int, tail: bool = False) -> Iterator[tuple[Position, Record]]:
+        """セグメントを ``start`` から読み、``(位置, レコード)`` を返す。
+
+        ``tail`` が真（末尾セグメント）で最終行が改行で終わっていなければ、追記中に中断した
+        書きかけレコードとみなして切り詰める（読み取り専用なら読み飛ばす）。それ以外の破損は
+        後続の正常なレコードを失わないよう ``WalError`` にする。
+        """
+        path = self._segment_path(segment)
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                rec = Record.decode(line)
+                if rec is None:
+                    if tail and not line.endswith(b"\n"):
+                        if not self.readonly:
+                            f.close()
+                            os.truncate(path, offset)
+                        return
+                    raise WalError(
+                        f"{path.name}: offset {offset} のレコードが破損しています"
+                        "（後続のレコードを保全するため切り詰めません。該当行を確認してください）"
+                    )
+                yield Position(segment, offset), rec
+                offset += len(line)
+
+    def _apply(self, rec: Record, pos: Position) -> None:
+        if rec.kind == "PLAN":
+            self.open_plans[rec.seq] = pos
+        elif rec.plan is not None:
+            self.open_plans.pop(rec.plan, None)
+        self.next_seq = max(self.next_seq, rec.seq + 1)
+
+    def _bootstrap(self) -> None:
+        """WAL が空の場合、既存の ``change-log.md`` のエントリを取り込む。"""
+        self._segment_path(1).touch()
+        path = self.root / CHANGE_LOG
+        if not path.exists():
+            return
+        mirror, self.mirror = self.mirror, False
+        try:
+            for date, kind, phase, desc, targets in parse_markdown(path.read_text(encoding="utf-8")):
+                if kind == "PLAN":
+                    self._append("PLAN", phase, desc, targets, date=date)
+                else:
+                    match = self._find_open(phase, desc)
+                    self._append("DONE", phase, desc, plan=match, date=date)
+        finally:
+            self.mirror = mirror
+        self.checkpoint()
+
+    # -- 追記 -----------------------------------------------------------------
+
+    def plan(self, phase: str, desc: str, targets: list[str] | None = None) -> Record:
+        """変更の実行前に PLAN を追記する。"""
+        return self._append("PLAN", phase, desc, targets or [])
+
+    def done(self, phase: str | None = None, desc: str | None = None, *, plan: int | None = None) -> Record:
+        """PLAN に対応する DONE を追記する。
+
+        ``plan`` で seq を直接指定するか、``phase`` と ``desc`` が一致する最古の未完了 PLAN を対象にする。
+        """
+        if plan is None:
+            if phase is None or desc is None:
+                raise WalError("plan の seq、または phase と説明を指定してください")
+            plan = self._find_open(phase, desc)
+            if plan is None:
+                raise WalError(f"Phase {phase}: {desc} に対応する未完了の PLAN がありません")
+        elif plan not in self.open_plans:
+            raise WalError(f"PLAN #{plan} は未完了ではありません")
+        rec = self.read(self.open_plans[plan])
+        return self._append("DONE", rec.phase, rec.desc, plan=plan)
+
+    def _find_open(self, phase: str, desc: str) -> int | None:
+        for seq in sorted(self.open_plans):
+            rec = self.read(self.open_plans[seq])
+            if rec.phase == phase and rec.desc == desc:
+                return seq
+        return None
+
+    def _append(
+        self,
+        kind: str,
+        phase: str,
+        desc: str,
+        targets: list[str] | None = None,
+        *,
+        plan: int | None = None,
+        date: str | None = None,
+    ) -> Record:
+        self._check_writable()
+        rec = Record(
+            seq=self.next_seq,
+            kind=kind,
+            phase=phase,
+            desc=desc,
+            date=date or dt.date.today().isoformat(),
+            targets=targets or [],
+            plan=plan,
+            ts=None if date else dt.datetime.now().astimezone().isoformat(timespec="seconds"),
+        )
+        data = rec.encode()
+        if self.head.offset and self.head.offset + len(data) > self.segment_bytes:
+            self._rotate()
+        path = self._segment_path(self.head.segment)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._apply(rec, Position(self.head.segment, self.head.offset))
+        self.head.offset += len(data)
+        if self.mirror:
+            self._mirror(rec)
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+        return rec
+
+    def _rotate(self) -> None:
+        self.head = Position(self.head.segment + 1, 0)
+        self._segment_path(self.head.segment).touch()
+        _fsync_dir(self.dir)
+        self.checkpoint()
+
+    def _mirror(self, rec: Record) -> None:
+        """人が読む ``change-log.md`` に 1 行追記する。"""
+        path = self.root / CHANGE_LOG
+        prefix = b""
+        if path.exists() and path.stat().st_size:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                prefix = b"" if f.read(1) == b"\n" else b"\n"
+        with open(path, "ab") as f:
+            f.write(prefix + rec.to_markdown().encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise WalError("読み取り専用で開いた WAL には書き込めません")
+
+    def checkpoint(self) -> None:
+        """現在位置と未完了 PLAN の索引をチェックポイントとして書き出す。"""
+        self._check_writable()
+        atomic_write_text(
+            self.dir / CHECKPOINT,
+            json.dumps(
+                {
+                    "segment": self.head.segment,
+                    "offset": self.head.offset,
+                    "next_seq": self.next_seq,
+                    "open": {str(k): [p.segment, p.offset] for k, p in sorted(self.open_plans.items())},
+                },
+                indent=2,
+            )
+            + "\n",
+        )
+        self._since_checkpoint = 0
+
+    # -- 参照 -----------------------------------------------------------------
+
+    def read(self, pos: Position) -> Record:
+        """指定位置のレコードを 1 件だけ読む。"""
+        with open(self._segment_path(pos.segment), "rb") as f:
+            f.seek(pos.offset)
+            rec = Record.decode(f.readline())
+        if rec is None:
+            raise WalError(f"segment {pos.segment} offset {pos.offset} のレコードが破損しています")
+        return rec
+
+    def pending(self) -> list[Record]:
+        """未完了の PLAN を古い順に返す（索引から直接シークする）。"""
+        return [self.read(self.open_plans[seq]) for seq in sorted(self.open_plans)]
+
+    def records(self) -> Iterator[Record]:
+        """全レコードを先頭から返す。"""
+        segments = self.segments()
+        for n in segments:
+            for _, rec in self._scan(n, 0, tail=n == segments[-1]):
+                yield rec
+
+    def render(self) -> None:
+        """WAL の全レコードから ``change-log.md`` のエントリ部分を再生成する。"""
+        self._check_writable()
+        path = self.root / CHANGE_LOG
+        header = split_header(path.read_text(encoding="utf-8")) if path.exists() else "# Change Log\n\n---\n"
+        body = "\n".join(rec.to_markdown() for rec in self.records())
+        atomic_write_text(path, header.rstrip("\n") + "\n\n" + body + ("\n" if body else ""))
+
+
+def parse_markdown(text: str) -> Iterator[tuple[str, str, str, str, list[str]]]:
+    """``change-log.md`` のエントリ行を ``(date, kind, phase, desc, targets)`` として返す。
+
+    日付が ``__TODAY__`` のままの行は展開前のテンプレートの記入例なので返さない。
+    """
+    for line in text.splitlines():
+        m = _ENTRY.match(line.strip())
+        if m and m.group("date") != "__TODAY__":
+            targets = re.findall(r"`([^`]+)`", m.group("targets") or "")
+            yield m.group("date"), m.group("kind"), m.group("phase"), m.group("desc").strip(), targets
+
+
+def split_header(text: str) -> str:
+    """``change-log.md`` からエントリより前（説明ブロック）を取り出す。"""
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if _ENTRY.match(line.strip()):
+            return "\n".join(lines[:i]).rstrip() + "\n"
+    return text
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.wal", description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=None, help="リポジトリルート（既定: 自動検出）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_plan = sub.add_parser("plan", help="変更前に PLAN を追記する")
+    p_plan.add_argument("--phase", required=True)
+    p_plan.add_argument("desc")
+    p_plan.add_argument("targets", nargs="*")
+
+    p_done = sub.add_parser("done", help="変更後に DONE を追記する")
+    p_done.add_argument("--phase")
+    p_done.add_argument("--id", type=int, default=None, help="完了させる PLAN の seq")
+    p_done.add_argument("desc", nargs="?")
+
+    p_open = sub.add_parser("open", help="未完了の PLAN を一覧する")
+    p_open.add_argument("--json", action="store_true")
+
+    sub.add_parser("checkpoint", help="チェックポイントを書き出す")
+    sub.add_parser("render", help="change-log.md を WAL から再生成する")
+    args = parser.parse_args(argv)
+
+    root = repo_root(args.root)
+    try:
+        with ChangeLog(root) as log:
+            if args.command == "plan":
+                rec = log.plan(args.phase, args.desc, args.targets)
+                print(rec.seq)
+            elif args.command == "done":
+                rec = log.done(args.phase, args.desc, plan=args.id)
+                print(rec.plan)
+            elif args.command == "open":
+                pending = log.pending()
+                if args.json:
+                    print(json.dumps([asdict(r) for r in pending], ensure_ascii=False, indent=2))
+                elif not pending:
+                    print("未完了の PLAN はありません")
+                else:
+                    for rec in pending:
+                        print(f"#{rec.seq} {rec.to_markdown()[2:]}")
+            elif args.command == "checkpoint":
+                log.checkpoint()
+            elif args.command == "render":
+                log.render()
+    except WalError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
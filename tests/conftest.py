@@ -0,0 +1,18 @@
+"""scripts/ のテスト共通フィクスチャ。"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """``repo_root`` に認識される最小のリポジトリ（``guides/`` と ``templates/`` のみ）。"""
+    (tmp_path / "guides").mkdir()
+    (tmp_path / "templates").mkdir()
+    return tmp_path
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from scripts import audit_index
+from scripts.audit_index import CHECKLIST, AuditIndex
+
+CHECKLIST_MD = """\
+| ID | カテゴリ | 要件 | 優先度 |
+|----|----------|------|--------|
+| R-001 | セキュリティ | 監査ログを7年間保管すること | 必須 |
+| R-002 | 可用性 | 稼働率99.9%以上を保証すること | 必須 |
+| R-003 | 運用 | 障害発生時は30分以内に一次報告すること | 推奨 |
+"""
+
+# 計画書のトレーサビリティ表は全要件 ID と要件文を列挙する
+TRACEABILITY_MD = """\
+# RFP 分析
+
+| ID | 要件 | 対応 |
+|----|------|------|
+| R-001 | 監査ログを7年間保管すること | 提案書 3 章 |
+| R-002 | 稼働率99.9%以上を保証すること | 提案書 4 章 |
+| R-003 | 障害発生時は30分以内に一次報告すること | 未定 |
+"""
+
+SLIDES_MD = """\
+# 提案書
+
+## セキュリティ
+
+監査ログは改ざん防止ストレージに7年間保管します（R-001）。
+
+## 可用性
+
+マルチゾーン構成により稼働率99.9%以上を保証します。
+"""
+
+
+def _write(repo: Path, rel: str | Path, text: str) -> Path:
+    path = repo / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _coverage(repo: Path) -> dict[str, audit_index.Coverage]:
+    with AuditIndex(repo) as index:
+        audit_index.update(repo, index)
+        return {c.id: c for c in index.coverage()}
+
+
+def test_uncovered_requirement_is_reported_missing(repo: Path) -> None:
+    _write(repo, CHECKLIST, CHECKLIST_MD)
+    _write(repo, "output/plan/rfp-analysis.md", TRACEABILITY_MD)
+    _write(repo, "output/slides/main/slides.md", SLIDES_MD)
+
+    results = _coverage(repo)
+    assert results["R-001"].status == "MATCH"
+    assert any("ID参照" in e for e in results["R-001"].evidence)
+    assert results["R-002"].status == "MATCH"
+    assert results["R-003"].status == "MISSING"
+    assert all("output/plan/" not in e for r in results.values() for e in r.evidence)
+
+
+def test_incremental_update_matches_rebuild(repo: Path) -> None:
+    _write(repo, CHECKLIST, CHECKLIST_MD)
+    slides = _write(repo, "output/slides/main/slides.md", SLIDES_MD)
+    _coverage(repo)
+
+    slides.write_text(SLIDES_MD + "\n## 運用\n\n障害発生時は30分以内に一次報告します。\n", encoding="utf-8")
+    with AuditIndex(repo) as index:
+        stats = audit_index.update(repo, index)
+        incremental = index.coverage()
+    assert stats["changed_files"] == ["output/slides/main/slides.md"]
+    assert stats["changed_requirements"] == []
+
+    with AuditIndex(repo, repo / "rebuild.sqlite") as index:
+        audit_index.update(repo, index)
+        rebuilt = index.coverage()
+    assert incremental == rebuilt
+    assert {c.id: c.status for c in incremental}["R-003"] == "MATCH"
+
+
+def test_search_covers_reference_documents(repo: Path) -> None:
+    _write(repo, "output/plan/rfp-analysis.md", TRACEABILITY_MD)
+    with AuditIndex(repo) as index:
+        index.sync_files()
+        hits = index.search("一次報告")
+    assert [path for path, _, _ in hits] == ["output/plan/rfp-analysis.md"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from scripts import bench, fact_index
+
+TEMPLATES = Path(__file__).resolve().parents[1] / "templates"
+SCALE = 0.05
+
+
+def _result(wall_ms: float, reads: int) -> dict:
+    return {"stages": {"audit": {"modes": {"incremental": {"wall_ms": wall_ms, "reads": reads, "writes": 0}}}}}
+
+
+def test_compare_flags_only_real_regressions() -> None:
+    baseline = _result(100.0, 50)
+    assert bench.compare(_result(110.0, 55), baseline, 0.2) == []
+    assert bench.compare(_result(130.0, 50), baseline, 0.2) == [("audit", "incremental", "wall_ms", 100.0, 130.0)]
+    # 悪化率を超えても、差がノイズ幅以下なら回帰としない
+    assert bench.compare(_result(2.0, 50), _result(1.0, 50), 0.2) == []
+
+
+def test_stages_missing_from_the_baseline_are_ignored() -> None:
+    assert bench.compare(_result(500.0, 500), {"stages": {}}, 0.2) == []
+
+
+def _tree(base: Path) -> dict[str, object]:
+    """相対パス → 内容。XLSX は保存時刻が入るためセル値で比べる。"""
+    tree: dict[str, object] = {}
+    for p in sorted(base.rglob("*")):
+        if not p.is_file():
+            continue
+        if p.suffix == ".xlsx":
+            from openpyxl import load_workbook
+
+            wb = load_workbook(p, read_only=True)
+            tree[p.relative_to(base).as_posix()] = [list(ws.iter_rows(values_only=True)) for ws in wb.worksheets]
+            wb.close()
+        else:
+            tree[p.relative_to(base).as_posix()] = p.read_bytes()
+    return tree
+
+
+def _fixture(work: Path, seed: int) -> dict[str, int]:
+    return bench.build_fixture(work / "project", work / "setup", TEMPLATES, bench.Scale().times(SCALE), seed)
+
+
+def test_fixture_is_reproducible_for_a_seed(tmp_path: Path) -> None:
+    first = _fixture(tmp_path / "a", 7)
+    assert _fixture(tmp_path / "b", 7) == first
+    assert _tree(tmp_path / "a") == _tree(tmp_path / "b")
+
+    _fixture(tmp_path / "c", 8)
+    assert _tree(tmp_path / "a" / "project") != _tree(tmp_path / "c" / "project")
+
+
+def test_stage_runs_every_mode_on_a_consistent_fixture(tmp_path: Path) -> None:
+    _fixture(tmp_path, 1)
+    (stage,) = [s for s in bench.STAGES if s.name == "facts"]
+    result = bench.run_stage(stage, tmp_path / "project", tmp_path / "setup", repeat=1)
+    assert result["status"] == "ok", result["reason"]
+    assert list(result["modes"]) == list(bench.MODES)
+
+    # 合成フィクスチャは正本と整合するように作っている
+    assert fact_index.main(["--root", str(tmp_path / "project"), "--check", "--json"]) == 0
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts import estimate as est  # noqa: E402
+
+RATE_CARD = """\
+| ロール | グレード | 単価（万円/人月） |
+|--------|----------|------------------:|
+| PM | シニア | 150 |
+| SE | ミドル | 100 |
+"""
+
+WBS_THREE_POINT = """\
+| 工程 | 作業項目 | ロール | グレード | 工数（人月） | 最小 | 最大 |
+|---|---|---|---|---:|---:|---:|
+| 要件定義 | 業務要件整理 | PM | シニア | 2 | 1.5 | 4 |
+| 設計 | 基本設計 | SE | ミドル | 5 | 4 | 9 |
+| 開発 | 実装 | SE | ミドル | 10 | | |
+"""
+
+
+def _wbs(text: str = WBS_THREE_POINT, **kwargs: object) -> est.Wbs:
+    return est.parse_wbs(text, est.parse_rate_card(RATE_CARD), years=5, **kwargs)
+
+
+def test_same_seed_gives_identical_trials() -> None:
+    wbs = _wbs()
+    first = est.monte_carlo(wbs, 5_000, seed=7)
+    assert np.array_equal(first, est.monte_carlo(wbs, 5_000, seed=7))
+    assert not np.array_equal(first, est.monte_carlo(wbs, 5_000, seed=8))
+    assert np.array_equal(first[:1_000], est.monte_carlo(wbs, 1_000, seed=7, batch=1_000))
+
+
+def test_sampler_matches_pert_mean() -> None:
+    wbs = _wbs()
+    totals = est.monte_carlo(wbs, 50_000, seed=1)
+    pert_mean = float(((wbs.low + 4 * wbs.mode + wbs.high) / 6) @ wbs.rate)
+    assert totals.mean() == pytest.approx(pert_mean, rel=2e-3)
+    assert totals.min() >= float(wbs.low @ wbs.rate)
+    assert totals.max() <= float(wbs.high @ wbs.rate)
+
+
+def test_single_estimates_have_no_variance_by_default() -> None:
+    wbs = _wbs()
+    assert wbs.single == 1
+    assert wbs.low[2] == wbs.high[2] == wbs.mode[2] == 10
+
+    flat = _wbs(WBS_THREE_POINT.replace("| 1.5 | 4 |", "| | |").replace("| 4 | 9 |", "| | |"))
+    result = est.estimate(flat, trials=1_000, seed=1)
+    assert result.buffer == 0.0
+    assert set(result.percentiles.values()) == {result.base}
+    assert "幅 0（最頻値で固定）" in est.format_report(flat, result, 80, 1_000)
+
+
+def test_spread_is_opt_in_and_reported() -> None:
+    wbs = _wbs(spread=(0.9, 1.5))
+    assert wbs.low[2] == pytest.approx(9) and wbs.high[2] == pytest.approx(15)
+    report = est.format_report(wbs, est.estimate(wbs, trials=1_000, seed=1), 80, 1_000)
+    assert "**仮定**" in report and "90%〜150%" in report
+
+
+def test_unknown_grade_is_reported_as_unpriced() -> None:
+    card = est.parse_rate_card(RATE_CARD + "| SE | シニア | 130 |\n")
+    assert card.rate("SE", "ミドル") == 100
+    assert card.rate("SE", "ジュニア") is None
+    assert card.rate("SE") is None  # グレード未指定では単価が一意に決まらない
+    assert card.rate("PM") == 150
+
+    wbs = _wbs(WBS_THREE_POINT.replace("| 基本設計 | SE | ミドル |", "| 基本設計 | SE | ジュニア |"))
+    assert wbs.warnings == ["人月単価が未設定: SE / ジュニア（設計 / 基本設計）"]
+    assert float(wbs.rate[1]) == 0.0
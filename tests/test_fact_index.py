@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+
+from scripts import fact_index
+
+POLICY = """\
+# 見積方針
+
+| 項目 | 金額（万円） |
+|------|-------------:|
+| 初期費用 | 1,200 |
+| 年間保守費用 | 300 |
+"""
+
+SLIDES = """\
+# 提案概要
+
+初期費用 1,200万円 で構築します。
+
+| 区分 | 金額（万円） |
+|------|-------------:|
+| 設計 | 400 |
+| 開発 | 500 |
+| 合計 | 1,000 |
+"""
+
+
+def _write(repo, rel, text):
+    path = repo / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_amounts_are_normalized_to_yen():
+    facts, _ = fact_index.extract_markdown("a.md", "費用は 1億2,000万円、予備費 ３００万円、差額 ▲50万円。\n")
+    values = sorted(f.value for f in facts if f.dim == "円")
+    assert values == [-500_000.0, 3_000_000.0, 120_000_000.0]
+
+
+def test_sum_row_mismatch_is_reported(repo):
+    _write(repo, "output/plan/estimation-policy.md", POLICY)
+    _write(repo, "output/slides/01/slides.md", SLIDES)
+    with fact_index.FactIndex(repo) as index:
+        index.sync()
+        findings, stats = index.findings(["output/plan/estimation-policy.md"])
+    sums = [f for f in findings if f.status == "SUM"]
+    assert len(sums) == 1 and sums[0].location.startswith("output/slides/01/slides.md")
+    assert stats["sum_checks"] >= 1
+
+
+def test_canonical_edit_flags_stale_reference_incrementally(repo):
+    _write(repo, "output/plan/estimation-policy.md", POLICY)
+    _write(repo, "output/slides/01/slides.md", "# 提案概要\n\n初期費用 1,200万円 で構築します。\n")
+    canonical = ["output/plan/estimation-policy.md"]
+    with fact_index.FactIndex(repo) as index:
+        index.sync()
+        findings, stats = index.findings(canonical)
+        assert findings == [] and stats["matched"] == 1
+
+        _write(repo, "output/plan/estimation-policy.md", POLICY.replace("1,200", "1,500"))
+        assert index.sync() == ["output/plan/estimation-policy.md"]
+        findings, _ = index.findings(canonical)
+    assert [(f.status, f.location) for f in findings] == [("STALE", "output/slides/01/slides.md:L3")]
+
+
+def test_wbs_rows_under_a_category_are_not_references(repo):
+    policy = "# 見積方針\n\n| 工程 | 工数（人月） |\n|------|------:|\n| 基本設計 | 5 |\n| 開発 | 8 |\n"
+    wbs = """\
+| 工程 | 作業項目 | ロール | 工数（人月） |
+|------|----------|--------|------:|
+| 基本設計 | 画面設計 | SE | 2 |
+| 基本設計 | 帳票設計 | SE | 3 |
+| 開発 | 実装 | PG | 8 |
+"""
+    _write(repo, "output/plan/estimation-policy.md", policy)
+    _write(repo, "output/plan/wbs.md", wbs)
+    with fact_index.FactIndex(repo) as index:
+        index.sync()
+        findings, stats = index.findings(["output/plan/estimation-policy.md"])
+    assert findings == []
+    assert stats["matched"] == 1  # 1 行だけの「開発」は工程名で照合する
+
+
+def test_xlsx_float_cells_keep_their_digits(repo):
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["項目", "金額（円）"])
+    ws.append(["ライセンス", 1234567.5])
+    ws.append(["保守", 123456.78])
+    ws.append(["合計", 1358024.28])
+    wb.save(repo / "見積.xlsx")
+
+    facts, checks = fact_index.extract_xlsx("見積.xlsx", repo / "見積.xlsx")
+    assert [f.value for f in facts] == [1234567.5, 123456.78, 1358024.28]
+    assert len(checks) == 1 and abs(checks[0].stated - checks[0].parts) <= checks[0].tolerance
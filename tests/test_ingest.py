@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from scripts import ingest
+
+
+def _put(repo: Path, rel: str, text: str) -> Path:
+    path = repo / "input" / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_second_run_skips_unchanged_files(repo: Path) -> None:
+    _put(repo, "議事録_0401.md", "# 議事録\n")
+    _put(repo, "質問回答書.txt", "Q1\n")
+
+    first = ingest.run(repo, jobs=1)
+    assert [r.status for r in first] == ["copied", "copied"]
+    assert (repo / "source/minutes/議事録_0401.md").read_text(encoding="utf-8") == "# 議事録\n"
+
+    second = ingest.run(repo, jobs=1)
+    assert [r.status for r in second] == ["unchanged", "unchanged"]
+    assert all(r.hash_ms == 0 for r in second)
+
+
+def test_changed_file_is_reingested(repo: Path) -> None:
+    src = _put(repo, "議事録_0401.md", "# 議事録\n")
+    ingest.run(repo, jobs=1)
+
+    src.write_text("# 議事録（改訂）\n", encoding="utf-8")
+    (result,) = ingest.run(repo, jobs=1)
+    assert result.status == "copied"
+    assert (repo / "source/minutes/議事録_0401.md").read_text(encoding="utf-8") == "# 議事録（改訂）\n"
+
+
+def test_dry_run_writes_nothing(repo: Path) -> None:
+    _put(repo, "議事録_0401.md", "# 議事録\n")
+
+    (result,) = ingest.run(repo, dry_run=True)
+    assert result.status == "skipped"
+    assert result.outputs == ["source/minutes"]
+    assert not (repo / "tmp").exists()
+    assert not (repo / "source").exists()
+
+
+def test_touched_file_keeps_its_outputs(repo: Path) -> None:
+    src = _put(repo, "議事録_0401.md", "# 議事録\n")
+    (first,) = ingest.run(repo, jobs=1)
+
+    stat = src.stat()
+    os.utime(src, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    (result,) = ingest.run(repo, jobs=1)
+    assert result.status == "unchanged"
+    assert result.outputs == first.outputs == ["source/minutes/議事録_0401.md"]
+
+
+def test_move_removes_already_ingested_inputs(repo: Path) -> None:
+    src = _put(repo, "議事録_0401.md", "# 議事録\n")
+    ingest.run(repo, jobs=1)
+
+    (result,) = ingest.run(repo, jobs=1, move=True)
+    assert result.status == "unchanged"
+    assert not src.exists()
+    assert (repo / "source/minutes/議事録_0401.md").exists()
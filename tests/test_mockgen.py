@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scripts import mockgen  # noqa: E402
+
+SPEC = """\
+## 顧客（customers）
+
+件数: 100,000
+
+| 物理名 | 論理名 | データ型 | PK | FK |
+|--------|--------|----------|----|----|
+| customer_id | 顧客ID | VARCHAR(8) | ○ | |
+| customer_name | 顧客名 | VARCHAR(40) | | |
+
+## 注文（orders）
+
+件数: 20,000
+
+| 物理名 | 論理名 | データ型 | PK | FK |
+|--------|--------|----------|----|----|
+| order_id | 注文ID | INTEGER | ○ | |
+| customer_id | 顧客ID | VARCHAR(6) | | customers.customer_id |
+| amount | 金額 | DECIMAL(12,2) | | |
+"""
+
+
+def _tables(customers: int) -> dict[str, mockgen.Table]:
+    tables = {t.name: t for t in mockgen.parse_specs(SPEC, "spec.md")}
+    tables["customers"].rows = customers
+    return tables
+
+
+@pytest.mark.parametrize("rows", [99_999, 100_000])
+def test_string_keys_are_unique_and_fk_references_exist(rows: int) -> None:
+    tables = _tables(rows)
+    plan = mockgen.Plan(tables, seed=1, dates=mockgen.DEFAULT_DATES, chunk_rows=rows)
+    keys = mockgen.generate_chunk(plan, tables["customers"], 0, rows)["customer_id"][0]
+    assert len(np.unique(keys)) == rows
+    assert set(np.char.str_len(keys).tolist()) == {8}
+
+    refs = mockgen.generate_chunk(plan, tables["orders"], 0, tables["orders"].rows)["customer_id"][0]
+    assert np.isin(refs, keys).all()
+
+
+def test_prefix_shrinks_before_digits_are_lost() -> None:
+    tables = _tables(2_000_000)
+    assert mockgen.key_format(tables["customers"]) == ("C", 7)
+    keys = mockgen.key_values(tables["customers"], np.asarray([0, 99_999, 1_999_999]))
+    assert keys.tolist() == ["C0000001", "C0100000", "C2000000"]
+
+
+def test_key_that_cannot_fit_is_an_error() -> None:
+    tables = _tables(100_000_000)
+    with pytest.raises(mockgen.KeyWidthError, match="8 桁に収まりません"):
+        mockgen.check_keys(tables)
+
+
+def test_short_fk_column_is_reported_not_truncated() -> None:
+    warnings = mockgen.check_keys(_tables(1_000))
+    assert any("orders.customer_id" in w for w in warnings)
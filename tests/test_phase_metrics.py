@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from scripts import phase_metrics
+from scripts.wal import WAL_DIR, ChangeLog
+
+
+def test_tasks_are_read_without_touching_the_wal(repo: Path) -> None:
+    with ChangeLog(repo, mirror=False) as log:
+        first = log.plan("1", "RFP を分析", ["output/plan/rfp-analysis.md"])
+        log.plan("2", "提案戦略を作成")
+        log.done(plan=first.seq)
+    with open(repo / WAL_DIR / "segment-000001.log", "ab") as f:
+        f.write(b"0badc0de {")  # 別プロセスが追記中
+    before = {p.name: p.read_bytes() for p in (repo / WAL_DIR).iterdir()}
+
+    tasks = phase_metrics.load_tasks(repo)
+    assert [(t.phase, t.desc, t.done is not None) for t in tasks] == [("1", "RFP を分析", True), ("2", "提案戦略を作成", False)]
+    assert tasks[0].targets == ["output/plan/rfp-analysis.md"]
+    assert {p.name: p.read_bytes() for p in (repo / WAL_DIR).iterdir()} == before
+
+
+def test_task_seconds_need_timestamps_on_both_ends() -> None:
+    assert phase_metrics.Task("1", "a", "2024-04-01T09:00:00", "2024-04-01T09:30:00").seconds == 1800
+    assert phase_metrics.Task("1", "a", "2024-04-01", "2024-04-02").seconds is None
+    assert phase_metrics.Task("1", "a", "2024-04-01T09:00:00", None).seconds is None
+
+
+def test_format_duration() -> None:
+    assert phase_metrics.format_duration(None) == "-"
+    assert phase_metrics.format_duration(0.25) == "250 ms"
+    assert phase_metrics.format_duration(42) == "42.0 s"
+    assert phase_metrics.format_duration(90) == "1.5 min"
+    assert phase_metrics.format_duration(5400) == "1.5 h"
+
+
+def test_targets_outside_the_repository_are_skipped(repo: Path, capsys) -> None:
+    (repo / "output/plan").mkdir(parents=True)
+    (repo / "output/plan/wbs.md").write_text("# WBS\n", encoding="utf-8")
+    outside = repo.parent / "outside.md"
+    outside.write_text("x\n", encoding="utf-8")
+    with ChangeLog(repo, mirror=False) as log:
+        log.plan("5", "WBS を作成", ["output/plan/wbs.md", str(outside), "../outside.md"])
+
+    metrics, _, _ = phase_metrics.collect(repo)
+    (phase5,) = [m for m in metrics if m.number == "5"]
+    assert (phase5.artifacts, phase5.artifact_bytes) == (1, 6)
+    assert capsys.readouterr().err.count("リポジトリ外の対象") == 2
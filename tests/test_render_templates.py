@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import datetime as dt
+from pathlib import Path
+
+import pytest
+
+from scripts import render_templates as rt
+
+VALUES = {name: f"<{name}>" for name in rt.SETUP_VARIABLES - {"TODAY", "PROJECT_SLUG"}}
+
+
+def _template(repo: Path, rel: str, text: str) -> None:
+    path = repo / "templates" / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _render(repo: Path, **kwargs: object) -> dict[str, str]:
+    values = rt.with_defaults(repo, VALUES)
+    return {r.output: r.status for r in rt.render_all(repo, values, workers=1, **kwargs)}
+
+
+class _Tomorrow(dt.date):
+    @classmethod
+    def today(cls) -> dt.date:
+        return dt.date(2099, 1, 2)
+
+
+@pytest.fixture
+def templates(repo: Path) -> Path:
+    _template(repo, "docs/proposal-strategy.md.tmpl", "# __CLIENT_NAME__ 提案戦略\n\n作成日: __TODAY__\n")
+    _template(repo, "docs/wbs.md.tmpl", "# WBS（__PLATFORM_NAME__）\n")
+    return repo
+
+
+def test_rerender_skips_unchanged_outputs(templates: Path) -> None:
+    assert set(_render(templates).values()) == {"written"}
+    assert set(_render(templates).values()) == {"unchanged"}
+
+
+def test_today_is_pinned_to_first_render(templates: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _render(templates)
+    first = (templates / "output/plan/proposal-strategy.md").read_text(encoding="utf-8")
+
+    monkeypatch.setattr(rt.dt, "date", _Tomorrow)
+    assert _render(templates)["output/plan/proposal-strategy.md"] == "unchanged"
+    assert (templates / "output/plan/proposal-strategy.md").read_text(encoding="utf-8") == first
+
+
+def test_variable_change_rewrites_only_its_users(templates: Path) -> None:
+    _render(templates)
+    values = rt.with_defaults(templates, dict(VALUES, PLATFORM_NAME="Databricks"))
+    statuses = {r.output: r.status for r in rt.render_all(templates, values, workers=1)}
+    assert statuses == {"output/plan/proposal-strategy.md": "unchanged", "output/plan/wbs.md": "written"}
+
+
+def test_hand_edited_output_is_not_overwritten(templates: Path) -> None:
+    _render(templates)
+    out = templates / "output/plan/wbs.md"
+    out.write_text("# WBS（編集済み）\n", encoding="utf-8")
+    assert _render(templates)["output/plan/wbs.md"] == "modified"
+    assert out.read_text(encoding="utf-8") == "# WBS（編集済み）\n"
+
+
+def test_dry_run_writes_nothing(templates: Path) -> None:
+    assert set(_render(templates, dry_run=True).values()) == {"written"}
+    assert not (templates / "output").exists()
+    assert not (templates / "tmp").exists()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from scripts import resume
+from scripts.wal import WAL_DIR, ChangeLog
+
+PHASE_STATE = """\
+# Phase State
+
+## Last Checkpoint
+
+| Item | Value |
+|------|-------|
+| Updated | 2024-04-02 |
+| Active Phase(s) | 2 |
+| Next Action | 提案戦略を作成 |
+
+## Phase Summary
+
+| # | Phase | Status | Started | Completed |
+|---|-------|--------|---------|-----------|
+| 1 | RFP Analysis | `completed` | 2024-04-01 | 2024-04-01 |
+| 2 | Strategy | `in_progress` | 2024-04-02 | - |
+
+## Phase 1: RFP Analysis
+
+### Deliverables
+
+- [x] rfp-analysis.md
+"""
+
+
+def _summary(repo: Path) -> tuple[str, list[str]]:
+    state = resume.parse_phase_state(PHASE_STATE)
+    cache = resume.DeliverableCache(repo)
+    checks = resume.verify(repo, cache, [p.number for p in state.phases], workers=1)
+    return resume.summarize(repo, state, checks)
+
+
+def test_completed_phase_without_deliverables_is_drift(repo: Path) -> None:
+    report, drift = _summary(repo)
+    assert any("Phase 1 は completed だが成果物がない" in d for d in drift)
+    assert "Phase 2 Strategy（in_progress）を再開する" in report
+
+
+def test_open_plans_are_listed_without_touching_the_wal(repo: Path) -> None:
+    with ChangeLog(repo, mirror=False) as log:
+        log.plan("2", "提案戦略を作成", ["output/plan/proposal-strategy.md"])
+    seg = repo / WAL_DIR / "segment-000001.log"
+    with open(seg, "ab") as f:
+        f.write(b"0badc0de {")  # 別プロセスが追記中
+    before = {p.name: p.read_bytes() for p in (repo / WAL_DIR).iterdir()}
+
+    report, _ = _summary(repo)
+    assert "- #1 Phase 2: 提案戦略を作成" in report
+    assert {p.name: p.read_bytes() for p in (repo / WAL_DIR).iterdir()} == before
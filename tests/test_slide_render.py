@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts import slide_render as sr
+
+SLIDES = """\
+# 提案書 Vol.1
+
+## 表紙
+
+ABC銀行 データ基盤刷新のご提案
+
+## 課題
+
+- 夜間バッチの遅延
+- データのサイロ化
+
+### スピーカーノート
+
+ここは画像に影響しない。
+"""
+
+
+@pytest.fixture
+def deck(repo: Path) -> Path:
+    path = repo / "output/slides/vol1-overview/slides.md"
+    path.parent.mkdir(parents=True)
+    path.write_text(SLIDES, encoding="utf-8")
+    return path
+
+
+def _render(repo: Path) -> dict[int, str]:
+    results = sr.render_slides(repo, sr.build_jobs(repo), sr.StubBackend(64, 36), workers=1)
+    return {r.job.number: r.status for r in results}
+
+
+def test_only_changed_slides_are_rerendered(repo: Path, deck: Path) -> None:
+    assert _render(repo) == {1: "rendered", 2: "rendered"}
+    assert _render(repo) == {1: "cached", 2: "cached"}
+
+    deck.write_text(SLIDES.replace("ここは画像に影響しない。", "ノートだけ修正。"), encoding="utf-8")
+    assert _render(repo) == {1: "cached", 2: "cached"}
+
+    deck.write_text(SLIDES.replace("- データのサイロ化", "- データのサイロ化\n- 属人化"), encoding="utf-8")
+    assert _render(repo) == {1: "cached", 2: "rendered"}
+
+
+def test_replaced_image_is_not_overwritten(repo: Path, deck: Path) -> None:
+    _render(repo)
+    image = repo / "output/slides/vol1-overview/slide-01.png"
+    image.write_bytes(sr.StubBackend(32, 18).render(sr.build_jobs(repo)[0]))
+    assert _render(repo)[1] == "modified"
+
+
+def test_pdf_is_assembled_once_per_page_set(repo: Path, deck: Path) -> None:
+    _render(repo)
+    pages = [job.output for job in sr.build_jobs(repo)]
+    assert sr.assemble_pdf(repo, pages) is True
+    assert sr.assemble_pdf(repo, pages) is False
+
+    pypdf = pytest.importorskip("pypdf")
+    assert len(pypdf.PdfReader(repo / sr.PDF_PATH).pages) == 2
+
+
+def test_dry_run_writes_nothing(repo: Path, deck: Path) -> None:
+    assert sr.main(["--root", str(repo), "--dry-run"]) == 0
+    assert not (repo / "tmp").exists()
+    assert not list(deck.parent.glob("*.png"))
+
+
+@pytest.mark.parametrize(
+    ("command", "message"),
+    [
+        ("python -c 'import sys; sys.exit(3)'", "exit 3"),
+        ("python -c pass", "画像が書き出されていません"),
+        ("no-such-slide-renderer {prompt}", "実行できません"),
+    ],
+)
+def test_failed_command_is_reported_per_slide(repo: Path, deck: Path, command: str, message: str) -> None:
+    backend = sr.CommandBackend(command.replace("python", sys.executable, 1), timeout=30)
+    results = sr.render_slides(repo, sr.build_jobs(repo), backend, workers=1)
+    assert [r.status for r in results] == ["failed", "failed"]
+    assert all(message in r.error for r in results)
+    assert not list(deck.parent.glob("*.png"))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from scripts.wal import CHANGE_LOG, WAL_DIR, ChangeLog, WalError
+
+
+def _segment(repo: Path) -> Path:
+    return repo / WAL_DIR / "segment-000001.log"
+
+
+def _write_three(repo: Path) -> None:
+    with ChangeLog(repo, mirror=False) as log:
+        log.plan("1", "要件定義書を作成", ["output/plan/requirements.md"])
+        log.plan("2", "WBS を作成", ["output/plan/wbs.md"])
+        log.done("1", "要件定義書を作成")
+
+
+def test_torn_tail_is_truncated_on_recovery(repo: Path) -> None:
+    _write_three(repo)
+    seg = _segment(repo)
+    size = seg.stat().st_size
+    with open(seg, "ab") as f:
+        f.write(b'0badc0de {"seq":4,"kind":"PL')  # fsync 前に中断した追記
+
+    with ChangeLog(repo, mirror=False) as log:
+        assert [r.desc for r in log.pending()] == ["WBS を作成"]
+        assert seg.stat().st_size == size
+        rec = log.plan("3", "構成図を作成")
+    assert rec.seq == 4
+    with ChangeLog(repo, mirror=False) as log:
+        assert [r.seq for r in log.records()] == [1, 2, 3, 4]
+
+
+def test_corrupt_record_before_valid_ones_is_not_truncated(repo: Path) -> None:
+    _write_three(repo)
+    seg = _segment(repo)
+    data = seg.read_bytes()
+    first = data.index(b"\n") + 1
+    digit = b"0" if data[first : first + 1] == b"f" else b"f"
+    corrupted = data[:first] + digit + data[first + 1 :]  # 2 行目の CRC を壊す
+    seg.write_bytes(corrupted)
+    (repo / WAL_DIR / "checkpoint.json").unlink(missing_ok=True)
+
+    with pytest.raises(WalError, match="破損"):
+        with ChangeLog(repo, mirror=False):
+            pass
+    assert seg.read_bytes() == corrupted
+
+
+def test_readonly_open_does_not_bootstrap(repo: Path) -> None:
+    (repo / CHANGE_LOG).write_text("- `2024-04-01` **PLAN** Phase 1: 作業\n", encoding="utf-8")
+    with ChangeLog(repo, readonly=True) as log:
+        assert log.pending() == []
+        with pytest.raises(WalError):
+            log.plan("1", "作業")
+    assert not (repo / WAL_DIR).exists()
+
+
+def test_readonly_open_skips_torn_tail_without_truncating(repo: Path) -> None:
+    _write_three(repo)
+    seg = _segment(repo)
+    with open(seg, "ab") as f:
+        f.write(b"0badc0de {")
+    before = seg.read_bytes()
+    with ChangeLog(repo, readonly=True) as log:
+        assert [r.desc for r in log.pending()] == ["WBS を作成"]
+    assert seg.read_bytes() == before
+
+
+def test_bootstrap_skips_template_placeholders(repo: Path) -> None:
+    (repo / CHANGE_LOG).write_text(
+        "# Change Log\n\n---\n\n"
+        "- `__TODAY__` **PLAN** Phase 0: Setup project → `phase-state.md`\n"
+        "- `__TODAY__` **DONE** Phase 0: Setup project\n"
+        "- `2024-04-01` **PLAN** Phase 1: 要件定義書を作成 → `output/plan/requirements.md`\n",
+        encoding="utf-8",
+    )
+    with ChangeLog(repo, mirror=False) as log:
+        records = list(log.records())
+    assert [(r.kind, r.desc) for r in records] == [("PLAN", "要件定義書を作成")]
+    assert records[0].targets == ["output/plan/requirements.md"]